@@ -0,0 +1,100 @@
+"""
+Chi phí CPU mỗi message khi dispatch tới N HttpTarget, trước và sau khi dùng HttpSendPlan.
+
+Transport được thay bằng httpx.MockTransport (trả 200 ngay) nên số đo là overhead
+phía client: dispatcher, encode body, retry/status/circuit breaker, httpx build request.
+"Legacy" mô phỏng đường gửi cũ: đọc config dict, encode body cho từng URL,
+status_forcelist dạng list và tra registry circuit breaker mỗi request.
+
+    python -m benchmarks.bench_dispatch_overhead --messages 2000 --targets 1 4 16
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+import httpx
+
+from config.models import HttpTargetConfig
+from observer.dispatcher import DispatchEngine
+from observer.targets.http_target import HttpTarget
+from requester_client.resilience import circuit_breakers
+from requester_client.transport_registry import transport_registry
+
+MESSAGE = {"id": 1, "event": "created", "payload": {"name": "x" * 64, "tags": ["a", "b", "c"]}}
+
+
+class LegacyHttpTarget(HttpTarget):
+    """Đường gửi trước khi có send plan (giữ lại để so sánh)."""
+
+    def __init__(self, config: HttpTargetConfig):
+        super().__init__(config)
+        self.raw_config = config.dict()
+        self.client.status_forcelist = list(self.client.status_forcelist)
+        self.client._breaker = lambda url: circuit_breakers.get(url, self.client.circuit_breaker_cfg)
+
+    async def update_envelope(self, envelope):
+        return await self.update(envelope.data)
+
+    async def update(self, data: dict):
+        cfg = self.raw_config
+        urls = [str(url) for url in cfg.get("urls", [])]
+        method = cfg.get("method", "POST").upper()
+        results = await asyncio.gather(*(self._legacy_send(method, url, data) for url in urls))
+        return all(results)
+
+    async def _legacy_send(self, method: str, url: str, data: dict) -> bool:
+        body = json.dumps(data).encode()
+        response = await self.client.request_async(
+            method, url, content=body, headers={"Content-Type": "application/json"}
+        )
+        return response is not None
+
+
+def build_targets(target_cls, count: int) -> list:
+    return [
+        target_cls(HttpTargetConfig(
+            name=f"t{i}",
+            type="http",
+            body="json",
+            urls=[f"http://bench-{i}.local/events"],
+        ))
+        for i in range(count)
+    ]
+
+
+async def run_once(target_cls, targets_count: int, messages: int) -> float:
+    targets = build_targets(target_cls, targets_count)
+    engine = DispatchEngine(max_in_flight=messages, per_source=messages, per_target=messages)
+    start = time.process_time()
+    for _ in range(messages):
+        results = await engine.dispatch("bench", targets, MESSAGE)
+        assert all(r is True for r in results)
+    elapsed = time.process_time() - start
+    for target in targets:
+        await target.close()
+    return elapsed / messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--targets", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    mock = httpx.MockTransport(lambda request: httpx.Response(200))
+    transport_registry.get_async = lambda url, options: mock
+
+    print(f"{'targets':>8} {'legacy us/msg':>14} {'plan us/msg':>12} {'speedup':>8}")
+    for count in args.targets:
+        # Target in log mỗi lần gửi -> bỏ stdout khi đo
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = asyncio.run(run_once(LegacyHttpTarget, count, args.messages))
+            plan = asyncio.run(run_once(HttpTarget, count, args.messages))
+        print(f"{count:>8} {legacy * 1e6:>14.1f} {plan * 1e6:>12.1f} {legacy / plan:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
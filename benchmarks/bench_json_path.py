@@ -0,0 +1,73 @@
+"""
+Micro-benchmark tra cứu nested key: get_nested_key cũ (re.split + re.match mỗi lần gọi)
+so với JsonPath compile sẵn và get_nested_key hiện tại (cache LRU).
+
+    python -m benchmarks.bench_json_path --number 200000
+"""
+import argparse
+import re
+import timeit
+
+from requester_client.utils.json_helper import compile_path, get_nested_key
+
+PATHS = [
+    "retry_after",
+    "data.rate_limit.retry_after",
+    "meta.throttle.wait",
+    "rate_limit_reset",
+    "data.rate_limit.reset",
+    "items.[1].id",
+]
+
+DATA = {
+    "data": {"rate_limit": {"retry_after": 2, "reset": 1700000000}},
+    "meta": {"throttle": {"wait": 0.5}},
+    "items": [{"id": 1}, {"id": 2}],
+}
+
+
+def legacy_get_nested_key(data: dict, path: str, default=None):
+    """Bản cũ trước khi có compile_path (giữ lại để so sánh)."""
+    keys = re.split(r'\.(?![^\[]*\])', path)
+    for k in keys:
+        if isinstance(data, dict):
+            data = data.get(k, default)
+        elif isinstance(data, list):
+            match = re.match(r'\[(\d+)\]', k)
+            if match:
+                idx = int(match.group(1))
+                data = data[idx] if idx < len(data) else default
+            else:
+                return default
+        else:
+            return default
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200000, help="số lần lặp qua toàn bộ PATHS")
+    args = parser.parse_args()
+
+    compiled = [compile_path(p) for p in PATHS]
+    for path, accessor in zip(PATHS, compiled):
+        assert accessor.get(DATA) == legacy_get_nested_key(DATA, path)
+
+    cases = {
+        "legacy re.split": lambda: [legacy_get_nested_key(DATA, p) for p in PATHS],
+        "get_nested_key (LRU)": lambda: [get_nested_key(DATA, p) for p in PATHS],
+        "compiled JsonPath": lambda: [a.get(DATA) for a in compiled],
+    }
+
+    lookups = args.number * len(PATHS)
+    baseline = None
+    print(f"{'case':>22} {'ns/lookup':>10} {'speedup':>8}")
+    for name, fn in cases.items():
+        elapsed = min(timeit.repeat(fn, number=args.number, repeat=3))
+        ns = elapsed / lookups * 1e9
+        baseline = baseline or ns
+        print(f"{name:>22} {ns:>10.1f} {baseline / ns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark throughput publish (msgs/sec) theo confirm_batch_size.
+
+Dùng InMemoryBroker với `confirm_latency` mô phỏng round-trip chờ publisher
+confirm, nên kết quả phản ánh chi phí confirm chứ không phụ thuộc broker thật.
+
+    python -m benchmarks.bench_rabbitmq_publish --messages 20000 --rtt-ms 1
+"""
+import argparse
+import asyncio
+import time
+
+from message_queue.in_memory_broker import InMemoryBroker, InMemoryPublisher
+
+
+async def run_once(messages: int, batch_size: int, rtt: float, workers: int, concurrency: int) -> float:
+    broker = InMemoryBroker(confirm_latency=rtt)
+    broker.bind("bench_queue", "bench_exchange", "bench")
+    publisher = InMemoryPublisher(
+        broker,
+        exchange="bench_exchange",
+        confirm_batch_size=batch_size,
+        confirm_linger_ms=1,
+        workers=workers,
+    )
+    await publisher.start()
+
+    body = b'{"id": 1, "payload": "x"}'
+    sem = asyncio.Semaphore(concurrency)
+
+    async def send():
+        async with sem:
+            await publisher.publish("bench", body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send() for _ in range(messages)))
+    elapsed = time.perf_counter() - start
+    await publisher.close()
+
+    assert broker.queues["bench_queue"].qsize() == messages
+    return messages / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=4, help="số channel / worker publish")
+    parser.add_argument("--concurrency", type=int, default=2000, help="số publish() đồng thời")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+    args = parser.parse_args()
+
+    print(f"messages={args.messages} rtt={args.rtt_ms}ms workers={args.workers}")
+    print(f"{'confirm_batch_size':>20} {'msgs/sec':>12}")
+    for batch_size in args.batch_sizes:
+        rate = await run_once(args.messages, batch_size, args.rtt_ms / 1000, args.workers, args.concurrency)
+        print(f"{batch_size:>20} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,336 @@
+"""
+Load test toàn pipeline: InMemoryBroker -> InMemoryConsumer -> ConsumerRunner
+-> ObserverManager -> HttpTarget -> StandInServer (HTTP thật qua socket localhost).
+
+Mỗi scenario chạy trong một process con riêng (registry / connection pool / RSS sạch),
+kết quả ghi ra JSON để so sánh giữa các lần chạy:
+
+    python -m benchmarks.load_test run --output results/base.json
+    python -m benchmarks.load_test run --scenarios baseline error_burst --messages 5000 --output results/new.json
+    python -m benchmarks.load_test compare results/base.json results/new.json --tolerance 0.1
+
+Số đo: throughput, latency p50/p99 (publish -> handler xong), RSS high-water mark,
+số socket server đã accept, retry / thời gian chờ rate limit phía client.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from benchmarks.standin_server import Faults, StandInServer
+
+SOURCE = "bench"
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "faults": {"latency_ms": 1},
+    },
+    "slow_upstream": {
+        "faults": {"latency_ms": 20, "jitter_ms": 30},
+    },
+    "rate_limit_header": {
+        "faults": {"latency_ms": 1, "rate_limit_every": 50, "rate_limit_style": "header", "retry_after_s": 0.05},
+        "target": {"ratelimit": {"strategy": "header"}, "retry": {"status_forcelist": [429, 503]}},
+    },
+    "rate_limit_json": {
+        "faults": {"latency_ms": 1, "rate_limit_every": 50, "rate_limit_style": "json_reset", "retry_after_s": 0.05},
+        "target": {"ratelimit": {"strategy": "response"}, "retry": {"status_forcelist": [429, 503]}},
+    },
+    "error_burst": {
+        "faults": {"latency_ms": 1, "error_burst_every": 500, "error_burst_len": 25},
+        "target": {
+            "retry": {"max_attempts": 4, "backoff_factor": 0.01, "max_backoff": 0.2},
+            "circuit_breaker": {"failure_threshold": 10, "recovery_timeout": 0.2},
+        },
+    },
+    "batched": {
+        "faults": {"latency_ms": 5},
+        "target": {"batch": {"max_items": 100, "max_linger_ms": 5}},
+    },
+    "paginate": {
+        "kind": "paginate",
+        "faults": {"latency_ms": 2, "pages": 50, "page_items": 1000, "item_bytes": 200},
+        "pagination": {"mode": "cursor", "prefetch": True},
+    },
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def max_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 if sys.platform != "darwin" else usage / (1024 * 1024)
+
+
+def client_counters() -> Dict[str, float]:
+    from telemetry.instruments import RATE_LIMIT_WAIT, REQUEST_RETRIES
+
+    return {
+        "retries": REQUEST_RETRIES.total(),
+        "rate_limit_wait_s": round(RATE_LIMIT_WAIT.total(), 3),
+    }
+
+
+# -------------------------------
+# Scenario runners (chạy trong process con)
+# -------------------------------
+async def run_pipeline(spec: Dict[str, Any], args) -> Dict[str, Any]:
+    from config.models import DispatchConfig, ObserverConfig
+    from message_queue.consumer_runner import ConsumerRunner
+    from message_queue.in_memory_broker import InMemoryBroker, InMemoryConsumer, InMemoryPublisher
+    from observer.observer_manager import ObserverManager
+
+    async with StandInServer(Faults(**spec.get("faults", {}))) as server:
+        targets = [
+            {
+                "name": f"t{i}",
+                "type": "http",
+                "body": "json",
+                "urls": [f"{server.url}/t{i}/u{j}" for j in range(args.urls)],
+                **spec.get("target", {}),
+            }
+            for i in range(args.targets)
+        ]
+        observer_cfg = ObserverConfig.parse_obj({SOURCE: {"targets": targets}})
+        manager = ObserverManager.from_config(observer_cfg, DispatchConfig(max_in_flight=args.in_flight))
+
+        broker = InMemoryBroker()
+        broker.bind("bench_queue", "bench_exchange", SOURCE)
+        publisher = InMemoryPublisher(broker, exchange="bench_exchange", confirm_batch_size=500)
+        consumer = InMemoryConsumer(broker, "bench_queue", prefetch_count=args.prefetch)
+
+        latencies: List[float] = []
+        failures = 0
+        done = asyncio.Event()
+
+        async def handler(source: str, data: dict) -> bool:
+            nonlocal failures
+            ok = await manager.handle_message(source, data)
+            if ok:
+                latencies.append(time.perf_counter() - data["sent_at"])
+                if len(latencies) >= args.messages:
+                    done.set()
+            else:
+                failures += 1
+            return ok
+
+        runner = ConsumerRunner(consumer, handler, workers=args.workers)
+        await publisher.start()
+        run_task = asyncio.create_task(runner.run())
+        started = time.perf_counter()
+        payload = "x" * args.payload_bytes
+        for i in range(args.messages):
+            message = {"source": SOURCE, "data": {"id": i, "sent_at": time.perf_counter(), "payload": payload}}
+            await publisher.publish(SOURCE, json.dumps(message).encode())
+        await publisher.close()
+
+        try:
+            await asyncio.wait_for(done.wait(), args.timeout)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - started
+        await runner.stop()
+        await run_task
+        await manager.close()
+
+    return {
+        "messages": len(latencies),
+        "redeliveries": failures,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(max(latencies, default=0) * 1000, 3),
+        },
+        "max_rss_mb": round(max_rss_mb(), 1),
+        "sockets_opened": server.stats.connections,
+        "server": server.stats.to_dict(),
+        "client": client_counters(),
+    }
+
+
+async def run_paginate(spec: Dict[str, Any], args) -> Dict[str, Any]:
+    from requester_client.dynamic_http_client import DynamicHttpClient
+
+    async with StandInServer(Faults(**spec.get("faults", {}))) as server:
+        client = DynamicHttpClient(base_url=server.url)
+        items = 0
+        page_times: List[float] = []
+        started = last = time.perf_counter()
+        async for page in client.paginate_from_config("/pages", spec.get("pagination")):
+            now = time.perf_counter()
+            page_times.append(now - last)
+            last = now
+            items += len(page)
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+
+    return {
+        "messages": items,
+        "pages": len(page_times),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(items / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(page_times, 50) * 1000, 3),
+            "p99": round(percentile(page_times, 99) * 1000, 3),
+            "max": round(max(page_times, default=0) * 1000, 3),
+        },
+        "max_rss_mb": round(max_rss_mb(), 1),
+        "sockets_opened": server.stats.connections,
+        "server": server.stats.to_dict(),
+        "client": client_counters(),
+    }
+
+
+def run_scenario(name: str, args) -> Dict[str, Any]:
+    spec = SCENARIOS[name]
+    runner = run_paginate if spec.get("kind") == "paginate" else run_pipeline
+    return asyncio.run(runner(spec, args))
+
+
+# -------------------------------
+# Orchestration / compare
+# -------------------------------
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return ""
+
+
+def _child_args(args) -> List[str]:
+    return [
+        "--messages", str(args.messages),
+        "--targets", str(args.targets),
+        "--urls", str(args.urls),
+        "--workers", str(args.workers),
+        "--prefetch", str(args.prefetch),
+        "--in-flight", str(args.in_flight),
+        "--payload-bytes", str(args.payload_bytes),
+        "--timeout", str(args.timeout),
+    ]
+
+
+def cmd_run(args):
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("func", "output", "scenarios")},
+            "faults": {name: asdict(Faults(**SCENARIOS[name].get("faults", {}))) for name in args.scenarios},
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        cmd = [sys.executable, "-m", "benchmarks.load_test", "scenario", name, *_child_args(args)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, env={**os.environ, "LOG_LEVEL": "ERROR"})
+        if proc.returncode != 0:
+            print(f"{name:<20} FAILED\n{proc.stderr}", file=sys.stderr)
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results["scenarios"][name] = result
+        lat = result["latency_ms"]
+        print(
+            f"{name:<20} {result['throughput_per_s']:>10.1f}/s  p50 {lat['p50']:>8.2f}ms  p99 {lat['p99']:>8.2f}ms"
+            f"  rss {result['max_rss_mb']:>6.1f}MB  sockets {result['sockets_opened']:>4}"
+        )
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+def cmd_scenario(args):
+    from telemetry import setup_logging
+
+    setup_logging()
+    print(json.dumps(run_scenario(args.name, args)))
+
+
+# (tên metric, hàm lấy giá trị, True nếu càng cao càng tốt)
+COMPARED_METRICS = [
+    ("throughput_per_s", lambda r: r["throughput_per_s"], True),
+    ("p50_ms", lambda r: r["latency_ms"]["p50"], False),
+    ("p99_ms", lambda r: r["latency_ms"]["p99"], False),
+    ("max_rss_mb", lambda r: r["max_rss_mb"], False),
+    ("sockets_opened", lambda r: r["sockets_opened"], False),
+]
+
+
+def cmd_compare(args) -> int:
+    with open(args.base) as f:
+        base = json.load(f)["scenarios"]
+    with open(args.new) as f:
+        new = json.load(f)["scenarios"]
+
+    regressions = 0
+    print(f"{'scenario':<20} {'metric':<16} {'base':>10} {'new':>10} {'change':>8}")
+    for name in sorted(set(base) & set(new)):
+        for metric, get, higher_is_better in COMPARED_METRICS:
+            old_value, new_value = get(base[name]), get(new[name])
+            change = (new_value - old_value) / old_value if old_value else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > args.tolerance:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{name:<20} {metric:<16} {old_value:>10.2f} {new_value:>10.2f} {change:>+7.1%}{flag}")
+    for name in sorted(set(base) ^ set(new)):
+        print(f"{name:<20} only in {'base' if name in base else 'new'}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_load_args(p):
+        p.add_argument("--messages", type=int, default=2000)
+        p.add_argument("--targets", type=int, default=2)
+        p.add_argument("--urls", type=int, default=2, help="số URL mỗi target")
+        p.add_argument("--workers", type=int, default=20, help="worker của ConsumerRunner")
+        p.add_argument("--prefetch", type=int, default=500)
+        p.add_argument("--in-flight", type=int, default=1000)
+        p.add_argument("--payload-bytes", type=int, default=512)
+        p.add_argument("--timeout", type=float, default=120)
+
+    run = sub.add_parser("run", help="chạy các scenario, mỗi scenario một process con")
+    run.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    run.add_argument("--output", help="file JSON kết quả")
+    add_load_args(run)
+    run.set_defaults(func=cmd_run)
+
+    scenario = sub.add_parser("scenario", help="chạy một scenario trong process hiện tại, in JSON")
+    scenario.add_argument("name", choices=list(SCENARIOS))
+    add_load_args(scenario)
+    scenario.set_defaults(func=cmd_scenario)
+
+    compare = sub.add_parser("compare", help="so sánh hai file kết quả, exit 1 nếu có regression")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--tolerance", type=float, default=0.1, help="mức tệ đi tối đa cho phép (0.1 = 10%%)")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
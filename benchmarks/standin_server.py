@@ -0,0 +1,191 @@
+"""
+HTTP server giả lập (stand-in) chạy trong process, dùng cho benchmark / load test.
+
+- Mọi path (trừ /pages) là endpoint nhận message: trả 200 sau `latency_ms`
+  và có thể chèn lỗi theo `Faults` (429 Retry-After / JSON reset body, chuỗi 5xx).
+- GET /pages: trả trang lớn theo cursor (`page_token`) hoặc page / offset.
+- Đếm số kết nối TCP đã mở, số request, status trả về và bytes nhận được.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Dict, Literal, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class Faults:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # 429: cứ mỗi `rate_limit_every` request thì trả một 429
+    rate_limit_every: int = 0
+    rate_limit_style: Literal["header", "json", "json_reset"] = "header"
+    retry_after_s: float = 0.05
+    # 5xx: trong mỗi chu kỳ `error_burst_every` request, `error_burst_len` request đầu lỗi
+    error_burst_every: int = 0
+    error_burst_len: int = 0
+    error_status: int = 503
+    # /pages
+    pages: int = 20
+    page_items: int = 500
+    item_bytes: int = 200
+
+
+@dataclass
+class ServerStats:
+    connections: int = 0
+    requests: int = 0
+    bytes_received: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+    def to_dict(self) -> Dict:
+        return {
+            "connections": self.connections,
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+class StandInServer:
+    def __init__(self, faults: Optional[Faults] = None, host: str = "127.0.0.1", port: int = 0, seed: int = 1):
+        self.faults = faults or Faults()
+        self.host = host
+        self.port = port
+        self.stats = ServerStats()
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._page_cache: Dict[int, bytes] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Kết nối keep-alive còn mở -> đóng socket để handler thấy EOF và tự kết thúc
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*list(self._connections), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # -------------------------------
+    # HTTP/1.1 keep-alive
+    # -------------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats.connections += 1
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body_size = await self._read_body(reader, headers)
+
+                status, extra_headers, body = await self._respond(method, target, body_size)
+                head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Length: {len(body)}", "Content-Type: application/json"]
+                head += [f"{k}: {v}" for k, v in extra_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            return
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> int:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                total += size
+                if size == 0:
+                    return total
+        length = int(headers.get("content-length", 0))
+        if length:
+            await reader.readexactly(length)
+        return length
+
+    # -------------------------------
+    # Routes
+    # -------------------------------
+    async def _respond(self, method: str, target: str, body_size: int) -> Tuple[int, Dict[str, str], bytes]:
+        stats, faults = self.stats, self.faults
+        stats.requests += 1
+        stats.bytes_received += body_size
+        index = stats.requests
+
+        if faults.latency_ms or faults.jitter_ms:
+            delay = faults.latency_ms + self._random.uniform(0, faults.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        parts = urlsplit(target)
+        if parts.path == "/pages":
+            status, headers, body = 200, {}, self._page(parse_qs(parts.query))
+        elif faults.error_burst_every and (index - 1) % faults.error_burst_every < faults.error_burst_len:
+            status, headers, body = faults.error_status, {}, b'{"error":"burst"}'
+        elif faults.rate_limit_every and index % faults.rate_limit_every == 0:
+            status, headers, body = 429, *self._rate_limited()
+        else:
+            status, headers, body = 200, {}, b'{"ok":true}'
+        stats.statuses[status] += 1
+        return status, headers, body
+
+    def _rate_limited(self) -> Tuple[Dict[str, str], bytes]:
+        faults = self.faults
+        if faults.rate_limit_style == "header":
+            return {"Retry-After": f"{faults.retry_after_s:g}"}, b'{"error":"rate limited"}'
+        if faults.rate_limit_style == "json":
+            return {}, json.dumps({"error": "rate limited", "retry_after": faults.retry_after_s}).encode()
+        reset = time.time() + faults.retry_after_s
+        return {}, json.dumps({"error": "rate limited", "rate_limit_reset": reset}).encode()
+
+    def _page(self, query: Dict[str, list]) -> bytes:
+        """Cursor (page_token), page (page, 1-based) hoặc offset (offset + limit)."""
+        faults = self.faults
+        if "offset" in query:
+            page = int(query["offset"][0]) // int(query.get("limit", [faults.page_items])[0])
+        elif "page" in query:
+            page = int(query["page"][0]) - 1
+        else:
+            page = int(query.get("page_token", ["0"])[0] or 0)
+        page = max(0, page)
+
+        body = self._page_cache.get(page)
+        if body is None:
+            count = faults.page_items if page < faults.pages else 0
+            filler = "x" * faults.item_bytes
+            items = [{"id": page * faults.page_items + i, "payload": filler} for i in range(count)]
+            next_token = str(page + 1) if page + 1 < faults.pages else None
+            body = self._page_cache[page] = json.dumps({"results": items, "next": next_token}).encode()
+        return body
@@ -0,0 +1,88 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+TargetKey = Tuple[str, str]  # (source, tên target)
+
+
+def to_plain(cfg: Any) -> Any:
+    """Chuyển pydantic model (kể cả model __root__) về dict/list thuần."""
+    if cfg is None:
+        return {}
+    if hasattr(cfg, "dict"):
+        cfg = cfg.dict(by_alias=True)
+    if isinstance(cfg, dict) and "__root__" in cfg:
+        cfg = cfg["__root__"]
+    return cfg
+
+
+def fingerprint(cfg: Any) -> str:
+    """Hash ổn định của một config (không phụ thuộc thứ tự key)."""
+    raw = json.dumps(to_plain(cfg), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def flatten_targets(observer_cfg: Any) -> Dict[TargetKey, dict]:
+    """ObserverConfig -> {(source, tên target): config target}, giữ thứ tự khai báo."""
+    flat: Dict[TargetKey, dict] = {}
+    for source, source_cfg in to_plain(observer_cfg).items():
+        for target_cfg in to_plain(source_cfg).get("targets", []):
+            target_cfg = to_plain(target_cfg)
+            flat[(source, target_cfg.get("name", ""))] = target_cfg
+    return flat
+
+
+@dataclass
+class ObserverConfigDiff:
+    """Khác biệt giữa hai ObserverConfig, theo từng target."""
+
+    added: Dict[TargetKey, dict] = field(default_factory=dict)
+    changed: Dict[TargetKey, dict] = field(default_factory=dict)
+    removed: List[TargetKey] = field(default_factory=list)
+    fingerprints: Dict[TargetKey, str] = field(default_factory=dict)  # fingerprint của config mới
+    order_changed: List[str] = field(default_factory=list)  # source chỉ đổi thứ tự target
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.order_changed)
+
+    @property
+    def sources(self) -> set:
+        """Các source cần dựng lại danh sách target."""
+        keys = list(self.added) + list(self.changed) + self.removed
+        return {source for source, _ in keys} | set(self.order_changed)
+
+    def __str__(self) -> str:
+        return f"+{len(self.added)} ~{len(self.changed)} -{len(self.removed)}"
+
+
+def diff_observer_config(old_fingerprints: Dict[TargetKey, str], new_cfg: Any) -> ObserverConfigDiff:
+    """
+    So sánh fingerprint đã lưu của config cũ với config mới.
+    Chỉ cần hash config mới; target không đổi giữ nguyên instance.
+    """
+    new_targets = flatten_targets(new_cfg)
+    diff = ObserverConfigDiff()
+    for key, target_cfg in new_targets.items():
+        fp = fingerprint(target_cfg)
+        diff.fingerprints[key] = fp
+        old_fp = old_fingerprints.get(key)
+        if old_fp is None:
+            diff.added[key] = target_cfg
+        elif old_fp != fp:
+            diff.changed[key] = target_cfg
+    diff.removed = [key for key in old_fingerprints if key not in new_targets]
+
+    old_order = _order_by_source(old_fingerprints)
+    for source, names in _order_by_source(new_targets).items():
+        if source not in diff.sources and old_order.get(source) != names:
+            diff.order_changed.append(source)
+    return diff
+
+
+def _order_by_source(keys) -> Dict[str, List[str]]:
+    order: Dict[str, List[str]] = {}
+    for source, name in keys:
+        order.setdefault(source, []).append(name)
+    return order
@@ -1,21 +1,51 @@
+import logging
 import os
+from functools import lru_cache
 from .providers.env_config_provider import EnvConfigProvider
+from .providers.file_config_provider import FileConfigProvider
+from .providers.http_config_provider import HttpConfigProvider
 from .providers.base_config_provider import BaseConfigProvider
 
+logger = logging.getLogger(__name__)
+
+
+PROVIDERS = {
+    "env": EnvConfigProvider,
+    "file": FileConfigProvider,
+    "http": HttpConfigProvider,
+}
+
+# Provider dùng chung trong process (tạo một lần, reload khi config đổi)
+_provider: BaseConfigProvider | None = None
+
 def get_config_provider() -> BaseConfigProvider:
     provider_type = os.getenv("CONFIG_PROVIDER", "env").lower()
-    if provider_type == "env":
-         EnvConfigProvider()
-    else:
+    provider_cls = PROVIDERS.get(provider_type)
+    if provider_cls is None:
         raise ValueError(f"Unknown CONFIG_PROVIDER: {provider_type}")
-    return EnvConfigProvider()
+    return provider_cls()
+
+def current_provider() -> BaseConfigProvider:
+    global _provider
+    if _provider is None:
+        _provider = get_config_provider()
+    return _provider
 
+@lru_cache(maxsize=1)
 def load_raw_config() -> dict:
-    provider = get_config_provider()
+    provider = current_provider()
     raw = provider.load()
-    print(f"[CONFIG] Loaded raw config from {provider.__class__.__name__}")
+    logger.info(f"[CONFIG] Loaded raw config from {provider.__class__.__name__}")
     return raw
 
 def reload_raw_config() -> dict:
+    if _provider is not None:
+        _provider.reload()
     load_raw_config.cache_clear()
     return load_raw_config()
+
+def poll_raw_config() -> dict | None:
+    """Đọc lại config nếu provider báo có thay đổi; None nếu không đổi."""
+    if _provider is not None and not _provider.has_changed():
+        return None
+    return reload_raw_config()
@@ -0,0 +1,75 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, List, Optional
+
+from config.config_diff import fingerprint
+from config.config_provider_factory import load_raw_config, poll_raw_config
+from config.settings import AppSettings
+
+logger = logging.getLogger(__name__)
+
+
+ConfigCallback = Callable[[AppSettings, AppSettings], Optional[Awaitable[Any]]]
+
+
+class ConfigWatcher:
+    """
+    Poll config provider theo chu kỳ; khi nội dung thực sự đổi (so fingerprint)
+    thì parse thành AppSettings mới và gọi subscriber với (settings cũ, settings mới).
+    Config mới không hợp lệ -> log và giữ config cũ.
+    """
+
+    def __init__(self, current: AppSettings, interval: float = 5.0):
+        self.current = current
+        self.interval = interval
+        self._fingerprint = fingerprint(load_raw_config())
+        self._callbacks: List[ConfigCallback] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: ConfigCallback):
+        self._callbacks.append(callback)
+
+    async def check(self) -> bool:
+        """Kiểm tra một lần; trả về True nếu đã áp dụng config mới."""
+        raw = await asyncio.to_thread(poll_raw_config)
+        if raw is None:
+            return False
+        fp = fingerprint(raw)
+        if fp == self._fingerprint:
+            return False
+
+        try:
+            new_settings = AppSettings.load()
+        except Exception as e:
+            logger.warning(f"[CONFIG] Ignoring invalid config update: {e}")
+            return False
+
+        old_settings, self.current, self._fingerprint = self.current, new_settings, fp
+        logger.info("[CONFIG] Config changed, notifying subscribers")
+        for callback in self._callbacks:
+            try:
+                result = callback(old_settings, new_settings)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"[CONFIG] Config subscriber failed: {e}")
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f"[CONFIG] Config reload failed: {e}")
@@ -1,17 +1,37 @@
-from .common import AuthConfig, RetryConfig, RateLimitConfig
-from .observer import ObserverConfig, HttpTargetConfig, RabbitMQTargetConfig
-from .data_source import DataSourceConfig, DataSourceItem
+from .common import AuthConfig, RetryConfig, RateLimitConfig, RateLimitStateConfig, ConnectionConfig, CircuitBreakerConfig, CompressionConfig
+from .observer import (
+    ObserverConfig,
+    HttpTargetConfig,
+    RabbitMQTargetConfig,
+    KafkaTargetConfig,
+    DispatchConfig,
+    BatchConfig,
+    HedgeConfig,
+    SpoolConfig,
+)
+from .data_source import DataSourceConfig, DataSourceItem, IncrementalConfig, PaginationConfig
 from .message_queue import MessageQueueConfig, SSLConfig
 
 __all__ = [
     "AuthConfig",
     "RetryConfig",
     "RateLimitConfig",
+    "RateLimitStateConfig",
+    "ConnectionConfig",
+    "CircuitBreakerConfig",
+    "CompressionConfig",
     "ObserverConfig",
     "HttpTargetConfig",
     "RabbitMQTargetConfig",
+    "KafkaTargetConfig",
+    "DispatchConfig",
+    "BatchConfig",
+    "HedgeConfig",
+    "SpoolConfig",
     "DataSourceConfig",
     "DataSourceItem",
+    "PaginationConfig",
+    "IncrementalConfig",
     "MessageQueueConfig",
     "SSLConfig",
 ]
@@ -1,24 +1,81 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 from typing import Dict, List, Optional, Literal
 
 class AuthConfig(BaseModel):
-    strategy: Literal["bearer", "api_key", "basic", "no_auth"] = "no_auth"
+    strategy: Literal["bearer", "api_key", "basic", "oauth2_client_credentials", "no_auth"] = "no_auth"
     key: Optional[str] = None
     value: Optional[str] = None
     username: Optional[str] = None
     password: Optional[str] = None
     token: Optional[str] = None
     in_: Optional[Literal["header", "query"]] = Field(default="header", alias="in")
+    # oauth2_client_credentials
+    token_url: Optional[str] = None
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    scope: Optional[str] = None
+    audience: Optional[str] = None
+    client_auth: Literal["basic", "body"] = "basic"  # gửi client_id/secret qua Basic header hoặc form body
+    refresh_margin: float = 60.0  # làm mới token trước khi hết hạn (giây)
 
 
 class RetryConfig(BaseModel):
     max_attempts: int = 3
     backoff_factor: float = 1.0
     status_forcelist: List[int] = Field(default_factory=lambda: [500, 502, 503, 504])
+    max_backoff: float = 30.0
+    # Retry budget: retry tối đa ~ budget_ratio * số request, tối thiểu budget_min_per_sec retry/giây
+    budget_ratio: float = 0.2
+    budget_min_per_sec: float = 10.0
+
+
+class RateLimitStateConfig(BaseModel):
+    """Trạng thái throttle dùng chung giữa các worker (xem requester_client.rate_limiter.state_backend)."""
+    backend: Literal["local", "shared_memory", "redis"] = "local"
+    key: Optional[str] = None  # mặc định: tên target; đặt cùng key để nhiều target chung một quota
+    path: Optional[str] = None  # shared_memory: file mmap (mặc định /dev/shm/requester-ratelimit-state)
+    slots: int = 1024
+    url: Optional[str] = None  # redis: redis://host:port/db
+    prefix: str = "ratelimit:"
+    refresh_interval_ms: int = 100  # redis: cache đọc trạng thái
 
 
 class RateLimitConfig(BaseModel):
     strategy: Literal["response", "header", "fixed"] = "response"
     json_fields: Dict[str, List[str]] = Field(default_factory=dict)
+    headers: Dict[str, List[str]] = Field(default_factory=dict)
+    rate: Optional[float] = None  # request/giây cho strategy "fixed"
+    burst: int = 1
     default_wait: float = 0.3
     max_wait: float = 30.0
+    state: Optional[RateLimitStateConfig] = None
+
+    @root_validator(skip_on_failure=True)
+    def _fixed_requires_rate(cls, values):
+        if values.get("strategy") == "fixed" and not values.get("rate"):
+            raise ValueError("ratelimit.rate (> 0) is required for strategy 'fixed'")
+        return values
+
+
+class ConnectionConfig(BaseModel):
+    """Connection pool dùng chung theo origin (xem requester_client.transport_registry)."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+
+
+class CompressionConfig(BaseModel):
+    """Nén request body (Content-Encoding) khi body đủ lớn."""
+    encoding: Literal["gzip", "deflate", "zstd"] = "gzip"  # zstd cần package zstandard
+    level: Optional[int] = None
+    min_size: int = 1024  # body nhỏ hơn ngưỡng này gửi nguyên
+    offload_size: int = 256 * 1024  # body từ ngưỡng này nén trong thread pool
+    accept_encoding: bool = True  # gửi Accept-Encoding để server nén response
+
+
+class CircuitBreakerConfig(BaseModel):
+    """Circuit breaker theo origin: open sau N lỗi liên tiếp, thử lại sau recovery_timeout."""
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
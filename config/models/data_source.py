@@ -1,16 +1,64 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Dict, Optional, Literal, Any
-from .common import AuthConfig, RetryConfig
+from typing import Dict, List, Optional, Literal, Any, Union
+from .common import AuthConfig, RetryConfig, ConnectionConfig, CircuitBreakerConfig
+
+
+class PaginationConfig(BaseModel):
+    """
+    Chiến lược pagination của data source:
+    - cursor: đọc next token từ `next_page_key`, prefetch trang kế tiếp
+    - page / offset: fetch song song `concurrency` trang, giữ đúng thứ tự; dừng ở trang rỗng
+      hoặc theo `total_path` / `has_more_path` nếu API trả về
+    """
+    mode: Literal["cursor", "page", "offset"] = "cursor"
+    method: str = "GET"
+    items_path: str = "results"
+    # cursor
+    next_page_key: str = "next"
+    page_token_param: str = "page_token"
+    prefetch: bool = True
+    # page / offset
+    page_param: Optional[str] = None  # mặc định "page" / "offset"
+    page_size_param: Optional[str] = None  # mặc định "page_size" / "limit"
+    page_size: int = 100
+    start: Optional[int] = None  # mặc định 1 (page) / 0 (offset)
+    concurrency: int = 4
+    max_pages: Optional[int] = None
+    total_path: Optional[str] = None  # vd "meta.total": tổng số item
+    has_more_path: Optional[str] = None  # vd "has_more": false -> trang cuối
+
+
+class IncrementalConfig(BaseModel):
+    """
+    Poll tăng dần: mỗi lần poll chỉ lấy item có `watermark_path` >= watermark của lần trước
+    (gửi ở query param `since_param`, API phải lọc inclusive). Watermark lưu ở
+    `<state_dir>/<source>.json` nên giữ qua restart; item trùng watermark có thể được xử lý lại.
+    Giá trị watermark phải so sánh được theo thứ tự (số, ISO timestamp cùng định dạng).
+    """
+    since_param: str  # vd "updated_since"
+    watermark_path: str  # vd "updated_at" / "meta.modified"
+    state_dir: str = "./ingest_state"
 
 
 class DataSourceItem(BaseModel):
     type: Literal["http", "db", "s3"]
     base_url: Optional[HttpUrl] = None
-    endpoints: Optional[str] = None
+    endpoints: Optional[Union[str, List[str]]] = None
     auth: Optional[AuthConfig] = None
     params: Optional[Dict[str, Any]] = None
     headers: Optional[Dict[str, str]] = None
     retry: Optional[RetryConfig] = None
+    pagination: Optional[PaginationConfig] = None
+    connection: Optional[ConnectionConfig] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    # Ingestion (type "http"): poll định kỳ, stream item vào ObserverManager theo tên source
+    enabled: bool = True
+    interval: float = 60.0  # giây giữa hai lần poll; <= 0: chỉ poll một lần
+    concurrency: int = 4  # số item xử lý song song
+    buffer_size: int = 1000  # số item tối đa chờ xử lý; đầy -> tạm dừng fetch trang
+    item_retries: int = 2  # số lần gọi lại handler khi item xử lý lỗi
+    item_retry_backoff: float = 0.5  # giây, nhân đôi sau mỗi lần retry
+    incremental: Optional[IncrementalConfig] = None  # None: mỗi lần poll duyệt lại toàn bộ
 
 
 class DataSourceConfig(BaseModel):
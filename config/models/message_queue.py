@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, Optional, Literal, Any
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Literal, Any
 
 
 class SSLConfig(BaseModel):
@@ -7,7 +7,7 @@ class SSLConfig(BaseModel):
 
 
 class MessageQueueConfig(BaseModel):
-    type: Literal["rabbitmq", "kafka"] = "rabbitmq"
+    type: Literal["rabbitmq", "kafka", "memory"] = "rabbitmq"
     host: str
     port: int = 5672
     username: str
@@ -21,3 +21,18 @@ class MessageQueueConfig(BaseModel):
     delivery_mode: int = 2
     ssl: bool = False
     ssl_options: Optional[SSLConfig] = None
+
+    # Consumer
+    queue: str = "observer_events"
+    routing_key: Optional[str] = None  # mặc định = queue
+    # Số message xử lý đồng thời <= min(prefetch_count, consumer_workers); để giới hạn
+    # của DispatchConfig (max_in_flight / per_source) có tác dụng, đặt hai giá trị này >= chúng
+    prefetch_count: int = 200
+    consumer_workers: int = 200
+    ack_batch_size: int = 50
+    ack_interval_ms: float = 200
+
+    # Kafka (ack_batch_size / ack_interval_ms dùng cho commit offset)
+    bootstrap_servers: Optional[str] = None  # mặc định "host:port"
+    topics: List[str] = Field(default_factory=list)  # mặc định [queue]
+    group_id: str = "observer"
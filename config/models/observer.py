@@ -1,6 +1,43 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, root_validator, validator
 from typing import Dict, List, Optional, Union, Literal, Any
-from .common import AuthConfig, RetryConfig, RateLimitConfig
+from .common import (
+    AuthConfig,
+    RetryConfig,
+    RateLimitConfig,
+    ConnectionConfig,
+    CircuitBreakerConfig,
+    CompressionConfig,
+)
+
+
+class BatchConfig(BaseModel):
+    """Gom nhiều message thành một request (body là JSON array)."""
+    max_items: int = 100
+    max_bytes: int = 1_000_000
+    max_linger_ms: float = 50
+    # Batch lỗi -> chia đôi gửi lại, tối đa `split_depth` cấp (7: tới từng item với batch 100 item)
+    # để một item hỏng / lỗi thoáng qua không làm lỗi cả batch; 0: không chia, cả batch coi như lỗi
+    split_depth: int = 7
+
+
+class HedgeConfig(BaseModel):
+    percentile: float = 95  # hedge khi request chậm hơn percentile này của URL chính
+    min_delay_ms: float = 10
+    max_delay_ms: float = 2000
+    default_delay_ms: float = 200  # dùng khi URL chưa đủ mẫu latency
+    min_samples: int = 20
+    max_hedges: int = 1
+
+
+class SpoolConfig(BaseModel):
+    # Mỗi target dùng thư mục con theo tên target (WORKERS > 1: thêm worker-<id>);
+    # spool của worker không còn tồn tại sau khi đổi WORKERS được worker 0 gộp vào spool của nó
+    directory: str = "./spool"
+    segment_bytes: int = 16 * 1024 * 1024
+    commit_linger_ms: float = 2  # gom append trong khoảng này rồi msync một lần
+    replay_concurrency: int = 8
+    replay_interval_ms: float = 1000
+    replay_max_backoff_ms: float = 30000
 
 
 class HttpTargetConfig(BaseModel):
@@ -10,23 +47,73 @@ class HttpTargetConfig(BaseModel):
     urls: List[HttpUrl]
     headers: Dict[str, str] = Field(default_factory=dict)
     params: Optional[Dict[str, Any]] = None
+    body: Literal["form", "json"] = "form"  # form: gửi data dạng form fields; json: JSON body
     auth: Optional[AuthConfig] = None
     retry: Optional[RetryConfig] = None
     ratelimit: Optional[RateLimitConfig] = None
+    batch: Optional[BatchConfig] = None
+    connection: Optional[ConnectionConfig] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    delivery: Literal["all", "hedged"] = "all"  # hedged: urls là replica, một URL thành công là đủ
+    hedge: Optional[HedgeConfig] = None
+    spool: Optional[SpoolConfig] = None
+    compression: Optional[CompressionConfig] = None  # chỉ áp dụng cho body JSON (body="json" / batch)
+
+    @root_validator(skip_on_failure=True)
+    def _batch_requires_json(cls, values):
+        # Batch luôn gửi JSON array, không có dạng form tương ứng
+        if values.get("batch") is not None and values.get("body") != "json":
+            raise ValueError("batch requires body 'json' (batched requests are sent as a JSON array)")
+        return values
 
 
 class RabbitMQTargetConfig(BaseModel):
     name: str
     type: Literal["rabbitmq"]
     topic: str
+    exchange: Optional[str] = None  # mặc định dùng exchange của MessageQueueConfig
+    routing_key: Optional[str] = None  # mặc định = topic
+    channel_pool_size: int = 4
+    confirm_batch_size: int = 100
+    confirm_linger_ms: float = 5
 
 
-TargetConfig = Union[HttpTargetConfig, RabbitMQTargetConfig]
+class KafkaTargetConfig(BaseModel):
+    name: str
+    type: Literal["kafka"]
+    topic: str
+    key_field: Optional[str] = None  # path trong data dùng làm message key (giữ thứ tự theo key)
+    linger_ms: float = 5
+    max_batch_size: int = 16384
+    compression_type: Optional[Literal["gzip", "snappy", "lz4", "zstd"]] = "gzip"
+    acks: Union[Literal["all"], int] = "all"
+
+
+TargetConfig = Union[HttpTargetConfig, RabbitMQTargetConfig, KafkaTargetConfig]
 
 
 class SourceObserverConfig(BaseModel):
     targets: List[TargetConfig]
 
+    @validator("targets")
+    def _unique_target_names(cls, targets):
+        # Tên target là khoá khi hot-reload / dispatch (source, name): trùng tên -> target bị gộp mất
+        seen = set()
+        for target in targets:
+            if not target.name:
+                raise ValueError("target name must not be empty")
+            if target.name in seen:
+                raise ValueError(f"duplicate target name '{target.name}'")
+            seen.add(target.name)
+        return targets
+
+
+class DispatchConfig(BaseModel):
+    """Giới hạn đồng thời khi fan-out message tới targets."""
+    max_in_flight: int = 1000
+    per_source: int = 200
+    per_target: int = 50
+
 
 class ObserverConfig(BaseModel):
     """Map source → danh sách targets."""
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
 
 class BaseConfigProvider(ABC):
@@ -7,3 +9,19 @@ class BaseConfigProvider(ABC):
     def load(self) -> dict:
         """Trả về raw config dưới dạng dict."""
         pass
+
+    def has_changed(self) -> bool:
+        """
+        Nguồn config có thể đã đổi kể từ lần load (dùng khi watch/hot-reload).
+        Mặc định luôn True: đọc lại rồi so fingerprint; provider override để check rẻ hơn.
+        """
+        return True
+
+    def reload(self) -> dict:
+        """Đọc lại config từ nguồn (mặc định: như load())."""
+        return self.load()
+
+    def content_hash(self) -> str:
+        """Hash nội dung config hiện tại (key cho snapshot AppSettings đã validate)."""
+        raw = json.dumps(self.load(), sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
@@ -1,7 +1,12 @@
+import logging
 import os
 import json
+import hashlib
 from .base_config_provider import BaseConfigProvider
 
+logger = logging.getLogger(__name__)
+
+
 class EnvConfigProvider(BaseConfigProvider):
     """
     Provider đọc config từ ENV, hỗ trợ prefix theo môi trường:
@@ -15,32 +20,56 @@ class EnvConfigProvider(BaseConfigProvider):
         "staging": "STAGING_",
     }
 
+    CONFIG_KEYS = {
+        "observer": "OBSERVER_CONFIG",
+        "data_source": "DATA_SOURCE_CONFIG",
+        "message_queue": "MESSAGE_QUEUE_CONFIG",
+        "dispatch": "DISPATCH_CONFIG",
+    }
+
     def __init__(self):
         self.env = os.getenv("APP_ENV", "dev").lower()
         self.prefix = self.PREFIX_MAP.get(self.env, f"{self.env.upper()}_")
-        print(f"[CONFIG] EnvConfigProvider using prefix: {self.prefix}")
+        logger.info(f"[CONFIG] EnvConfigProvider using prefix: {self.prefix}")
+        self._raw = self._read_raw()
         self.config = self._load_all()
 
+    def _read_raw(self) -> dict:
+        """Chuỗi JSON thô của từng nhóm (chưa parse)."""
+        return {
+            key: os.getenv(f"{self.prefix}{key}") or os.getenv(key) or "{}"
+            for key in self.CONFIG_KEYS.values()
+        }
+
     def _parse_json_env(self, key: str) -> dict:
         """Đọc và parse biến ENV (ưu tiên theo prefix môi trường)."""
         prefixed_key = f"{self.prefix}{key}"
-        raw = os.getenv(prefixed_key) or os.getenv(key) or "{}"
+        raw = self._raw[key]
         try:
             return json.loads(raw)
         except json.JSONDecodeError:
-            print(f"[ERROR] Invalid JSON in {prefixed_key or key}")
+            logger.error(f"[ERROR] Invalid JSON in {prefixed_key or key}")
             return {}
 
     def _load_all(self) -> dict:
         """Load toàn bộ config nhóm từ ENV."""
-        configs = {
-            "observer": self._parse_json_env("OBSERVER_CONFIG"),
-            "data_source": self._parse_json_env("DATA_SOURCE_CONFIG"),
-            "message_queue": self._parse_json_env("MESSAGE_QUEUE_CONFIG"),
-            "environment": self.env,
-        }
+        configs = {section: self._parse_json_env(key) for section, key in self.CONFIG_KEYS.items()}
+        configs["environment"] = self.env
         return configs
 
+    def has_changed(self) -> bool:
+        """So chuỗi ENV thô, không parse JSON khi không đổi."""
+        return self._read_raw() != self._raw
+
+    def reload(self) -> dict:
+        self._raw = self._read_raw()
+        self.config = self._load_all()
+        return self.config
+
+    def content_hash(self) -> str:
+        raw = json.dumps([self.env, self._raw], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
     def load(self) -> dict:
         """Public API load config."""
         return self.config
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import logging
+import os
+from .base_config_provider import BaseConfigProvider
+
+try:
+    import yaml
+except ImportError:  # YAML là tuỳ chọn, JSON luôn dùng được
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileConfigProvider(BaseConfigProvider):
+    """
+    Provider đọc config từ file JSON/YAML (CONFIG_FILE).
+    Chỉ đọc và parse lại khi mtime/size của file đổi.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("CONFIG_FILE", "config.json")
+        self.env = os.getenv("APP_ENV", "dev").lower()
+        self._stat = None
+        self._hash = None
+        self.config = {}
+        self.reload()
+
+    def _stat_key(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _parse(self, content: bytes) -> dict:
+        if self.path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("PyYAML is required for YAML config files")
+            data = yaml.safe_load(content) or {}
+        else:
+            data = json.loads(content or b"{}")
+        data.setdefault("environment", self.env)
+        return data
+
+    def has_changed(self) -> bool:
+        try:
+            return self._stat_key() != self._stat
+        except FileNotFoundError:
+            return False  # file đang được thay (rename) -> giữ config cũ
+
+    def reload(self) -> dict:
+        stat = self._stat_key()
+        with open(self.path, "rb") as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        if content_hash != self._hash:
+            # touch file mà nội dung không đổi -> không parse lại
+            self.config = self._parse(content)
+            self._hash = content_hash
+            logger.info(f"[CONFIG] FileConfigProvider loaded {self.path}")
+        self._stat = stat
+        return self.config
+
+    def content_hash(self) -> str:
+        return self._hash
+
+    def load(self) -> dict:
+        return self.config
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import logging
+import os
+import httpx
+from .base_config_provider import BaseConfigProvider
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+
+class HttpConfigProvider(BaseConfigProvider):
+    """
+    Provider lấy config qua HTTP (CONFIG_URL), poll bằng request có điều kiện:
+    server trả 304 (ETag / Last-Modified không đổi) thì không tải và không parse lại.
+    """
+
+    def __init__(self, url: str | None = None, timeout: float = 10.0):
+        self.url = url or os.getenv("CONFIG_URL")
+        if not self.url:
+            raise ValueError("CONFIG_URL is required for the http config provider")
+        self.env = os.getenv("APP_ENV", "dev").lower()
+        headers = {}
+        token = os.getenv("CONFIG_HTTP_TOKEN")
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self.client = httpx.Client(headers=headers, timeout=timeout)
+
+        self._etag = None
+        self._last_modified = None
+        self._hash = None
+        self._pending = None  # (content, content_type) đã tải trong has_changed(), chưa parse
+        self.config = {}
+        self.reload()
+
+    def _fetch(self) -> httpx.Response:
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        response = self.client.get(self.url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+        return response
+
+    def _parse(self, content: bytes, content_type: str) -> dict:
+        if "yaml" in content_type or self.url.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("PyYAML is required for YAML config")
+            data = yaml.safe_load(content) or {}
+        else:
+            data = json.loads(content or b"{}")
+        data.setdefault("environment", self.env)
+        return data
+
+    def has_changed(self) -> bool:
+        try:
+            response = self._fetch()
+        except httpx.HTTPError as e:
+            logger.warning(f"[CONFIG] HttpConfigProvider poll failed: {e}")
+            return False
+        if response.status_code == 304:
+            return False
+        if hashlib.sha256(response.content).hexdigest() == self._hash:
+            return False  # server không hỗ trợ ETag nhưng nội dung không đổi
+        self._pending = (response.content, response.headers.get("Content-Type", ""))
+        return True
+
+    def reload(self) -> dict:
+        if self._pending is None:
+            response = self._fetch()
+            if response.status_code == 304:
+                return self.config
+            self._pending = (response.content, response.headers.get("Content-Type", ""))
+
+        content, content_type = self._pending
+        self._pending = None
+        self.config = self._parse(content, content_type)
+        self._hash = hashlib.sha256(content).hexdigest()
+        logger.info(f"[CONFIG] HttpConfigProvider loaded {self.url}")
+        return self.config
+
+    def content_hash(self) -> str:
+        return self._hash
+
+    def load(self) -> dict:
+        return self.config
@@ -1,22 +1,50 @@
+import hashlib
+import os
 from functools import lru_cache
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import BaseSettings, Field
 from typing import Optional
-from config.models import ObserverConfig, DataSourceConfig, MessageQueueConfig
-from config.config_provider_factory import load_raw_config
+from config.models import ObserverConfig, DataSourceConfig, MessageQueueConfig, DispatchConfig
+from config.config_provider_factory import load_raw_config, current_provider
+from config.snapshot_cache import load_snapshot, store_snapshot
 
 class AppSettings(BaseSettings):
     """Lớp chính cho toàn bộ app settings (typed-safe)."""
 
+    environment: str = "dev"  # provider điền từ APP_ENV
+    debug: bool = False
     observer: ObserverConfig = Field(default_factory=ObserverConfig)
     data_source: DataSourceConfig = Field(default_factory=DataSourceConfig)
     message_queue: MessageQueueConfig = Field(default_factory=MessageQueueConfig)
+    dispatch: DispatchConfig = Field(default_factory=DispatchConfig)
 
     @classmethod
     def load(cls) -> "AppSettings":
-        """Tạo AppSettings từ raw config provider."""
+        """
+        Tạo AppSettings từ raw config provider.
+        Nội dung config không đổi so với lần chạy trước -> dùng snapshot đã validate trên đĩa.
+        """
         raw = load_raw_config()
-        return cls(**raw)
+        cache_key = cls._snapshot_key(current_provider().content_hash())
+        snapshot = load_snapshot(cache_key)
+        if isinstance(snapshot, cls):
+            return snapshot
+        settings = cls(**raw)
+        store_snapshot(cache_key, settings)
+        return settings
+
+    @classmethod
+    def _snapshot_key(cls, content_hash: str) -> str:
+        """Nội dung config + biến môi trường ghi đè field của AppSettings (env được ưu tiên hơn raw config)."""
+        if not content_hash:
+            return ""
+        prefix = (cls.__config__.env_prefix or "").lower()
+        names = [prefix + name.lower() for name in cls.__fields__]
+        env = sorted(
+            (key.lower(), value)
+            for key, value in os.environ.items()
+            if any(key.lower() == name or key.lower().startswith(name + "_") for name in names)
+        )
+        return hashlib.sha256(repr((content_hash, env)).encode()).hexdigest()
 
 @lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
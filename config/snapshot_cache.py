@@ -0,0 +1,81 @@
+import hashlib
+import logging
+import os
+import pickle
+import stat
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Thư mục cache snapshot AppSettings đã validate; mặc định tắt, bật bằng CONFIG_CACHE_DIR=<đường dẫn tuyệt đối>.
+# Snapshot là pickle (load = chạy code) -> chỉ đọc khi thư mục và file thuộc user hiện tại và
+# không ai khác ghi được; đường dẫn tương đối (phụ thuộc CWD) bị từ chối.
+CACHE_DIR = os.getenv("CONFIG_CACHE_DIR", "")
+if CACHE_DIR and not os.path.isabs(CACHE_DIR):
+    logger.warning(f"[CONFIG] CONFIG_CACHE_DIR must be an absolute path, settings snapshot disabled: {CACHE_DIR}")
+    CACHE_DIR = ""
+_MODELS_DIR = Path(__file__).parent / "models"
+
+
+def _schema_version() -> str:
+    """Đổi khi code model đổi (mtime/size các file models) -> snapshot cũ tự hết hiệu lực."""
+    parts = [Path(__file__).with_name("settings.py")] + sorted(_MODELS_DIR.glob("*.py"))
+    stamp = "|".join(f"{p.name}:{p.stat().st_mtime_ns}:{p.stat().st_size}" for p in parts)
+    return hashlib.sha256(stamp.encode()).hexdigest()[:16]
+
+
+def _trusted(path: Path) -> bool:
+    """Không phải symlink, thuộc user hiện tại, group/other không ghi được."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    if stat.S_ISLNK(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        logger.warning(f"[CONFIG] Ignoring settings snapshot at untrusted path {path}")
+        return False
+    return True
+
+
+def snapshot_path(cache_key: str) -> Optional[Path]:
+    if not CACHE_DIR or not cache_key:
+        return None
+    return Path(CACHE_DIR) / f"settings-{_schema_version()}-{cache_key[:32]}.pkl"
+
+
+def load_snapshot(cache_key: str) -> Optional[Any]:
+    """Trả về AppSettings đã validate từ lần chạy trước (cùng nội dung config + env), nếu có."""
+    path = snapshot_path(cache_key)
+    if path is None or not path.exists():
+        return None
+    if not (_trusted(path.parent) and _trusted(path)):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"[CONFIG] Ignoring unreadable settings snapshot {path}: {e}")
+        return None
+
+
+def store_snapshot(cache_key: str, settings: Any):
+    """Ghi snapshot (atomic rename, quyền 0600); lỗi ghi cache không ảnh hưởng việc load config."""
+    path = snapshot_path(cache_key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _trusted(path.parent):
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(settings, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        # Chỉ giữ snapshot mới nhất
+        for old in path.parent.glob("settings-*.pkl"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"[CONFIG] Failed to write settings snapshot: {e}")
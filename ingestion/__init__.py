@@ -0,0 +1,9 @@
+from ingestion.checkpoint import SourceCheckpoint
+from ingestion.ingestion_engine import IngestionEngine
+from ingestion.source_poller import SourcePoller
+
+__all__ = [
+    "IngestionEngine",
+    "SourceCheckpoint",
+    "SourcePoller",
+]
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from requester_client.utils.json_helper import compile_path
+
+logger = logging.getLogger(__name__)
+
+
+class SourceCheckpoint:
+    """
+    Watermark của một source cho poll tăng dần (config dạng dict của IncrementalConfig).
+    Mỗi lần poll: params() gắn `since_param`, observe() từng item sau khi xử lý,
+    commit() tiến watermark và ghi file (tmp + fsync + rename, bền qua crash):
+    - poll dở (stop / trang lỗi): giữ nguyên watermark, item cũ hơn có thể chưa được fetch
+    - có item lỗi sau khi retry: chỉ tiến tới item lỗi sớm nhất -> poll sau lấy lại nó
+    - item lỗi không có watermark: giữ nguyên watermark
+    """
+
+    def __init__(self, name: str, config: dict):
+        self.since_param = config["since_param"]
+        self._watermark = compile_path(config["watermark_path"])
+        state_dir = config.get("state_dir") or "./ingest_state"
+        self.path = os.path.join(state_dir, f"{name}.json")
+        self.value = self._load()
+        self._reset()
+
+    def params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.value is None:
+            return dict(params)
+        return {**params, self.since_param: self.value}
+
+    def observe(self, item: Any, ok: bool):
+        value = self._watermark.get(item) if isinstance(item, dict) else None
+        if value is None:
+            self._unknown_failed |= not ok
+        elif ok:
+            if self._max is None or value > self._max:
+                self._max = value
+        elif self._min_failed is None or value < self._min_failed:
+            self._min_failed = value
+
+    def commit(self, complete: bool) -> bool:
+        """Kết thúc một lần poll; trả về True nếu watermark được tiến."""
+        try:
+            if not complete or self._unknown_failed:
+                return False
+            value = self._min_failed if self._min_failed is not None else self._max
+            if value is None or (self.value is not None and value <= self.value):
+                return False
+            self._save(value)
+            self.value = value
+            return True
+        finally:
+            self._reset()
+
+    # -------------------------------
+    # Internal
+    # -------------------------------
+    def _reset(self):
+        self._max = None
+        self._min_failed = None
+        self._unknown_failed = False
+
+    def _load(self) -> Optional[Any]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("watermark")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"[Ingestion] Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def _save(self, value: Any):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"watermark": value}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
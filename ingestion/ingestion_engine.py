@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from config.config_diff import to_plain
+from ingestion.source_poller import Handler, SourcePoller
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionEngine:
+    """
+    Chạy song song một SourcePoller cho mỗi data source HTTP đang bật trong DataSourceConfig
+    (tên source = key trong config, cũng là source để ObserverManager định tuyến target).
+    Source type "db" / "s3" chưa được hỗ trợ -> bỏ qua kèm warning.
+    """
+
+    def __init__(self, sources: Dict[str, dict], handler: Handler):
+        self.pollers: List[SourcePoller] = []
+        for name, cfg in sources.items():
+            if not cfg.get("enabled", True):
+                continue
+            if cfg.get("type") != "http":
+                logger.warning(f"[Ingestion] Source '{name}' has unsupported type '{cfg.get('type')}', skipping")
+                continue
+            if not cfg.get("endpoints"):
+                logger.warning(f"[Ingestion] Source '{name}' has no endpoints, skipping")
+                continue
+            self.pollers.append(SourcePoller(name, cfg, handler))
+
+    @classmethod
+    def from_config(cls, data_source_cfg: Any, handler: Handler) -> "IngestionEngine":
+        return cls(to_plain(data_source_cfg) or {}, handler)
+
+    async def run(self):
+        if not self.pollers:
+            return
+        logger.info(f"[Ingestion] Polling {len(self.pollers)} source(s): {', '.join(p.name for p in self.pollers)}")
+        await asyncio.gather(*(poller.run() for poller in self.pollers))
+
+    async def stop(self):
+        """Ngừng fetch trang mới; run() kết thúc sau khi các item đã fetch được xử lý."""
+        for poller in self.pollers:
+            await poller.stop()
+
+    async def aclose(self):
+        await asyncio.gather(*(poller.aclose() for poller in self.pollers), return_exceptions=True)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List
+
+from config.models import RetryConfig
+from ingestion.checkpoint import SourceCheckpoint
+from requester_client.auth.auth_factory import build_auth_strategy
+from requester_client.dynamic_http_client import DynamicHttpClient
+from requester_client.resilience import RetryBudget
+from telemetry.instruments import INGEST_BUFFERED, INGEST_ITEMS, INGEST_POLL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Any], Awaitable[Any]]
+
+_DONE = object()  # sentinel kết thúc worker (item JSON null vẫn là item hợp lệ)
+
+
+class SourcePoller:
+    """
+    Poll một data source HTTP theo lịch (config dạng dict của DataSourceItem):
+    - mỗi lần poll duyệt mọi endpoint bằng paginate_from_config, từng trang được
+      đẩy vào buffer giới hạn `buffer_size` item; buffer đầy -> dừng fetch trang kế tiếp
+    - `concurrency` worker lấy item từ buffer gọi handler(source, item)
+      (ObserverManager.handle_message); handler trả về False hoặc raise -> gọi lại tối đa
+      `item_retries` lần (backoff `item_retry_backoff` nhân đôi), vẫn lỗi -> tính là lỗi
+    - `incremental`: chỉ lấy item mới hơn watermark đã lưu (SourceCheckpoint); item còn lỗi
+      giữ watermark lại để poll sau lấy lại. Không có incremental thì mỗi lần poll duyệt lại
+      toàn bộ, item lỗi cũng được lấy lại ở lần poll sau
+    - stop(): ngừng fetch trang mới, xử lý hết item đã fetch rồi kết thúc
+    """
+
+    def __init__(self, name: str, config: dict, handler: Handler):
+        self.name = name
+        self.handler = handler
+        self.pagination = config.get("pagination")
+        self.params = config.get("params") or {}
+        endpoints = config.get("endpoints") or ""
+        self.endpoints: List[str] = [endpoints] if isinstance(endpoints, str) else list(endpoints)
+        self.interval = float(config.get("interval", 60.0))
+        self.concurrency = max(1, int(config.get("concurrency") or 1))
+        self.buffer_size = max(1, int(config.get("buffer_size") or 1))
+        self.item_retries = max(0, int(config.get("item_retries", 2)))
+        self.item_retry_backoff = float(config.get("item_retry_backoff", 0.5))
+        incremental = config.get("incremental")
+        self.checkpoint = SourceCheckpoint(name, incremental) if incremental else None
+
+        retry = RetryConfig(**(config.get("retry") or {}))
+        self.client = DynamicHttpClient(
+            base_url=str(config.get("base_url") or ""),
+            headers=config.get("headers") or {},
+            auth_strategy=build_auth_strategy(config.get("auth") or None),
+            retry_count=retry.max_attempts,
+            retry_backoff_factor=retry.backoff_factor,
+            status_forcelist=retry.status_forcelist,
+            max_backoff=retry.max_backoff,
+            retry_budget=RetryBudget(ratio=retry.budget_ratio, min_per_sec=retry.budget_min_per_sec),
+            connection=config.get("connection") or None,
+            circuit_breaker=config.get("circuit_breaker") or None,
+        )
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        """Poll tới khi stop() (interval <= 0: poll một lần)."""
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.warning("[Ingestion][%s] Poll failed: %s", self.name, e)
+            INGEST_POLL_SECONDS.labels(self.name).observe(time.monotonic() - started)
+            if self.interval <= 0:
+                return
+            # Lịch tính từ lúc bắt đầu poll; poll lâu hơn interval -> poll lại ngay
+            delay = self.interval - (time.monotonic() - started)
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def stop(self):
+        self._stopping.set()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def poll_once(self) -> int:
+        """Một lần poll mọi endpoint; trả về số item đã fetch."""
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        workers = [asyncio.create_task(self._worker(buffer)) for _ in range(self.concurrency)]
+        failed_requests = self.client.failed_requests
+        produced = 0
+        complete = False
+        try:
+            for endpoint in self.endpoints:
+                produced += await self._produce(endpoint, buffer)
+                if self._stopping.is_set():
+                    break
+            else:
+                # Pagination dừng im lặng ở trang lỗi -> chỉ coi là trọn vẹn nếu không request nào lỗi
+                complete = self.client.failed_requests == failed_requests
+        finally:
+            for _ in workers:
+                await buffer.put(_DONE)
+            results = await asyncio.gather(*workers, return_exceptions=True)
+            failed = sum(r for r in results if isinstance(r, int))
+            if self.checkpoint is not None and self.checkpoint.commit(complete):
+                logger.debug("[Ingestion][%s] Watermark advanced to %s", self.name, self.checkpoint.value)
+        if failed:
+            logger.warning("[Ingestion][%s] %d item(s) failed after retries", self.name, failed)
+        logger.debug("[Ingestion][%s] Polled %d item(s)", self.name, produced)
+        return produced
+
+    async def _produce(self, endpoint: str, buffer: asyncio.Queue) -> int:
+        produced = 0
+        buffered = INGEST_BUFFERED.labels(self.name)
+        # paginate_* có thể sửa params -> mỗi lần poll dùng bản sao
+        params = self.checkpoint.params(self.params) if self.checkpoint else dict(self.params)
+        pages = self.client.paginate_from_config(endpoint, self.pagination, params=params)
+        try:
+            async for items in pages:
+                for item in items:
+                    await buffer.put(item)  # buffer đầy -> chờ worker, pagination tạm dừng
+                    buffered.inc()
+                produced += len(items)
+                if self._stopping.is_set():
+                    break
+        finally:
+            await pages.aclose()
+        return produced
+
+    async def _worker(self, buffer: asyncio.Queue) -> int:
+        """Xử lý item tới khi gặp _DONE; trả về số item vẫn lỗi sau khi retry."""
+        buffered = INGEST_BUFFERED.labels(self.name)
+        failed = 0
+        while True:
+            item = await buffer.get()
+            if item is _DONE:
+                return failed
+            buffered.dec()
+            ok = await self._handle(item)
+            if self.checkpoint is not None:
+                self.checkpoint.observe(item, ok)
+            failed += not ok
+            INGEST_ITEMS.labels(self.name, "ok" if ok else "failed").inc()
+
+    async def _handle(self, item: Any) -> bool:
+        for attempt in range(self.item_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.item_retry_backoff * 2 ** (attempt - 1))
+            try:
+                if await self.handler(self.name, item) is not False:
+                    return True
+            except Exception as e:
+                logger.warning("[Ingestion][%s] Handler failed (attempt %d): %s", self.name, attempt + 1, e)
+        return False
@@ -1,35 +1,80 @@
 import asyncio
+import os
 import signal
 import sys
 import logging
 
+from telemetry import MetricsServer, configure_tracing, setup_logging, shutdown_logging
+from runtime import Supervisor, run_event_loop, worker_id
 from config.settings import settings
+from config.config_watcher import ConfigWatcher
 from observer.observer_manager import ObserverManager
-from queue.message_queue import MockMessageQueue  # hoặc real MQ consumer
+from message_queue.consumer_factory import create_consumer
+from message_queue.consumer_runner import ConsumerRunner
+from ingestion import IngestionEngine
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-)
+# Log đi qua queue + thread riêng, không block event loop
+setup_logging()
 
 logger = logging.getLogger("main")
 
 
-async def message_consumer_loop():
+async def message_consumer_loop(stop_event: asyncio.Event):
     """
     Vòng lặp chính nhận message từ queue và xử lý qua observer manager.
+    Message được xử lý song song bởi các worker của ConsumerRunner; dispatcher
+    của ObserverManager giới hạn in-flight nên worker tự block khi quá tải.
     """
     observer_mgr = ObserverManager()
-    queue = MockMessageQueue()
+    mq_cfg = settings.message_queue
+    runner = ConsumerRunner(
+        create_consumer(mq_cfg),
+        observer_mgr.handle_message,
+        workers=mq_cfg.consumer_workers,
+    )
+
+    # Data source HTTP được poll định kỳ, item đi thẳng vào observer;
+    # chế độ nhiều worker chỉ worker 0 poll để không lấy trùng dữ liệu
+    ingestion = None
+    if not worker_id():
+        ingestion = IngestionEngine.from_config(settings.data_source, observer_mgr.handle_message)
+
+    # Hot-reload: CONFIG_RELOAD_INTERVAL (giây) > 0 thì poll config và chỉ dựng lại target đổi
+    watcher = None
+    reload_interval = float(os.getenv("CONFIG_RELOAD_INTERVAL", "0"))
+    if reload_interval > 0:
+        watcher = ConfigWatcher(settings, interval=reload_interval)
+        watcher.subscribe(lambda old, new: _on_config_change(observer_mgr, old, new))
+        watcher.start()
 
     logger.info("[Main] Starting message consumption loop...")
+    run_task = asyncio.create_task(runner.run())
+    ingest_task = asyncio.create_task(ingestion.run()) if ingestion else None
+    stop_task = asyncio.create_task(stop_event.wait())
 
-    async for message in queue.consume():
-        source = message.get("source")
-        data = message.get("data")
-        logger.info(f"[Main] Received message from source: {source}")
-        await observer_mgr.handle_message(source, data)
+    try:
+        await asyncio.wait({run_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Ngừng nhận message mới, xử lý hết message đã nhận rồi flush ack
+        stop_task.cancel()
+        if watcher:
+            await watcher.stop()
+        await runner.stop()
+        await run_task
+        if ingestion:
+            await ingestion.stop()
+            await asyncio.gather(ingest_task, return_exceptions=True)
+            await ingestion.aclose()
+        await observer_mgr.close()
+
+
+async def _on_config_change(observer_mgr: ObserverManager, old, new):
+    """Observer config được áp dụng nóng; các phần config khác cần restart."""
+    await observer_mgr.apply_config(new.observer)
+    for section in ("data_source", "message_queue", "dispatch"):
+        if getattr(old, section) != getattr(new, section):
+            logger.warning(f"[Main] '{section}' config changed, restart required to apply it")
 
 
 async def main():
@@ -37,33 +82,54 @@ async def main():
     Entry point: khởi tạo app, handle signal, run consumer.
     """
     logger.info(f"[Startup] Environment: {settings.environment.upper()} | Debug: {settings.debug}")
+    configure_tracing()
+
+    # METRICS_PORT > 0 thì mở endpoint Prometheus (mặc định chỉ nghe localhost);
+    # chế độ nhiều worker: worker i nghe METRICS_PORT + i
+    metrics_server = None
+    metrics_port = int(os.getenv("METRICS_PORT", "0"))
+    if metrics_port > 0:
+        metrics_server = MetricsServer(os.getenv("METRICS_HOST", "127.0.0.1"), metrics_port + (worker_id() or 0))
+        await metrics_server.start()
 
     stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
 
-    def _signal_handler(sig, frame):
+    def _signal_handler(sig: signal.Signals):
         logger.warning(f"[Main] Received signal {sig.name}, shutting down...")
         stop_event.set()
 
     # Đăng ký graceful shutdown
-    signal.signal(signal.SIGINT, _signal_handler)
-    signal.signal(signal.SIGTERM, _signal_handler)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, _signal_handler, sig)
 
-    # Chạy consumer loop song song với wait stop_event
-    task = asyncio.create_task(message_consumer_loop())
-
-    await stop_event.wait()
-    task.cancel()
     try:
-        await task
-    except asyncio.CancelledError:
-        logger.info("[Main] Message loop stopped gracefully.")
+        await message_consumer_loop(stop_event)
+    finally:
+        if metrics_server:
+            await metrics_server.stop()
+    logger.info("[Main] Message loop stopped gracefully.")
 
     logger.info("[Main] Application exited cleanly.")
 
 
+def run():
+    """
+    WORKERS > 1: supervisor fork N worker, mỗi worker chạy consumer + ObserverManager riêng
+    (competing consumers trên cùng queue / consumer group). UVLOOP=1 để dùng uvloop.
+    """
+    workers = int(os.getenv("WORKERS", "1"))
+    if workers > 1:
+        shutdown_timeout = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "30"))
+        return Supervisor(workers, lambda: run_event_loop(main), shutdown_timeout=shutdown_timeout).run()
+    run_event_loop(main)
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        sys.exit(run())
     except KeyboardInterrupt:
         logger.warning("[Main] Interrupted by user.")
         sys.exit(0)
+    finally:
+        shutdown_logging()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Lane:
+    __slots__ = ("outstanding", "settled", "ready", "committed", "uncommitted")
+
+    def __init__(self):
+        self.outstanding: deque[int] = deque()  # seq đã nhận, theo thứ tự tăng dần
+        self.settled: Dict[int, bool] = {}      # seq đã xử lý xong -> có cần ack hay không
+        self.ready = -1                          # seq lớn nhất có thể commit
+        self.committed = -1
+        self.uncommitted = 0
+
+
+class AckBatcher:
+    """
+    Gom ack/commit theo lô cho mỗi "lane" (channel RabbitMQ, partition Kafka...):
+    - Message xử lý song song nên hoàn tất không theo thứ tự; ack multiple / commit offset
+      bao phủ mọi message phía trước nên chỉ commit tới prefix liên tục đã xong.
+    - Flush khi đủ `batch_size` message hoặc sau mỗi `interval_ms`.
+    """
+
+    def __init__(
+        self,
+        commit_fn: Callable[[Hashable, int], Awaitable[None]],
+        batch_size: int = 50,
+        interval_ms: float = 200,
+    ):
+        self.commit_fn = commit_fn
+        self.batch_size = max(1, batch_size)
+        self.interval = interval_ms / 1000
+
+        self._lanes: Dict[Hashable, _Lane] = {}
+        self._flush_lock = asyncio.Lock()
+        self._ticker: asyncio.Task | None = None
+
+    def start(self):
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._tick())
+
+    def track(self, lane: Hashable, seq: int):
+        """Đăng ký message vừa nhận (gọi theo đúng thứ tự nhận)."""
+        state = self._lanes.get(lane)
+        if state is None:
+            state = self._lanes[lane] = _Lane()
+        state.outstanding.append(seq)
+
+    async def done(self, lane: Hashable, seq: int, ack: bool = True):
+        """Đánh dấu message đã xử lý xong; ack=False nếu đã được nack riêng."""
+        state = self._lanes[lane]
+        state.settled[seq] = ack
+
+        while state.outstanding and state.outstanding[0] in state.settled:
+            head = state.outstanding.popleft()
+            # ack multiple không được trỏ vào tag đã nack -> chỉ tiến tới tag được ack
+            if state.settled.pop(head):
+                state.ready = head
+                state.uncommitted += 1
+
+        if state.uncommitted >= self.batch_size:
+            await self.flush()
+
+    def reset(self, lane: Hashable):
+        """Bỏ toàn bộ trạng thái của lane (vd: channel reconnect, partition bị revoke)."""
+        self._lanes.pop(lane, None)
+
+    async def flush(self):
+        async with self._flush_lock:
+            for lane, state in list(self._lanes.items()):
+                if state.ready > state.committed:
+                    upto = state.ready
+                    await self.commit_fn(lane, upto)
+                    state.committed = upto
+                    state.uncommitted = 0
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        await self.flush()
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("[AckBatcher] Periodic flush failed: %s", e)
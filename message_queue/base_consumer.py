@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Hashable, Optional
+from requester_client.utils import codec as json_codec
+
+
+class Delivery(ABC):
+    """Một message nhận từ queue; phải ack() khi xử lý xong hoặc nack() khi lỗi."""
+
+    body: bytes
+    # Message cùng partition_key được xử lý tuần tự (None = không yêu cầu thứ tự)
+    partition_key: Optional[Hashable] = None
+
+    @property
+    def stale(self) -> bool:
+        """True nếu delivery không còn hiệu lực (vd: partition đã bị seek lại)."""
+        return False
+
+    def decode(self) -> Any:
+        return json_codec.loads(self.body)
+
+    @abstractmethod
+    async def ack(self):
+        pass
+
+    @abstractmethod
+    async def nack(self, requeue: bool = True):
+        pass
+
+
+class BaseConsumer(ABC):
+    """Base interface cho message queue consumer."""
+
+    @abstractmethod
+    async def start(self):
+        """Kết nối, khai báo queue, áp dụng prefetch."""
+
+    @abstractmethod
+    def deliveries(self) -> AsyncIterator[Delivery]:
+        """Async iterator các delivery; kết thúc sau khi stop() được gọi."""
+
+    @abstractmethod
+    async def stop(self):
+        """Ngừng nhận message mới (message đã nhận vẫn được ack/nack bình thường)."""
+
+    @abstractmethod
+    async def close(self):
+        """Flush ack còn lại và đóng kết nối."""
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from abc import abstractmethod
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Hashable, List, Optional, Tuple
+
+from message_queue.ack_batcher import AckBatcher
+from message_queue.base_consumer import BaseConsumer, Delivery
+
+logger = logging.getLogger(__name__)
+
+
+# (partition, offset, key, value)
+KafkaRecord = Tuple[Hashable, int, Optional[bytes], bytes]
+
+
+class KafkaDelivery(Delivery):
+    def __init__(self, consumer: "BaseKafkaConsumer", partition: Hashable, offset: int, key, value: bytes, generation: int):
+        self.consumer = consumer
+        self.partition_key = partition
+        self.offset = offset
+        self.key = key
+        self.body = value
+        self.generation = generation
+
+    @property
+    def stale(self) -> bool:
+        """Partition đã bị seek lại sau message này -> bỏ qua, sẽ được fetch lại."""
+        return self.consumer._generations[self.partition_key] != self.generation
+
+    async def ack(self):
+        if not self.stale:
+            await self.consumer._settle(self)
+            await self.consumer._acks.done(self.partition_key, self.offset)
+
+    async def nack(self, requeue: bool = True):
+        if self.stale:
+            return
+        if requeue:
+            await self.consumer._rewind(self)
+        else:
+            # Không requeue -> bỏ qua message, offset vẫn được commit
+            await self.ack()
+
+
+class BaseKafkaConsumer(BaseConsumer):
+    """
+    Logic consumer Kafka dùng chung cho aiokafka và fake broker:
+    - partition_key = partition -> ConsumerRunner xử lý song song giữa các partition,
+      tuần tự trong một partition.
+    - offset chỉ được commit (theo lô, qua AckBatcher) khi mọi message phía trước đã xong.
+    - nack: seek partition về offset lỗi, tạm dừng partition `redelivery_delay` giây;
+      các message phía sau đã fetch của partition đó trở thành stale.
+    """
+
+    def __init__(
+        self,
+        prefetch_count: int = 100,
+        commit_batch_size: int = 50,
+        commit_interval_ms: float = 200,
+        redelivery_delay: float = 1.0,
+    ):
+        self.prefetch_count = prefetch_count
+        self.redelivery_delay = redelivery_delay
+
+        self._acks = AckBatcher(self._commit, batch_size=commit_batch_size, interval_ms=commit_interval_ms)
+        self._generations: Dict[Hashable, int] = defaultdict(int)
+        self._inflight: Dict[Hashable, int] = defaultdict(int)
+        self._prefetch: asyncio.Semaphore | None = None
+        self._held = 0  # số slot prefetch đang giữ (message đã yield, chưa settle)
+        self._stop_event = asyncio.Event()
+
+    # -------------------------------
+    # Backend operations
+    # -------------------------------
+    @abstractmethod
+    async def _connect(self):
+        pass
+
+    @abstractmethod
+    async def _fetch(self, max_records: int) -> List[KafkaRecord]:
+        """Fetch tối đa max_records record (có thể rỗng sau timeout ngắn)."""
+
+    @abstractmethod
+    async def _commit_offset(self, partition: Hashable, offset: int):
+        """Commit offset kế tiếp cần đọc của partition."""
+
+    @abstractmethod
+    def _seek(self, partition: Hashable, offset: int):
+        pass
+
+    @abstractmethod
+    def _pause(self, partition: Hashable):
+        pass
+
+    @abstractmethod
+    def _resume(self, partition: Hashable):
+        pass
+
+    @abstractmethod
+    async def _disconnect(self):
+        pass
+
+    # -------------------------------
+    # BaseConsumer
+    # -------------------------------
+    async def start(self):
+        self._prefetch = asyncio.Semaphore(self.prefetch_count)
+        await self._connect()
+        self._acks.start()
+
+    async def deliveries(self) -> AsyncIterator[Delivery]:
+        while not self._stop_event.is_set():
+            # Chỉ fetch khi còn slot prefetch (giới hạn message chưa commit)
+            await self._prefetch.acquire()
+            self._prefetch.release()
+
+            records = await self._fetch(max(1, self.prefetch_count - self._held))
+            # Generation tại thời điểm fetch: record fetch trước một lần seek thì bỏ
+            generations = {r[0]: self._generations[r[0]] for r in records}
+            for partition, offset, key, value in records:
+                await self._prefetch.acquire()
+                if self._generations[partition] != generations[partition]:
+                    self._prefetch.release()
+                    continue
+                self._held += 1
+                self._inflight[partition] += 1
+                self._acks.track(partition, offset)
+                yield KafkaDelivery(self, partition, offset, key, value, generations[partition])
+
+    async def stop(self):
+        self._stop_event.set()
+
+    async def close(self):
+        await self._acks.close()
+        await self._disconnect()
+
+    # -------------------------------
+    # Internal
+    # -------------------------------
+    async def _commit(self, partition: Hashable, offset: int):
+        await self._commit_offset(partition, offset + 1)
+
+    async def _settle(self, delivery: KafkaDelivery):
+        self._inflight[delivery.partition_key] -= 1
+        self._release(1)
+
+    def _release(self, slots: int):
+        self._held -= slots
+        for _ in range(slots):
+            self._prefetch.release()
+
+    async def _rewind(self, delivery: KafkaDelivery):
+        """Seek về offset lỗi; mọi message đã fetch sau nó của partition bị bỏ."""
+        partition = delivery.partition_key
+        logger.warning("[KafkaConsumer] Redelivering %s from offset %d", partition, delivery.offset)
+
+        await self._acks.flush()
+        self._acks.reset(partition)
+        self._generations[partition] += 1
+        self._release(self._inflight.pop(partition, 0))
+
+        self._seek(partition, delivery.offset)
+        self._pause(partition)
+        asyncio.get_running_loop().call_later(self.redelivery_delay, self._resume, partition)
+
+    async def _revoke(self, partitions):
+        """Gọi khi rebalance thu hồi partition: commit phần đã xong rồi bỏ trạng thái."""
+        await self._acks.flush()
+        for partition in partitions:
+            self._acks.reset(partition)
+            self._generations[partition] += 1
+            self._release(self._inflight.pop(partition, 0))
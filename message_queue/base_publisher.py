@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class OutgoingMessage:
+    routing_key: str
+    body: bytes
+    headers: Optional[Dict[str, str]] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+
+class BasePublisher(ABC):
+    """
+    Publisher bất đồng bộ có batching publisher confirms:
+    - publish() đưa message vào hàng đợi nội bộ và chờ broker confirm.
+    - `workers` worker (mỗi worker ~ một channel) gom tối đa `confirm_batch_size`
+      message, publish liên tiếp rồi chờ confirm cho cả batch một lần.
+    """
+
+    def __init__(self, confirm_batch_size: int = 100, confirm_linger_ms: float = 5, workers: int = 1):
+        self.confirm_batch_size = max(1, confirm_batch_size)
+        self.confirm_linger = confirm_linger_ms / 1000
+        self.workers = max(1, workers)
+
+        self._pending: asyncio.Queue[OutgoingMessage] | None = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._closed = False
+
+    # -------------------------------
+    # Abstract
+    # -------------------------------
+    @abstractmethod
+    async def _connect(self):
+        """Mở kết nối / khai báo exchange."""
+
+    @abstractmethod
+    async def _publish_batch(self, batch: List[OutgoingMessage]) -> Optional[List[Optional[Exception]]]:
+        """
+        Publish cả batch và chờ confirm.
+        Raise nếu cả batch lỗi, hoặc trả về list lỗi theo từng message (None = OK).
+        """
+
+    @abstractmethod
+    async def _disconnect(self):
+        """Đóng kết nối."""
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    async def start(self):
+        async with self._start_lock:
+            if self._started:
+                return
+            await self._connect()
+            self._pending = asyncio.Queue()
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._started = True
+
+    async def publish(self, routing_key: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        """Publish một message, trả về khi broker đã confirm."""
+        if self._closed:
+            raise RuntimeError(f"{self.__class__.__name__} is closed")
+        if not self._started:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait(OutgoingMessage(routing_key, body, headers, future))
+        await future
+
+    async def close(self):
+        """Ngừng nhận message mới, chờ các message đang chờ confirm rồi đóng kết nối."""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._started:
+            return
+
+        await self._pending.join()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        await self._disconnect()
+
+    # -------------------------------
+    # Internal
+    # -------------------------------
+    async def _collect_batch(self) -> List[OutgoingMessage]:
+        """Lấy message đầu tiên rồi gom thêm trong cửa sổ linger."""
+        batch = [await self._pending.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.confirm_linger
+
+        while len(batch) < self.confirm_batch_size:
+            if not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._collect_batch()
+            try:
+                errors = await self._publish_batch(batch) or [None] * len(batch)
+            except Exception as e:
+                logger.warning("[Publisher] Batch of %d not confirmed: %s", len(batch), e)
+                errors = [e] * len(batch)
+
+            try:
+                for msg, error in zip(batch, errors):
+                    if msg.future.done():
+                        continue
+                    if error is not None:
+                        msg.future.set_exception(error)
+                    else:
+                        msg.future.set_result(None)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
@@ -0,0 +1,29 @@
+from config.models.message_queue import MessageQueueConfig
+from message_queue.base_consumer import BaseConsumer
+from message_queue.in_memory_broker import InMemoryBroker, InMemoryConsumer
+from message_queue.rabbitmq_consumer import RabbitMQConsumer
+from message_queue.kafka_consumer import KafkaConsumer
+
+# Broker dùng chung trong process cho type "memory" (chạy local / test)
+default_broker = InMemoryBroker()
+
+
+def create_consumer(config: MessageQueueConfig) -> BaseConsumer:
+    """Tạo consumer phù hợp theo MessageQueueConfig.type."""
+    mq_type = config.type.lower()
+    if mq_type == "rabbitmq":
+        return RabbitMQConsumer(config)
+    elif mq_type == "kafka":
+        return KafkaConsumer(config)
+    elif mq_type == "memory":
+        default_broker.declare_exchange(config.exchange, config.exchange_type)
+        default_broker.bind(config.queue, config.exchange, config.routing_key or config.queue)
+        return InMemoryConsumer(
+            default_broker,
+            config.queue,
+            prefetch_count=config.prefetch_count,
+            ack_batch_size=config.ack_batch_size,
+            ack_interval_ms=config.ack_interval_ms,
+        )
+    else:
+        raise ValueError(f"Unsupported message queue type: {mq_type}")
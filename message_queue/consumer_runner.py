@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List
+
+from message_queue.base_consumer import BaseConsumer, Delivery
+from requester_client.utils import codec as json_codec
+from telemetry.instruments import QUEUE_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class ConsumerRunner:
+    """
+    Chạy `workers` worker xử lý song song các delivery của một consumer.
+    - handler(source, data) trả về False hoặc raise -> nack(requeue) để redeliver,
+      ngược lại ack (ack được gom theo lô bởi consumer).
+    - Delivery có partition_key luôn vào cùng một worker -> giữ thứ tự theo partition.
+    - stop(): ngừng nhận message mới, xử lý hết message đã nhận, flush ack rồi đóng consumer.
+    """
+
+    def __init__(
+        self,
+        consumer: BaseConsumer,
+        handler: Callable[[str, Any], Awaitable[Any]],
+        workers: int = 10,
+    ):
+        self.consumer = consumer
+        self.handler = handler
+        self.workers = max(1, workers)
+        self._queues: List[asyncio.Queue] = []
+
+    async def run(self):
+        await self.consumer.start()
+        self._queues = [asyncio.Queue() for _ in range(self.workers)]
+        worker_tasks = [asyncio.create_task(self._worker(q)) for q in self._queues]
+
+        try:
+            async for delivery in self.consumer.deliveries():
+                self._route(delivery).put_nowait((time.monotonic(), delivery))
+        finally:
+            for q in self._queues:
+                q.put_nowait(None)
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+            await self.consumer.close()
+            logger.info("[ConsumerRunner] Drained and closed consumer.")
+
+    async def stop(self):
+        await self.consumer.stop()
+
+    def _route(self, delivery: Delivery) -> asyncio.Queue:
+        if delivery.partition_key is not None:
+            return self._queues[hash(delivery.partition_key) % self.workers]
+        return min(self._queues, key=asyncio.Queue.qsize)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            received_at, delivery = item
+            QUEUE_LAG_SECONDS.observe(time.monotonic() - received_at)
+            await self._process(delivery)
+
+    async def _process(self, delivery: Delivery):
+        if delivery.stale:
+            return
+
+        try:
+            message = delivery.decode()
+        except json_codec.DecodeError as e:
+            # Message hỏng sẽ lỗi mãi -> không requeue
+            logger.warning("[ConsumerRunner] Dropping undecodable message: %s", e)
+            await delivery.nack(requeue=False)
+            return
+        if not isinstance(message, dict):
+            # JSON hợp lệ nhưng không phải object ([], "x", null): cũng lỗi mãi -> không requeue
+            logger.warning("[ConsumerRunner] Dropping non-object message of type %s", type(message).__name__)
+            await delivery.nack(requeue=False)
+            return
+
+        try:
+            ok = await self.handler(message.get("source"), message.get("data"))
+        except Exception as e:
+            logger.warning("[ConsumerRunner] Handler failed: %s", e)
+            ok = False
+
+        if ok is False:
+            await delivery.nack(requeue=True)
+        else:
+            await delivery.ack()
@@ -0,0 +1,184 @@
+import asyncio
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Tuple
+
+from message_queue.ack_batcher import AckBatcher
+from message_queue.base_consumer import BaseConsumer, Delivery
+from message_queue.base_publisher import BasePublisher, OutgoingMessage
+
+
+class InMemoryBroker:
+    """
+    Broker giả lập trong process (dùng cho test / benchmark), mô phỏng AMQP tối giản:
+    - exchange "direct" / "fanout" / "topic" (topic chỉ hỗ trợ khớp chính xác và '#')
+    - mỗi queue là một asyncio.Queue
+    - `confirm_latency` mô phỏng round-trip chờ publisher confirm cho mỗi batch
+    """
+
+    def __init__(self, confirm_latency: float = 0.0):
+        self.confirm_latency = confirm_latency
+        self.exchanges: Dict[str, str] = {}
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.bindings: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self.published = 0
+
+    def declare_exchange(self, name: str, exchange_type: str = "direct"):
+        self.exchanges.setdefault(name, exchange_type)
+
+    def declare_queue(self, name: str) -> asyncio.Queue:
+        if name not in self.queues:
+            self.queues[name] = asyncio.Queue()
+        return self.queues[name]
+
+    def bind(self, queue: str, exchange: str, routing_key: str = ""):
+        self.declare_queue(queue)
+        self.bindings[exchange].append((queue, routing_key))
+
+    def _route(self, exchange: str, routing_key: str) -> List[str]:
+        exchange_type = self.exchanges.get(exchange, "direct")
+        matched = []
+        for queue, binding_key in self.bindings.get(exchange, []):
+            if exchange_type == "fanout" or binding_key == routing_key or binding_key == "#":
+                matched.append(queue)
+        return matched
+
+    async def publish_batch(self, exchange: str, batch: List[OutgoingMessage]):
+        """Route cả batch rồi 'confirm' sau một round-trip."""
+        if exchange not in self.exchanges:
+            raise KeyError(f"Exchange '{exchange}' not declared")
+        for msg in batch:
+            for queue in self._route(exchange, msg.routing_key):
+                self.queues[queue].put_nowait((msg.routing_key, msg.body, msg.headers))
+        self.published += len(batch)
+        if self.confirm_latency:
+            await asyncio.sleep(self.confirm_latency)
+
+
+class InMemoryPublisher(BasePublisher):
+    """Publisher dùng InMemoryBroker, cùng pipeline batching confirm như RabbitMQPublisher."""
+
+    def __init__(
+        self,
+        broker: InMemoryBroker,
+        exchange: str,
+        exchange_type: str = "direct",
+        confirm_batch_size: int = 100,
+        confirm_linger_ms: float = 5,
+        workers: int = 1,
+    ):
+        super().__init__(confirm_batch_size, confirm_linger_ms, workers)
+        self.broker = broker
+        self.exchange = exchange
+        self.exchange_type = exchange_type
+
+    async def _connect(self):
+        self.broker.declare_exchange(self.exchange, self.exchange_type)
+
+    async def _publish_batch(self, batch: List[OutgoingMessage]):
+        await self.broker.publish_batch(self.exchange, batch)
+
+    async def _disconnect(self):
+        return None
+
+
+class InMemoryDelivery(Delivery):
+    def __init__(self, consumer: "InMemoryConsumer", tag: int, item: tuple, redelivered: bool):
+        self.consumer = consumer
+        self.tag = tag
+        self.item = item
+        self.body = item[1]
+        self.redelivered = redelivered
+
+    async def ack(self):
+        await self.consumer._acks.done(self.consumer.queue_name, self.tag)
+
+    async def nack(self, requeue: bool = True):
+        await self.consumer._settle_nack(self, requeue)
+
+
+class InMemoryConsumer(BaseConsumer):
+    """
+    Consumer đọc từ InMemoryBroker, mô phỏng hành vi của RabbitMQConsumer:
+    prefetch (số message chưa ack tối đa), ack multiple theo lô, nack requeue.
+    """
+
+    def __init__(
+        self,
+        broker: InMemoryBroker,
+        queue: str,
+        prefetch_count: int = 100,
+        ack_batch_size: int = 50,
+        ack_interval_ms: float = 200,
+    ):
+        self.broker = broker
+        self.queue_name = queue
+        self.prefetch_count = prefetch_count
+
+        self._queue: asyncio.Queue | None = None
+        self._prefetch: asyncio.Semaphore | None = None
+        self._stop_event = asyncio.Event()
+        self._next_tag = 0
+        self._unacked: Dict[int, InMemoryDelivery] = {}
+        self._acks = AckBatcher(self._commit, batch_size=ack_batch_size, interval_ms=ack_interval_ms)
+
+        self.acked = 0
+        self.redelivered = 0
+        self.dead_lettered = 0
+
+    async def start(self):
+        self._queue = self.broker.declare_queue(self.queue_name)
+        self._prefetch = asyncio.Semaphore(self.prefetch_count)
+        self._acks.start()
+
+    async def deliveries(self) -> AsyncIterator[Delivery]:
+        while not self._stop_event.is_set():
+            await self._prefetch.acquire()
+            item = await self._next_item()
+            if item is None:
+                self._prefetch.release()
+                break
+
+            self._next_tag += 1
+            # message được requeue mang thêm cờ redelivered ở cuối tuple
+            delivery = InMemoryDelivery(self, self._next_tag, item[:3], redelivered=len(item) > 3)
+            self._unacked[delivery.tag] = delivery
+            self._acks.track(self.queue_name, delivery.tag)
+            yield delivery
+
+    async def _next_item(self) -> tuple | None:
+        """Lấy message kế tiếp hoặc None nếu stop() được gọi trong lúc chờ."""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+
+        getter = asyncio.ensure_future(self._queue.get())
+        stopper = asyncio.ensure_future(self._stop_event.wait())
+        done, _ = await asyncio.wait({getter, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if getter in done:
+            return getter.result()
+        getter.cancel()
+        return None
+
+    async def stop(self):
+        self._stop_event.set()
+
+    async def close(self):
+        await self._acks.close()
+
+    async def _commit(self, lane, tag: int):
+        for pending in list(self._unacked):
+            if pending > tag:
+                break
+            del self._unacked[pending]
+            self.acked += 1
+            self._prefetch.release()
+
+    async def _settle_nack(self, delivery: InMemoryDelivery, requeue: bool):
+        self._unacked.pop(delivery.tag, None)
+        self._prefetch.release()
+        if requeue:
+            self.redelivered += 1
+            self._queue.put_nowait((*delivery.item, True))
+        else:
+            self.dead_lettered += 1
+        await self._acks.done(self.queue_name, delivery.tag, ack=False)
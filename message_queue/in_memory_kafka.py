@@ -0,0 +1,131 @@
+import asyncio
+import itertools
+import zlib
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from message_queue.base_kafka_consumer import BaseKafkaConsumer, KafkaRecord
+from message_queue.kafka_producer import BaseKafkaProducer
+
+# Partition được định danh bằng (topic, partition) - cùng dạng tuple với aiokafka.TopicPartition
+TopicPartition = Tuple[str, int]
+
+
+class InMemoryKafkaBroker:
+    """
+    Fake Kafka broker trong process (dùng cho test / chạy local):
+    - mỗi topic có `partitions` partition, record phân theo crc32(key) hoặc round-robin
+    - offset commit lưu theo (group_id, partition)
+    """
+
+    def __init__(self, partitions: int = 4):
+        self.partitions = partitions
+        self.topics: Dict[str, List[List[Tuple[Optional[bytes], bytes]]]] = {}
+        self.committed: Dict[Tuple[str, TopicPartition], int] = {}
+        self._round_robin = itertools.count()
+        self._new_data = asyncio.Event()
+
+    def create_topic(self, topic: str, partitions: Optional[int] = None):
+        if topic not in self.topics:
+            self.topics[topic] = [[] for _ in range(partitions or self.partitions)]
+
+    def partitions_for(self, topic: str) -> List[TopicPartition]:
+        self.create_topic(topic)
+        return [(topic, p) for p in range(len(self.topics[topic]))]
+
+    def produce(self, topic: str, value: bytes, key: Optional[bytes] = None) -> Tuple[TopicPartition, int]:
+        self.create_topic(topic)
+        logs = self.topics[topic]
+        partition = zlib.crc32(key) % len(logs) if key is not None else next(self._round_robin) % len(logs)
+        logs[partition].append((key, value))
+        self._new_data.set()
+        return (topic, partition), len(logs[partition]) - 1
+
+    def fetch(self, tp: TopicPartition, offset: int, max_records: int) -> List[Tuple[Optional[bytes], bytes]]:
+        topic, partition = tp
+        return self.topics[topic][partition][offset:offset + max_records]
+
+    def commit(self, group_id: str, tp: TopicPartition, offset: int):
+        self.committed[(group_id, tp)] = offset
+
+    async def wait_for_data(self, timeout: float):
+        self._new_data.clear()
+        try:
+            await asyncio.wait_for(self._new_data.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class InMemoryKafkaConsumer(BaseKafkaConsumer):
+    """Consumer trên InMemoryKafkaBroker; một member duy nhất nên được gán mọi partition."""
+
+    def __init__(
+        self,
+        broker: InMemoryKafkaBroker,
+        topics: List[str],
+        group_id: str = "observer",
+        prefetch_count: int = 100,
+        commit_batch_size: int = 50,
+        commit_interval_ms: float = 200,
+        redelivery_delay: float = 0.05,
+    ):
+        super().__init__(prefetch_count, commit_batch_size, commit_interval_ms, redelivery_delay)
+        self.broker = broker
+        self.topics = topics
+        self.group_id = group_id
+        self._positions: Dict[TopicPartition, int] = {}
+        self._paused: Set[TopicPartition] = set()
+
+    async def _connect(self):
+        for topic in self.topics:
+            for tp in self.broker.partitions_for(topic):
+                self._positions[tp] = self.broker.committed.get((self.group_id, tp), 0)
+
+    async def _fetch(self, max_records: int) -> List[KafkaRecord]:
+        records = self._poll(max_records)
+        if not records:
+            await self.broker.wait_for_data(0.1)
+            records = self._poll(max_records)
+        return records
+
+    def _poll(self, max_records: int) -> List[KafkaRecord]:
+        records: List[KafkaRecord] = []
+        for tp, position in self._positions.items():
+            if tp in self._paused or len(records) >= max_records:
+                continue
+            fetched = self.broker.fetch(tp, position, max_records - len(records))
+            records.extend((tp, position + i, key, value) for i, (key, value) in enumerate(fetched))
+            self._positions[tp] = position + len(fetched)
+        return records
+
+    async def _commit_offset(self, partition: Hashable, offset: int):
+        self.broker.commit(self.group_id, partition, offset)
+
+    def _seek(self, partition: Hashable, offset: int):
+        self._positions[partition] = offset
+
+    def _pause(self, partition: Hashable):
+        self._paused.add(partition)
+
+    def _resume(self, partition: Hashable):
+        self._paused.discard(partition)
+
+    async def _disconnect(self):
+        return None
+
+
+class InMemoryKafkaProducer(BaseKafkaProducer):
+    """Producer ghi thẳng vào InMemoryKafkaBroker."""
+
+    def __init__(self, broker: InMemoryKafkaBroker):
+        self.broker = broker
+        self.sent = 0
+
+    async def start(self):
+        return None
+
+    async def send(self, topic: str, value: bytes, key: Optional[bytes] = None):
+        self.broker.produce(topic, value, key)
+        self.sent += 1
+
+    async def close(self):
+        return None
@@ -0,0 +1,25 @@
+from config.models.message_queue import MessageQueueConfig
+from message_queue.rabbitmq_connection import _ssl_context
+
+try:
+    import aiokafka
+except ImportError:  # aiokafka là dependency tuỳ chọn, chỉ cần khi dùng Kafka thật
+    aiokafka = None
+
+
+def require_aiokafka():
+    if aiokafka is None:
+        raise RuntimeError("Kafka support requires aiokafka (pip install aiokafka)")
+
+
+def bootstrap_servers(config: MessageQueueConfig) -> str:
+    return config.bootstrap_servers or f"{config.host}:{config.port}"
+
+
+def connection_kwargs(config: MessageQueueConfig) -> dict:
+    """Tham số kết nối chung cho AIOKafkaConsumer / AIOKafkaProducer."""
+    kwargs = {"bootstrap_servers": bootstrap_servers(config)}
+    if config.ssl:
+        kwargs["security_protocol"] = "SSL"
+        kwargs["ssl_context"] = _ssl_context(config)
+    return kwargs
@@ -0,0 +1,72 @@
+import logging
+from typing import Hashable, List
+
+from config.models.message_queue import MessageQueueConfig
+from message_queue.base_kafka_consumer import BaseKafkaConsumer, KafkaRecord
+from message_queue.kafka_connection import aiokafka, connection_kwargs, require_aiokafka
+
+logger = logging.getLogger(__name__)
+
+
+class KafkaConsumer(BaseKafkaConsumer):
+    """Consumer Kafka (aiokafka), tắt auto-commit; offset commit theo lô sau khi xử lý xong."""
+
+    def __init__(self, config: MessageQueueConfig):
+        super().__init__(
+            prefetch_count=config.prefetch_count,
+            commit_batch_size=config.ack_batch_size,
+            commit_interval_ms=config.ack_interval_ms,
+        )
+        self.config = config
+        self.topics = config.topics or [config.queue]
+        self._consumer = None
+
+    async def _connect(self):
+        require_aiokafka()
+        self._consumer = aiokafka.AIOKafkaConsumer(
+            group_id=self.config.group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+            max_poll_records=self.config.prefetch_count,
+            **connection_kwargs(self.config),
+        )
+        await self._consumer.start()
+        self._consumer.subscribe(self.topics, listener=_RebalanceListener(self))
+        logger.info(f"[KafkaConsumer] Subscribed to {self.topics} (group={self.config.group_id})")
+
+    async def _fetch(self, max_records: int) -> List[KafkaRecord]:
+        batches = await self._consumer.getmany(timeout_ms=500, max_records=max_records)
+        return [
+            (tp, record.offset, record.key, record.value)
+            for tp, records in batches.items()
+            for record in records
+        ]
+
+    async def _commit_offset(self, partition: Hashable, offset: int):
+        await self._consumer.commit({partition: offset})
+
+    def _seek(self, partition: Hashable, offset: int):
+        self._consumer.seek(partition, offset)
+
+    def _pause(self, partition: Hashable):
+        self._consumer.pause(partition)
+
+    def _resume(self, partition: Hashable):
+        if partition in self._consumer.assignment():
+            self._consumer.resume(partition)
+
+    async def _disconnect(self):
+        if self._consumer is not None:
+            await self._consumer.stop()
+
+
+if aiokafka is not None:
+    class _RebalanceListener(aiokafka.ConsumerRebalanceListener):
+        def __init__(self, consumer: KafkaConsumer):
+            self.consumer = consumer
+
+        async def on_partitions_revoked(self, revoked):
+            await self.consumer._revoke(revoked)
+
+        async def on_partitions_assigned(self, assigned):
+            pass
@@ -0,0 +1,70 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from config.models.message_queue import MessageQueueConfig
+from message_queue.kafka_connection import aiokafka, connection_kwargs, require_aiokafka
+
+
+class BaseKafkaProducer(ABC):
+    """Base interface cho producer Kafka (thật hoặc fake)."""
+
+    @abstractmethod
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def send(self, topic: str, value: bytes, key: Optional[bytes] = None):
+        """Gửi record, trả về khi broker đã ghi nhận."""
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+
+class KafkaProducer(BaseKafkaProducer):
+    """
+    Producer aiokafka với linger + batch compression:
+    các send() đồng thời được gom vào cùng batch của partition trong `linger_ms`.
+    """
+
+    def __init__(
+        self,
+        config: MessageQueueConfig,
+        linger_ms: float = 5,
+        max_batch_size: int = 16384,
+        compression_type: Optional[str] = "gzip",
+        acks: str | int = "all",
+    ):
+        self.config = config
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self.compression_type = compression_type
+        self.acks = acks
+        self._producer = None
+        self._start_lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._start_lock:
+            if self._producer is not None:
+                return
+            require_aiokafka()
+            producer = aiokafka.AIOKafkaProducer(
+                linger_ms=self.linger_ms,
+                max_batch_size=self.max_batch_size,
+                compression_type=self.compression_type,
+                acks=self.acks,
+                **connection_kwargs(self.config),
+            )
+            await producer.start()
+            self._producer = producer
+
+    async def send(self, topic: str, value: bytes, key: Optional[bytes] = None):
+        if self._producer is None:
+            await self.start()
+        await self._producer.send_and_wait(topic, value=value, key=key)
+
+    async def close(self):
+        if self._producer is not None:
+            await self._producer.stop()
+            self._producer = None
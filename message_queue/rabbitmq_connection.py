@@ -0,0 +1,70 @@
+import os
+import ssl
+from typing import Dict, Tuple
+
+from config.models.message_queue import MessageQueueConfig
+
+try:
+    import aio_pika
+    from aio_pika.pool import Pool
+except ImportError:  # aio-pika là dependency tuỳ chọn, chỉ cần khi dùng RabbitMQ thật
+    aio_pika = None
+    Pool = None
+
+
+_connection_pools: Dict[Tuple, "Pool"] = {}
+
+
+def _require_aio_pika():
+    if aio_pika is None:
+        raise RuntimeError("RabbitMQ support requires aio-pika (pip install aio-pika)")
+
+
+def _ssl_context(config: MessageQueueConfig) -> ssl.SSLContext | None:
+    if not config.ssl:
+        return None
+    cafile = config.ssl_options.ca_certs if config.ssl_options else None
+    return ssl.create_default_context(cafile=cafile)
+
+
+async def connect(config: MessageQueueConfig):
+    """Mở một robust connection tới RabbitMQ theo MessageQueueConfig."""
+    _require_aio_pika()
+    kwargs = {}
+    heartbeat = config.connection_params.get("heartbeat")
+    if heartbeat is not None:
+        kwargs["heartbeat"] = heartbeat
+
+    return await aio_pika.connect_robust(
+        host=config.host,
+        port=config.port,
+        login=config.username,
+        password=config.password,
+        virtualhost=config.virtual_host,
+        ssl=config.ssl,
+        ssl_context=_ssl_context(config),
+        **kwargs,
+    )
+
+
+def get_connection_pool(config: MessageQueueConfig, max_size: int = 2) -> "Pool":
+    """Pool connection dùng chung trong process cho cùng một broker/vhost/user."""
+    _require_aio_pika()
+    key = (config.host, config.port, config.virtual_host, config.username)
+    pool = _connection_pools.get(key)
+    if pool is None:
+        pool = _connection_pools[key] = Pool(connect, config, max_size=max_size)
+    return pool
+
+
+async def close_connection_pools():
+    """Đóng toàn bộ connection pool (gọi khi shutdown)."""
+    pools = list(_connection_pools.values())
+    _connection_pools.clear()
+    for pool in pools:
+        await pool.close()
+
+
+# Worker fork từ supervisor: không dùng lại kết nối AMQP của process cha
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_connection_pools.clear)
@@ -0,0 +1,97 @@
+import logging
+from typing import AsyncIterator, Dict
+
+from config.models.message_queue import MessageQueueConfig
+from message_queue.ack_batcher import AckBatcher
+from message_queue.base_consumer import BaseConsumer, Delivery
+from message_queue.rabbitmq_connection import connect
+
+logger = logging.getLogger(__name__)
+
+
+_LANE = "channel"
+
+
+class RabbitMQDelivery(Delivery):
+    def __init__(self, consumer: "RabbitMQConsumer", message):
+        self.consumer = consumer
+        self.message = message
+        self.body = message.body
+
+    async def ack(self):
+        await self.consumer._acks.done(_LANE, self.message.delivery_tag)
+
+    async def nack(self, requeue: bool = True):
+        tag = self.message.delivery_tag
+        await self.message.nack(requeue=requeue)
+        self.consumer._unacked.pop(tag, None)
+        await self.consumer._acks.done(_LANE, tag, ack=False)
+
+
+class RabbitMQConsumer(BaseConsumer):
+    """
+    Consumer RabbitMQ (aio-pika):
+    - prefetch_count qua basic.qos
+    - ack gom theo lô bằng basic.ack(multiple=True)
+    - nack(requeue=True) ngay khi xử lý lỗi -> chỉ redeliver message lỗi
+    """
+
+    def __init__(self, config: MessageQueueConfig):
+        self.config = config
+        self._connection = None
+        self._channel = None
+        self._queue = None
+        self._iterator = None
+        self._unacked: Dict[int, object] = {}
+        self._acks = AckBatcher(
+            self._commit,
+            batch_size=config.ack_batch_size,
+            interval_ms=config.ack_interval_ms,
+        )
+
+    async def start(self):
+        self._connection = await connect(self.config)
+        self._channel = await self._connection.channel()
+        await self._channel.set_qos(prefetch_count=self.config.prefetch_count)
+
+        exchange = await self._channel.declare_exchange(
+            self.config.exchange,
+            type=self.config.exchange_type,
+            durable=self.config.durable,
+            auto_delete=self.config.auto_delete,
+        )
+        self._queue = await self._channel.declare_queue(
+            self.config.queue,
+            durable=self.config.durable,
+            auto_delete=self.config.auto_delete,
+        )
+        await self._queue.bind(exchange, routing_key=self.config.routing_key or self.config.queue)
+        self._acks.start()
+        logger.info(f"[RabbitMQConsumer] Consuming '{self.config.queue}' (prefetch={self.config.prefetch_count})")
+
+    async def deliveries(self) -> AsyncIterator[Delivery]:
+        async with self._queue.iterator() as iterator:
+            self._iterator = iterator
+            async for message in iterator:
+                self._unacked[message.delivery_tag] = message
+                self._acks.track(_LANE, message.delivery_tag)
+                yield RabbitMQDelivery(self, message)
+
+    async def stop(self):
+        if self._iterator is not None:
+            await self._iterator.close()
+
+    async def close(self):
+        await self._acks.close()
+        if self._channel is not None:
+            await self._channel.close()
+        if self._connection is not None:
+            await self._connection.close()
+
+    async def _commit(self, lane, tag: int):
+        """basic.ack(multiple=True) tới tag rồi bỏ các message đã được ack khỏi bộ đệm."""
+        await self._unacked[tag].ack(multiple=True)
+        for pending in list(self._unacked):
+            if pending > tag:
+                break
+            del self._unacked[pending]
@@ -0,0 +1,73 @@
+import asyncio
+from typing import List, Optional
+
+from config.models.message_queue import MessageQueueConfig
+from message_queue.base_publisher import BasePublisher, OutgoingMessage
+from message_queue.rabbitmq_connection import aio_pika, Pool, get_connection_pool
+
+
+class RabbitMQPublisher(BasePublisher):
+    """
+    Publisher RabbitMQ (aio-pika):
+    - connection dùng chung qua get_connection_pool(), channel pool riêng cho publisher
+    - channel bật publisher_confirms; mỗi worker giữ một channel và chờ confirm theo batch
+    - exchange / durable / auto_delete / delivery_mode lấy từ MessageQueueConfig
+    """
+
+    def __init__(
+        self,
+        config: MessageQueueConfig,
+        exchange: Optional[str] = None,
+        channel_pool_size: int = 4,
+        confirm_batch_size: int = 100,
+        confirm_linger_ms: float = 5,
+    ):
+        super().__init__(confirm_batch_size, confirm_linger_ms, workers=channel_pool_size)
+        self.config = config
+        self.exchange_name = exchange or config.exchange
+        self.channel_pool_size = channel_pool_size
+
+        self._connection_pool = None
+        self._channel_pool = None
+
+    async def _connect(self):
+        self._connection_pool = get_connection_pool(self.config)
+        self._channel_pool = Pool(self._create_channel, max_size=self.channel_pool_size)
+
+        async with self._channel_pool.acquire() as channel:
+            await channel.declare_exchange(
+                self.exchange_name,
+                type=self.config.exchange_type,
+                durable=self.config.durable,
+                auto_delete=self.config.auto_delete,
+            )
+
+    async def _create_channel(self):
+        async with self._connection_pool.acquire() as connection:
+            return await connection.channel(publisher_confirms=True)
+
+    async def _publish_batch(self, batch: List[OutgoingMessage]) -> List[Optional[Exception]]:
+        delivery_mode = aio_pika.DeliveryMode(self.config.delivery_mode)
+        async with self._channel_pool.acquire() as channel:
+            exchange = await channel.get_exchange(self.exchange_name, ensure=False)
+            # Gửi liên tiếp cả batch rồi chờ confirm chung -> ~1 round-trip cho mỗi batch
+            results = await asyncio.gather(
+                *(
+                    exchange.publish(
+                        aio_pika.Message(
+                            body=msg.body,
+                            headers=msg.headers,
+                            content_type="application/json",
+                            delivery_mode=delivery_mode,
+                        ),
+                        routing_key=msg.routing_key,
+                    )
+                    for msg in batch
+                ),
+                return_exceptions=True,
+            )
+        return [r if isinstance(r, Exception) else None for r in results]
+
+    async def _disconnect(self):
+        if self._channel_pool is not None:
+            await self._channel_pool.close()
@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+from typing import Any, Callable, Dict, List, Union
+from observer.targets.base_observer import BaseObserver
+from observer.envelope import MessageEnvelope
+from telemetry.instruments import DISPATCH_IN_FLIGHT, TARGET_IN_FLIGHT
+
+# Danh sách target, hoặc hàm trả về danh sách (gọi sau khi được admit -> hot-reload
+# không gửi message đang chờ slot vào target đã bị thay)
+Targets = Union[List[BaseObserver], Callable[[], List[BaseObserver]]]
+
+
+class DispatchEngine:
+    """
+    Fan-out message -> targets với giới hạn đồng thời:
+    - per-source: số message của một source được xử lý cùng lúc
+    - global: tổng số message đang xử lý (backpressure cho consumer)
+    - per-target: số lời gọi update() đồng thời của một target (bỏ qua với target tự gom batch,
+      xem BaseObserver.batches; global / per-source vẫn giới hạn số message chờ trong batch)
+    """
+
+    def __init__(self, max_in_flight: int = 1000, per_source: int = 200, per_target: int = 50):
+        self.max_in_flight = max_in_flight
+        self.per_source = per_source
+        self.per_target = per_target
+
+        self._global = asyncio.Semaphore(max_in_flight)
+        self._source_sems: Dict[str, asyncio.Semaphore] = {}
+        self._target_sems: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight = 0  # số message đã được admit, chưa release
+        self._active: Dict[BaseObserver, int] = {}  # số update() đang chạy theo instance target
+        self._idle_events: Dict[BaseObserver, asyncio.Event] = {}
+
+    # -------------------------------
+    # Semaphores
+    # -------------------------------
+    def _source_sem(self, source: str) -> asyncio.Semaphore:
+        sem = self._source_sems.get(source)
+        if sem is None:
+            sem = self._source_sems[source] = asyncio.Semaphore(self.per_source)
+        return sem
+
+    def _target_slot(self, source: str, target: BaseObserver):
+        if target.batches:
+            return contextlib.nullcontext()
+        return self._target_sem(source, target)
+
+    def _target_sem(self, source: str, target: BaseObserver) -> asyncio.Semaphore:
+        key = f"{source}:{target.name}"
+        sem = self._target_sems.get(key)
+        if sem is None:
+            sem = self._target_sems[key] = asyncio.Semaphore(self.per_target)
+        return sem
+
+    async def _admit(self, source: str):
+        """Chờ slot của source rồi slot global (thứ tự cố định để tránh deadlock)."""
+        source_sem = self._source_sem(source)
+        await source_sem.acquire()
+        try:
+            await self._global.acquire()
+        except BaseException:
+            source_sem.release()
+            raise
+        self._in_flight += 1
+        DISPATCH_IN_FLIGHT.inc()
+
+    def _release(self, source: str):
+        self._in_flight -= 1
+        DISPATCH_IN_FLIGHT.dec()
+        self._global.release()
+        self._source_sem(source).release()
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    async def dispatch(self, source: str, targets: Targets, data: Any) -> list:
+        """Xử lý một message và chờ tới khi mọi target hoàn tất."""
+        await self._admit(source)
+        try:
+            return await self._fan_out(source, targets, data)
+        finally:
+            self._release(source)
+
+    async def wait_idle(self, target: BaseObserver):
+        """Chờ tới khi target không còn update() nào đang chạy (dùng khi thay target lúc reload)."""
+        if target not in self._active:
+            return
+        event = self._idle_events.setdefault(target, asyncio.Event())
+        await event.wait()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # -------------------------------
+    # Internal
+    # -------------------------------
+    async def _fan_out(self, source: str, targets: Targets, data: Any) -> list:
+        if callable(targets):
+            targets = targets()
+        # Đánh dấu active ngay (đồng bộ) để wait_idle() không bỏ sót lời gọi chưa kịp chạy
+        targets = [t for t in targets or [] if t]
+        for target in targets:
+            self._active[target] = self._active.get(target, 0) + 1
+        # Mọi target dùng chung một envelope -> message chỉ encode (và nén) một lần
+        envelope = MessageEnvelope.wrap(data, source)
+        tasks = [self._call_target(source, t, envelope) for t in targets]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _call_target(self, source: str, target: BaseObserver, envelope: MessageEnvelope):
+        in_flight = TARGET_IN_FLIGHT.labels(target.name)
+        try:
+            async with self._target_slot(source, target):
+                in_flight.inc()
+                try:
+                    return await target.update_envelope(envelope)
+                finally:
+                    in_flight.dec()
+        finally:
+            remaining = self._active[target] - 1
+            if remaining:
+                self._active[target] = remaining
+            else:
+                del self._active[target]
+                event = self._idle_events.pop(target, None)
+                if event:
+                    event.set()
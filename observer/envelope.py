@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from requester_client.compression import compress, compress_async
+from requester_client.utils import codec as json_codec
+
+
+class MessageEnvelope:
+    """
+    Message đã encode, bất biến, dựng một lần trong ObserverManager.handle_message
+    và dùng chung cho mọi target / URL:
+    - `body`: JSON bytes, encode lần đầu được dùng (target form-encode thì không tốn)
+    - `encoded(encoding)` / `encoded_async(...)`: bản nén gzip/deflate/zstd, nén một lần rồi cache
+    """
+
+    __slots__ = ("source", "data", "_body", "_variants")
+
+    def __init__(self, data: Any, source: Optional[str] = None, body: Optional[bytes] = None):
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "_body", body)
+        object.__setattr__(self, "_variants", {})
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def wrap(cls, message: Any, source: Optional[str] = None) -> "MessageEnvelope":
+        return message if isinstance(message, cls) else cls(message, source=source)
+
+    @property
+    def body(self) -> bytes:
+        body = self._body
+        if body is None:
+            body = json_codec.dumps(self.data)
+            object.__setattr__(self, "_body", body)
+        return body
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def encoded(self, encoding: str, level: Optional[int] = None) -> bytes:
+        """Body đã nén theo `encoding` ("identity" = không nén)."""
+        if encoding == "identity":
+            return self.body
+        key: Tuple[str, Optional[int]] = (encoding, level)
+        variants: Dict[Tuple[str, Optional[int]], Any] = self._variants
+        variant = variants.get(key)
+        if isinstance(variant, bytes):
+            return variant
+        body = compress(self.body, encoding, level)
+        variants[key] = body
+        return body
+
+    async def encoded_async(self, encoding: str, level: Optional[int] = None, offload_size: int = 256 * 1024) -> bytes:
+        """
+        Như encoded() nhưng body lớn được nén trong thread pool.
+        Nhiều target cùng cần một bản nén -> chỉ nén một lần, các target khác chờ kết quả.
+        """
+        if encoding == "identity":
+            return self.body
+        key = (encoding, level)
+        variants = self._variants
+        variant = variants.get(key)
+        if isinstance(variant, bytes):
+            return variant
+        if variant is None:
+            variant = variants[key] = asyncio.ensure_future(
+                compress_async(self.body, encoding, level, offload_size)
+            )
+            variant.add_done_callback(lambda f: self._settle(key, f))
+        return await asyncio.shield(variant)
+
+    def _settle(self, key: Tuple[str, Optional[int]], future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None:
+            self._variants.pop(key, None)  # lỗi -> lần sau nén lại
+        else:
+            self._variants[key] = future.result()
@@ -1,14 +1,33 @@
+import logging
+
+from config.models import HttpTargetConfig, RabbitMQTargetConfig, KafkaTargetConfig
 from observer.targets.http_target import HttpTarget
 from observer.targets.rabbitmq_target import RabbitMQTarget
+from observer.targets.kafka_target import KafkaTarget
 from observer.targets.base_observer import BaseObserver
 
-def create_observer(config: dict) -> BaseObserver | None:
-    """Tạo target phù hợp theo type."""
-    ttype = config.get("type", "").lower()
-    if ttype == "http":
-        return HttpTarget(config)
-    elif ttype == "rabbitmq":
-        return RabbitMQTarget(config)
-    else:
-        print(f"[ObserverManager] Unknown target type: {ttype}")
-        return None
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+
+# type -> (model config, class target)
+TARGET_TYPES = {
+    "http": (HttpTargetConfig, HttpTarget),
+    "rabbitmq": (RabbitMQTargetConfig, RabbitMQTarget),
+    "kafka": (KafkaTargetConfig, KafkaTarget),
+}
+
+def create_observer(config) -> BaseObserver | None:
+    """
+    Tạo target phù hợp theo type từ model config đã validate
+    (dict thô được validate thành model tương ứng trước).
+    """
+    ttype = (config.get("type", "") if isinstance(config, dict) else config.type).lower()
+    entry = TARGET_TYPES.get(ttype)
+    if entry is None:
+        logger.warning(f"[ObserverManager] Unknown target type: {ttype}")
+        return None
+
+    model_cls, target_cls = entry
+    if isinstance(config, dict):
+        config = model_cls(**config)
+    return target_cls(config)
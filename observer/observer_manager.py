@@ -1,6 +1,15 @@
 import asyncio
+import logging
 from config.settings import settings
+from config.config_diff import ObserverConfigDiff, diff_observer_config
 from observer.observer_factory import create_observer
+from observer.dispatcher import DispatchEngine
+from observer.envelope import MessageEnvelope
+from message_queue.rabbitmq_connection import close_connection_pools
+from requester_client.transport_registry import close_transports
+
+logger = logging.getLogger(__name__)
+
 
 class ObserverManager:
     """Singleton quản lý toàn bộ observer (mỗi source có nhiều target)."""
@@ -13,25 +22,103 @@ class ObserverManager:
             cls._instance._init_observers()
         return cls._instance
 
-    def _init_observers(self):
-        """Khởi tạo tất cả observer từ settings."""
+    @classmethod
+    def from_config(cls, observer_cfg, dispatch_cfg) -> "ObserverManager":
+        """Instance riêng (không phải singleton) dựng từ config truyền vào, dùng cho benchmark."""
+        manager = super().__new__(cls)
+        manager._init_observers(observer_cfg, dispatch_cfg)
+        return manager
+
+    def _init_observers(self, observer_cfg=None, dispatch_cfg=None):
+        """Khởi tạo tất cả observer từ settings (hoặc config truyền vào)."""
         self.observers = {}
-        observer_cfg = settings.observer or {}
+        self._targets = {}       # (source, tên target) -> instance
+        self._fingerprints = {}  # (source, tên target) -> fingerprint config đang chạy
+        self._retiring: set[asyncio.Task] = set()
+
+        diff = diff_observer_config({}, observer_cfg or settings.observer)
+        self._apply_diff(diff)
+
+        dispatch_cfg = dispatch_cfg or settings.dispatch
+        self.dispatcher = DispatchEngine(
+            max_in_flight=dispatch_cfg.max_in_flight,
+            per_source=dispatch_cfg.per_source,
+            per_target=dispatch_cfg.per_target,
+        )
+
+        logger.info(f"[ObserverManager] Initialized {len(self.observers)} observers.")
+
+
+    async def handle_message(self, source: str, data: dict) -> bool:
+        """
+        Gửi message tới các target tương ứng với source (chờ tới khi xong).
+        Trả về False nếu có target gửi lỗi (consumer sẽ nack để redeliver).
+        """
+        if not self.observers.get(source):
+            logger.warning("[ObserverManager] No targets for source '%s'", source)
+            return True
+
+        envelope = MessageEnvelope(data, source=source)
+        results = await self.dispatcher.dispatch(source, lambda: self.observers.get(source), envelope)
+        return not any(r is False or isinstance(r, Exception) for r in results)
+
+    async def drain(self):
+        """Chờ các target bị thay lúc reload xử lý xong và đóng (message do caller của handle_message chờ)."""
+        while self._retiring:
+            await asyncio.gather(*list(self._retiring), return_exceptions=True)
+
+    # -------------------------------
+    # Hot reload
+    # -------------------------------
+    async def apply_config(self, observer_cfg) -> ObserverConfigDiff:
+        """
+        Áp dụng ObserverConfig mới: chỉ dựng lại target thêm/đổi, giữ nguyên target không đổi.
+        Target cũ bị thay thế vẫn xử lý nốt các update() đang chạy rồi mới close();
+        connection pool dùng chung theo origin (transport registry) nên không bị đóng.
+        """
+        diff = diff_observer_config(self._fingerprints, observer_cfg)
+        if diff.empty:
+            return diff
 
-        for source, cfg in observer_cfg.items():
-            targets_cfg = cfg.get("targets", [])
-            targets = [create_observer(tcfg) for tcfg in targets_cfg]
-            self.observers[source] = targets
+        retired = self._apply_diff(diff)
+        for target in retired:
+            task = asyncio.create_task(self._retire(target))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+        logger.info(f"[ObserverManager] Applied observer config change ({diff}), retiring {len(retired)} target(s)")
+        return diff
 
-        print(f"[ObserverManager] Initialized {len(self.observers)} observers.")
+    def _apply_diff(self, diff: ObserverConfigDiff) -> list:
+        """Tạo target mới và dựng lại danh sách target của các source bị ảnh hưởng (O(số thay đổi))."""
+        retired = []
+        for key in diff.removed:
+            retired.append(self._targets.pop(key, None))
+        for key, target_cfg in {**diff.added, **diff.changed}.items():
+            if key in self._targets:
+                retired.append(self._targets[key])
+            self._targets[key] = create_observer(target_cfg)
+        self._fingerprints = diff.fingerprints
 
+        for source in diff.sources:
+            # Thứ tự target theo config mới
+            keys = [key for key in diff.fingerprints if key[0] == source]
+            if keys:
+                self.observers[source] = [self._targets[key] for key in keys]
+            else:
+                self.observers.pop(source, None)
+        return [t for t in retired if t]
 
-    async def handle_message(self, source: str, data: dict):
-        """Gửi message tới các target tương ứng với source."""
-        targets = self.observers.get(source)
-        if not targets:
-            print(f"[ObserverManager] No targets for source '{source}'")
-            return
+    async def _retire(self, target):
+        await self.dispatcher.wait_idle(target)
+        try:
+            await target.close()
+        except Exception as e:
+            logger.warning(f"[ObserverManager] Failed to close retired target {target.name}: {e}")
 
-        tasks = [t.update(data) for t in targets if t]
-        await asyncio.gather(*tasks, return_exceptions=True)
+    async def close(self):
+        """Chờ message đang xử lý rồi đóng (flush) toàn bộ target."""
+        await self.drain()
+        targets = [t for t in self._targets.values() if t]
+        await asyncio.gather(*(t.close() for t in targets), return_exceptions=True)
+        await close_connection_pools()
+        await close_transports()
@@ -1,10 +1,29 @@
 from typing import Any, Dict
+from observer.envelope import MessageEnvelope
 
 class BaseObserver:
-    def __init__(self, name: str, config: dict | None = None):
+    # True: target tự gom message thành batch (chờ linger / đủ lô) -> dispatcher không giữ
+    # slot per-target trong lúc message nằm chờ, nếu không batch không bao giờ đầy
+    batches: bool = False
+
+    def __init__(self, name: str, config: Any = None):
         self.name = name
         self.config = config or {}
 
     async def update(self, message: Dict[str, Any]):
-        """Gửi message đến nơi cần thiết (override ở subclass)."""
+        """
+        Gửi message đến nơi cần thiết (override ở subclass).
+        Trả về False hoặc raise khi gửi lỗi.
+        """
         raise NotImplementedError
+
+    async def update_envelope(self, envelope: MessageEnvelope):
+        """
+        Như update() nhưng nhận message đã encode dùng chung giữa các target.
+        Mặc định gọi update(envelope.data); target gửi bytes override để dùng envelope.body.
+        """
+        return await self.update(envelope.data)
+
+    async def close(self):
+        """Giải phóng tài nguyên / flush dữ liệu còn lại khi shutdown."""
+        return None
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class BatchAccumulator:
+    """
+    Gom nhiều item thành một batch, flush khi:
+    - đủ `max_items` item, hoặc
+    - tổng kích thước đạt `max_bytes`, hoặc
+    - item đầu tiên đã chờ quá `max_linger_ms`.
+
+    `flush_fn(items)` trả về list kết quả theo đúng thứ tự item;
+    mỗi lời gọi add() nhận lại kết quả của chính item đó.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_items: int = 100,
+        max_bytes: int = 1_000_000,
+        max_linger_ms: float = 50,
+    ):
+        self.flush_fn = flush_fn
+        self.max_items = max(1, max_items)
+        self.max_bytes = max_bytes
+        self.max_linger = max_linger_ms / 1000
+
+        self._items: List[Any] = []
+        self._futures: List[asyncio.Future] = []
+        self._bytes = 0
+        self._linger_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def add(self, item: Any, size: int = 0) -> Any:
+        """Thêm item vào batch hiện tại và chờ batch đó được flush."""
+        if self._closed:
+            raise RuntimeError("BatchAccumulator is closed")
+
+        loop = asyncio.get_running_loop()
+        # Item mới làm batch vượt max_bytes -> flush batch cũ trước
+        if self._items and self._bytes + size > self.max_bytes:
+            self._flush_now()
+
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+        self._bytes += size
+
+        if len(self._items) >= self.max_items or self._bytes >= self.max_bytes:
+            self._flush_now()
+        elif self._linger_handle is None:
+            self._linger_handle = loop.call_later(self.max_linger, self._flush_now)
+
+        # shield: caller bị cancel không được làm hỏng kết quả của cả batch
+        return await asyncio.shield(future)
+
+    def _flush_now(self):
+        if self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        if not self._items:
+            return
+
+        items, futures = self._items, self._futures
+        self._items, self._futures, self._bytes = [], [], 0
+
+        task = asyncio.create_task(self._run_flush(items, futures))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _run_flush(self, items: List[Any], futures: List[asyncio.Future]):
+        try:
+            results = await self.flush_fn(items)
+        except Exception as e:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for fut, result in zip(futures, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def close(self):
+        """Không nhận item mới, flush phần còn lại và chờ mọi batch gửi xong."""
+        self._closed = True
+        self._flush_now()
+        while self._flush_tasks:
+            await asyncio.gather(*list(self._flush_tasks), return_exceptions=True)
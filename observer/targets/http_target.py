@@ -1,56 +1,282 @@
 import asyncio
-from typing import Any
-from observer.base_observer import BaseObserver
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from config.models import HttpTargetConfig, HedgeConfig
+from config.config_diff import to_plain
+from observer.envelope import MessageEnvelope
+from observer.targets.base_observer import BaseObserver
+from observer.targets.send_plan import HttpSendPlan, JSON_HEADERS
 from requester_client.dynamic_http_client import DynamicHttpClient
-from requester_client.auth.auth_factory import build_auth_strategy
 from requester_client.rate_limiter.rate_limiter_factory import create_rate_limiter
+from requester_client.resilience import RetryBudget
+from observer.targets.batch_accumulator import BatchAccumulator
+from observer.targets.latency_tracker import LatencyTracker
+from observer.targets.spool import open_spool
+from observer.targets.spool_replayer import SpoolReplayer
+from runtime.worker import stray_worker_paths, worker_path
+from telemetry.instruments import TARGET_SEND_SECONDS, TARGET_SENDS, TARGET_SPOOLED
+from telemetry.tracing import span
 
+logger = logging.getLogger(__name__)
 
-class HttpTarget(BaseObserver):
-    """Target HTTP gửi data đi async, hỗ trợ auth, retry, ratelimit."""
 
-    def __init__(self, config: dict):
-        super().__init__(name=config.get("name", "http_target"), config=config)
-        self.urls = config.get("urls", [])
-        self.method = config.get("method", "POST").upper()
-        self.headers = config.get("headers", {})
-        self.retry_cfg = config.get("retry", {})
-        self.ratelimit_cfg = config.get("ratelimit", {})
-        self.auth_cfg = config.get("auth", {})
+class HttpTarget(BaseObserver):
+    """
+    Target HTTP gửi data đi async, hỗ trợ auth, retry, ratelimit.
+    delivery="all": gửi tới mọi URL; delivery="hedged": các URL là replica,
+    chỉ cần một URL thành công (xem _hedged).
+    Nếu cấu hình `spool`, message gửi lỗi được ghi vào spool trên đĩa và replay nền.
+    Config được compile một lần thành HttpSendPlan; body lấy từ MessageEnvelope dùng chung.
+    """
 
-        self.auth_strategy = build_auth_strategy(self.auth_cfg)
-        self.rate_limiter = create_rate_limiter(self.ratelimit_cfg)
+    def __init__(self, config: HttpTargetConfig):
+        super().__init__(name=config.name, config=config)
+        self.plan = plan = HttpSendPlan.compile(config)
+        self.urls = plan.urls
+        self.method = plan.method
 
         self.client = DynamicHttpClient(
-            headers=self.headers,
-            auth_strategy=self.auth_strategy,
-            rate_limiter=self.rate_limiter,
-            retry_count=self.retry_cfg.get("max_attempts", 3),
-            retry_backoff_factor=self.retry_cfg.get("backoff_factor", 1.0),
-            status_forcelist=self.retry_cfg.get("status_forcelist", [500, 502, 503, 504]),
+            headers=plan.headers,
+            auth_strategy=plan.auth_strategy,
+            rate_limiter=create_rate_limiter(to_plain(config.ratelimit) or None, key=config.name),
+            retry_count=plan.retry_count,
+            retry_backoff_factor=plan.backoff_factor,
+            status_forcelist=plan.status_forcelist,
+            connection=to_plain(config.connection) or None,
+            max_backoff=plan.max_backoff,
+            retry_budget=RetryBudget(ratio=plan.budget_ratio, min_per_sec=plan.budget_min_per_sec),
+            circuit_breaker=to_plain(config.circuit_breaker) or None,
+            compression=to_plain(config.compression) or None,
         )
 
+        self.delivery = config.delivery
+        self.hedge_cfg = config.hedge or HedgeConfig()
+        self.latency = LatencyTracker(min_samples=self.hedge_cfg.min_samples)
+        if self.delivery == "hedged":
+            self.client.on_attempt = self._record_attempt
+
+        self.accumulator = None
+        self.batches = config.batch is not None
+        self.split_depth = 0
+        if config.batch:
+            self.split_depth = max(0, config.batch.split_depth)
+            self.accumulator = BatchAccumulator(
+                self._flush_batch,
+                max_items=config.batch.max_items,
+                max_bytes=config.batch.max_bytes,
+                max_linger_ms=config.batch.max_linger_ms,
+            )
+
+        self.spool = None
+        self.replayer = None
+        if config.spool:
+            spool_cfg = config.spool
+            spool_root = os.path.join(spool_cfg.directory, self.name)
+            self.spool = open_spool(
+                worker_path(spool_root),
+                # Spool của worker không còn tồn tại (WORKERS đổi) được gộp vào spool của worker 0
+                adopt=stray_worker_paths(spool_root),
+                segment_bytes=spool_cfg.segment_bytes,
+                commit_linger_ms=spool_cfg.commit_linger_ms,
+            )
+            self.replayer = SpoolReplayer(
+                self.spool,
+                self._replay,
+                concurrency=spool_cfg.replay_concurrency,
+                interval_ms=spool_cfg.replay_interval_ms,
+                max_backoff_ms=spool_cfg.replay_max_backoff_ms,
+            )
+            try:
+                asyncio.get_running_loop()
+                self.replayer.start()  # replay backlog từ lần chạy trước ngay khi khởi tạo
+            except RuntimeError:
+                pass  # chưa có event loop -> start ở lần update() đầu tiên
+
     async def update(self, data: dict):
         """Gửi data tới tất cả URLs."""
-        print(f"[HttpTarget][{self.name}] Sending data to {len(self.urls)} URLs.")
-        tasks = [self._send(url, data) for url in self.urls]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        return await self.update_envelope(MessageEnvelope(data))
+
+    async def update_envelope(self, envelope: MessageEnvelope):
+        if self.replayer:
+            self.replayer.start()
+
+        if self.accumulator:
+            # Batch giữ chính bytes body của envelope (không copy)
+            return await self.accumulator.add(envelope.body, size=len(envelope))
+
+        # Request kwargs dựng một lần, dùng chung cho mọi URL
+        request = await self.plan.build_request(envelope)
+        if self.delivery == "hedged":
+            if await self._hedged(lambda url: self._send(url, request)):
+                return True
+            return await self._spool_failures([("", envelope.body)])
+
+        logger.debug("[HttpTarget][%s] Sending data to %d URLs.", self.name, len(self.urls))
+        tasks = [self._send(url, request) for url in self.urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failed = [url for url, r in zip(self.urls, results) if r is not True]
+        if not failed:
+            return True
+        return await self._spool_failures([(str(url), envelope.body) for url in failed])
+
+    async def close(self):
+        """Flush batch còn lại, dừng replay, đóng spool rồi đóng client."""
+        if self.accumulator:
+            await self.accumulator.close()
+        if self.replayer:
+            await self.replayer.stop()
+        if self.spool:
+            await self.spool.close()
+        await self.client.aclose()
+
+    # -------------------------------
+    # Batch mode
+    # -------------------------------
+    async def _flush_batch(self, bodies: list[bytes]) -> list[bool]:
+        """
+        Gửi cả batch (JSON array) tới từng URL; trả về trạng thái từng item.
+        Batch lỗi được chia đôi gửi lại (tối đa `split_depth` cấp, xem _deliver_batch) để chỉ
+        item thật sự lỗi bị tính là lỗi; item còn lỗi được spool, không có spool thì coi như lỗi.
+        """
+        logger.debug("[HttpTarget][%s] Flushing batch of %d items to %d URLs.", self.name, len(bodies), len(self.urls))
+        if self.delivery == "hedged":
+            sent = await self._deliver_batch(lambda payload: self._hedged(lambda url: self._post_ok(url, payload)), bodies)
+            failures = [(i, "") for i, ok in enumerate(sent) if not ok]
+        else:
+            per_url = await asyncio.gather(
+                *(self._deliver_batch(lambda payload, url=url: self._post_ok(url, payload), bodies) for url in self.urls)
+            )
+            failures = [(i, str(url)) for url, sent in zip(self.urls, per_url) for i, ok in enumerate(sent) if not ok]
+        if not failures:
+            return [True] * len(bodies)
+
+        failed = {i for i, _ in failures}
+        logger.warning("[HttpTarget][%s] %d/%d batched item(s) failed", self.name, len(failed), len(bodies))
+        spooled = await self._spool_failures([(url, bodies[i]) for i, url in failures])
+        return [spooled if i in failed else True for i in range(len(bodies))]
+
+    async def _deliver_batch(self, send: Callable[[bytes], Awaitable[bool]], bodies: list[bytes], depth: int = 0) -> list[bool]:
+        """
+        Gửi `bodies` thành một JSON array; lỗi thì chia đôi gửi lại từng nửa. Số request tăng thêm
+        bị chặn bởi `split_depth`, circuit breaker và retry budget của client (downstream sập hẳn
+        -> breaker open, các lần gửi sau fail fast không ra mạng).
+        """
+        if await send(b"[" + b",".join(bodies) + b"]"):
+            return [True] * len(bodies)
+        if len(bodies) == 1 or depth >= self.split_depth:
+            return [False] * len(bodies)
+        mid = len(bodies) // 2
+        left, right = await asyncio.gather(
+            self._deliver_batch(send, bodies[:mid], depth + 1),
+            self._deliver_batch(send, bodies[mid:], depth + 1),
+        )
+        return left + right
 
-    async def _create_file_payload(self, data: Any, file_name: str) -> dict:
-        """Tạo payload dạng file nếu cần (placeholder)."""
-        return {"file": (f"{file_name}.txt", data, "plain/text")}
+    async def _post_ok(self, url: str, body: bytes) -> bool:
+        return await self._post_json(url, body) is not None
 
-    async def _send(self, url: str, data: Any, file_info: Any):
+    async def _post_json(self, url, body: bytes):
         try:
-            file = self._create_file_payload(data, file_info.file_name)
-            if file:
-                response = await self.client.request_async(self.method, url, files=file)
-            else:
-                response = await self.client.request_async(self.method, url, data=data) 
-            
+            return await self.client.request_async(self.method, url, content=body, headers=JSON_HEADERS)
+        except Exception as e:
+            logger.warning("[HttpTarget] Failed to send to %s: %s", url, e)
+            return None
+
+    # -------------------------------
+    # Spool
+    # -------------------------------
+    async def _spool_failures(self, failures: list[tuple[str, bytes]]) -> bool:
+        """
+        Ghi các lần gửi lỗi (url, body) vào spool; url rỗng = gửi lại theo kiểu hedged.
+        Trả về True khi đã ghi bền xuống đĩa (message coi như đã nhận), False nếu không có spool.
+        """
+        if not self.spool:
+            return False
+        try:
+            await asyncio.gather(*(self.spool.append(str(url).encode() + b"\n" + body) for url, body in failures))
+        except Exception as e:
+            logger.warning("[HttpTarget][%s] Failed to spool %d message(s): %s", self.name, len(failures), e)
+            return False
+        TARGET_SPOOLED.labels(self.name).inc(len(failures))
+        logger.warning("[HttpTarget][%s] Spooled %d failed delivery(ies)", self.name, len(failures))
+        return True
+
+    async def _replay(self, record: bytes) -> bool:
+        url, _, body = record.partition(b"\n")
+        if self.accumulator:
+            # Endpoint batch nhận JSON array: gửi lại item đã spool dưới dạng batch một phần tử
+            payload = b"[" + body + b"]"
+            send = lambda target_url: self._post_ok(target_url, payload)
+        else:
+            request = self.plan.decode_spooled(body)
+            send = lambda target_url: self._send(target_url, request)
+        if url:
+            return await send(url.decode())
+        return await self._hedged(send)
+
+    # -------------------------------
+    # Hedged mode
+    # -------------------------------
+    async def _hedged(self, send: Callable[[str], Awaitable[bool]]) -> bool:
+        """
+        Gửi tới URL nhanh nhất (theo median latency); nếu sau ngưỡng percentile latency
+        của URL đó vẫn chưa xong (hoặc đã lỗi) thì bắn hedge sang URL kế tiếp.
+        Request đầu tiên thành công thắng, các request còn lại bị huỷ.
+        """
+        percentile = self.hedge_cfg.percentile
+        default_delay = self.hedge_cfg.default_delay_ms / 1000
+        min_delay = self.hedge_cfg.min_delay_ms / 1000
+        max_delay = self.hedge_cfg.max_delay_ms / 1000
+        max_hedges = self.hedge_cfg.max_hedges
+
+        candidates = self.latency.rank(self.urls, default_delay)[: 1 + max_hedges]
+        pending: set[asyncio.Task] = set()
+        try:
+            for idx, url in enumerate(candidates):
+                pending.add(asyncio.create_task(send(url)))
+                is_last = idx == len(candidates) - 1
+                delay = self.latency.estimate(url, percentile, default_delay)
+                deadline = time.monotonic() + min(max(delay, min_delay), max_delay)
+
+                # Chờ tới ngưỡng hedge; request lỗi sớm thì hedge ngay, không chờ hết ngưỡng
+                while pending:
+                    timeout = None if is_last else max(0.0, deadline - time.monotonic())
+                    done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    if any(t.result() is True for t in done):
+                        return True
+                    if not done or not is_last:
+                        break
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_attempt(self, url, seconds: float, status: Optional[int]):
+        """
+        Latency thô của từng lần gửi (client gọi lại, không gồm retry / backoff / chờ rate limit).
+        Lỗi kết nối, 5xx, 429 ghi như một request chậm tới max_delay: URL đang lỗi bị xếp xuống
+        trong rank() và hedge sớm thay vì tiếp tục được chọn vì chỉ các lần thành công được đo.
+        """
+        if status is None or status == 429 or status >= 500:
+            seconds = max(seconds, self.hedge_cfg.max_delay_ms / 1000)
+        self.latency.record(url, seconds)
+
+    async def _send(self, url, request: Dict[str, Any]) -> bool:
+        started = time.monotonic()
+        ok = False
+        try:
+            with span("observer.target.send", {"observer.target": self.name, "url.full": str(url)}):
+                response = await self.client.request_async(self.method, url, **request)
             if response:
-                print(f"[HttpTarget] Sent OK {url} ({response.status_code})")
+                logger.debug("[HttpTarget] Sent OK %s (%d)", url, response.status_code)
+                ok = True
             else:
-                print(f"[HttpTarget] No response from {url}")
+                logger.warning("[HttpTarget] No response from %s", url)
         except Exception as e:
-            print(f"[HttpTarget] Failed to send to {url}: {e}")
+            logger.warning("[HttpTarget] Failed to send to %s: %s", url, e)
+        url = str(url)
+        TARGET_SEND_SECONDS.labels(self.name, url).observe(time.monotonic() - started)
+        TARGET_SENDS.labels(self.name, url, "ok" if ok else "failed").inc()
+        return ok
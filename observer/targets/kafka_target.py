@@ -0,0 +1,39 @@
+from config.settings import settings
+from config.models import KafkaTargetConfig
+from observer.targets.base_observer import BaseObserver
+from message_queue.kafka_producer import BaseKafkaProducer, KafkaProducer
+from requester_client.utils.json_helper import compile_path
+from observer.envelope import MessageEnvelope
+
+class KafkaTarget(BaseObserver):
+    """Target produce message lên Kafka topic (linger + batch compression)."""
+
+    batches = True
+
+    def __init__(self, config: KafkaTargetConfig, producer: BaseKafkaProducer | None = None):
+        super().__init__(name=config.name, config=config)
+        self.topic = config.topic
+        self.key_field = config.key_field
+        self.key_path = compile_path(self.key_field) if self.key_field else None
+
+        self.producer = producer or KafkaProducer(
+            settings.message_queue,
+            linger_ms=config.linger_ms,
+            max_batch_size=config.max_batch_size,
+            compression_type=config.compression_type,
+            acks=config.acks,
+        )
+
+    async def update(self, data: dict):
+        """Produce message, trả về khi broker đã ghi nhận."""
+        return await self.update_envelope(MessageEnvelope(data))
+
+    async def update_envelope(self, envelope: MessageEnvelope):
+        key = None
+        if self.key_path:
+            value = self.key_path.get(envelope.data)
+            key = str(value).encode() if value is not None else None
+        await self.producer.send(self.topic, envelope.body, key=key)
+
+    async def close(self):
+        await self.producer.close()
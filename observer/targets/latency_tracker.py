@@ -0,0 +1,79 @@
+import math
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    """
+    Histogram latency cuộn với bucket log (1ms * 1.25^i, tới ~60s):
+    sau mỗi `window` mẫu, mọi bucket giảm một nửa -> mẫu cũ mờ dần.
+    Ghi và tính percentile đều O(số bucket), không giữ từng mẫu.
+    """
+
+    BASE = 0.001
+    GROWTH = 1.25
+    BUCKETS = 50
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.counts = [0.0] * self.BUCKETS
+        self.total = 0.0
+        self._since_decay = 0
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.BASE:
+            return 0
+        idx = int(math.log(seconds / self.BASE, self.GROWTH)) + 1
+        return min(idx, self.BUCKETS - 1)
+
+    def _upper_bound(self, idx: int) -> float:
+        return self.BASE * self.GROWTH ** idx
+
+    def record(self, seconds: float):
+        self.counts[self._bucket(seconds)] += 1
+        self.total += 1
+        self._since_decay += 1
+        if self._since_decay >= self.window:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+            self._since_decay = 0
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency (giây) tại percentile p (0-100); None nếu chưa có mẫu."""
+        if self.total <= 0:
+            return None
+        threshold = self.total * p / 100
+        cumulative = 0.0
+        for idx, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return self._upper_bound(idx)
+        return self._upper_bound(self.BUCKETS - 1)
+
+
+class LatencyTracker:
+    """Histogram latency theo từng URL của một target (key theo str(url): URL config hay URL client gọi lại đều khớp)."""
+
+    def __init__(self, min_samples: int = 20, window: int = 500):
+        self.min_samples = min_samples
+        self.window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, url: str) -> LatencyHistogram:
+        url = str(url)
+        hist = self._histograms.get(url)
+        if hist is None:
+            hist = self._histograms[url] = LatencyHistogram(self.window)
+        return hist
+
+    def record(self, url: str, seconds: float):
+        self.histogram(url).record(seconds)
+
+    def estimate(self, url: str, p: float, default: float) -> float:
+        hist = self._histograms.get(str(url))
+        if hist is None or hist.total < self.min_samples:
+            return default
+        return hist.percentile(p)
+
+    def rank(self, urls: List[str], default: float) -> List[str]:
+        """Sắp xếp URL theo median latency tăng dần (giữ thứ tự config khi bằng nhau)."""
+        return sorted(urls, key=lambda url: self.estimate(url, 50, default))
@@ -1,15 +1,34 @@
-import asyncio
-from observer.base_observer import BaseObserver
+from config.settings import settings
+from config.models import RabbitMQTargetConfig
+from observer.targets.base_observer import BaseObserver
+from message_queue.base_publisher import BasePublisher
+from message_queue.rabbitmq_publisher import RabbitMQPublisher
+from observer.envelope import MessageEnvelope
 
 class RabbitMQTarget(BaseObserver):
-    """Demo đơn giản cho target RabbitMQ."""
+    """Target publish message lên RabbitMQ (channel pool + batched publisher confirms)."""
 
-    def __init__(self, config: dict):
-        super().__init__(name=config.get("name", "rabbitmq_target"), config=config)
-        self.topic = config.get("topic", "")
-        self.connection = None  # giả sử có aio-pika ở đây
+    batches = True
+
+    def __init__(self, config: RabbitMQTargetConfig, publisher: BasePublisher | None = None):
+        super().__init__(name=config.name, config=config)
+        self.topic = config.topic
+        self.routing_key = config.routing_key or self.topic
+
+        self.publisher = publisher or RabbitMQPublisher(
+            settings.message_queue,
+            exchange=config.exchange,
+            channel_pool_size=config.channel_pool_size,
+            confirm_batch_size=config.confirm_batch_size,
+            confirm_linger_ms=config.confirm_linger_ms,
+        )
 
     async def update(self, data: dict):
-        """Giả lập gửi message lên topic."""
-        await asyncio.sleep(0.1)
-        print(f"[RabbitMQTarget] Published to topic '{self.topic}' -> {data}")
+        """Publish message lên topic, trả về khi broker đã confirm."""
+        return await self.update_envelope(MessageEnvelope(data))
+
+    async def update_envelope(self, envelope: MessageEnvelope):
+        await self.publisher.publish(self.routing_key, envelope.body)
+
+    async def close(self):
+        await self.publisher.close()
@@ -0,0 +1,115 @@
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+import httpx
+
+from config.models import HttpTargetConfig, RetryConfig
+from config.config_diff import to_plain
+from requester_client.auth.auth_factory import build_auth_strategy
+from requester_client.compression import CompressionOptions
+from requester_client.utils import codec as json_codec
+from observer.envelope import MessageEnvelope
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _encode_form(envelope: MessageEnvelope) -> Dict[str, Any]:
+    return {"data": envelope.data}
+
+
+def _encode_json(envelope: MessageEnvelope) -> Dict[str, Any]:
+    # bytes của envelope dùng chung cho mọi target / URL, không encode lại
+    return {"content": envelope.body, "headers": JSON_HEADERS}
+
+
+_ENCODERS: Dict[str, Callable[[MessageEnvelope], Dict[str, Any]]] = {
+    "form": _encode_form,
+    "json": _encode_json,
+}
+
+
+class HttpSendPlan:
+    """
+    Mọi thứ HttpTarget cần để gửi một message, compile một lần từ HttpTargetConfig:
+    URL đã parse, headers đã áp auth, tập status retry, hàm encode body...
+    Bất biến (__slots__, không cho gán lại) -> hot path chỉ đọc thuộc tính.
+    """
+
+    __slots__ = (
+        "name",
+        "method",
+        "urls",
+        "headers",
+        "auth_strategy",
+        "body",
+        "encode",
+        "retry_count",
+        "backoff_factor",
+        "max_backoff",
+        "status_forcelist",
+        "budget_ratio",
+        "budget_min_per_sec",
+        "compression",
+        "compressed_headers",
+    )
+
+    name: str
+    method: str
+    urls: Tuple[httpx.URL, ...]
+    headers: Dict[str, str]
+    body: str
+    encode: Callable[[MessageEnvelope], Dict[str, Any]]
+    retry_count: int
+    backoff_factor: float
+    max_backoff: float
+    status_forcelist: FrozenSet[int]
+    budget_ratio: float
+    budget_min_per_sec: float
+    compression: Optional[CompressionOptions]
+    compressed_headers: Optional[Dict[str, str]]
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, fields[slot])
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def compile(cls, config: HttpTargetConfig) -> "HttpSendPlan":
+        retry = config.retry or RetryConfig()
+        auth_strategy = build_auth_strategy(to_plain(config.auth) or None)
+        compression = CompressionOptions.from_config(to_plain(config.compression) or None)
+        return cls(
+            name=config.name,
+            method=config.method.upper(),
+            urls=tuple(httpx.URL(str(url)) for url in config.urls),
+            headers=auth_strategy.apply(dict(config.headers)),
+            auth_strategy=auth_strategy,
+            body=config.body,
+            encode=_ENCODERS[config.body],
+            retry_count=retry.max_attempts,
+            backoff_factor=retry.backoff_factor,
+            max_backoff=retry.max_backoff,
+            status_forcelist=frozenset(retry.status_forcelist),
+            budget_ratio=retry.budget_ratio,
+            budget_min_per_sec=retry.budget_min_per_sec,
+            compression=compression,
+            compressed_headers={**JSON_HEADERS, "Content-Encoding": compression.encoding} if compression else None,
+        )
+
+    async def build_request(self, envelope: MessageEnvelope) -> Dict[str, Any]:
+        """
+        Request kwargs cho một message. Body JSON đủ lớn dùng bản nén của envelope
+        (nén một lần cho mọi target cùng cấu hình nén).
+        """
+        request = self.encode(envelope)
+        options = self.compression
+        if options is None or "content" not in request or len(envelope) < options.min_size:
+            return request
+        body = await envelope.encoded_async(options.encoding, options.level, options.offload_size)
+        return {"content": body, "headers": self.compressed_headers}
+
+    def decode_spooled(self, body: bytes) -> Dict[str, Any]:
+        """Dựng lại request kwargs từ body JSON trong spool (chỉ parse khi gửi dạng form)."""
+        data = json_codec.loads(body) if self.body == "form" else None
+        return self.encode(MessageEnvelope(data, body=body))
@@ -0,0 +1,397 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Record: [len u32][crc32 u32][payload]; len = 0 đánh dấu hết dữ liệu (vùng preallocate toàn 0)
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor"
+
+SpoolPosition = Tuple[int, int]  # (seq segment, offset trong segment)
+
+
+def _preallocate(fd: int, size: int):
+    """
+    Cấp phát block thật cho cả segment: hết dung lượng đĩa -> lỗi ngay lúc tạo segment
+    thay vì SIGBUS khi ghi vào vùng mmap của file sparse.
+    """
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, 0, size)
+    else:
+        os.ftruncate(fd, size)
+
+
+def _fsync_dir(directory: str):
+    """fsync thư mục để việc tạo / đổi tên file trong đó bền qua crash."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Segment:
+    """Một file segment được preallocate và mmap toàn bộ."""
+
+    def __init__(self, path: str, seq: int, size: int, create: bool = False):
+        self.path = path
+        self.seq = seq
+        flags = os.O_RDWR | (os.O_CREAT if create else 0)
+        self.fd = os.open(path, flags, 0o644)
+        if create:
+            _preallocate(self.fd, size)
+        self.size = os.fstat(self.fd).st_size
+        self.map = mmap.mmap(self.fd, self.size)
+
+    def scan_end(self) -> int:
+        """Tìm offset cuối cùng hợp lệ (bỏ record ghi dở/hỏng do crash)."""
+        offset = 0
+        while offset + _HEADER.size <= self.size:
+            length, crc = _HEADER.unpack_from(self.map, offset)
+            end = offset + _HEADER.size + length
+            if length == 0 or end > self.size:
+                break
+            if zlib.crc32(self.map[offset + _HEADER.size:end]) != crc:
+                break
+            offset = end
+        return offset
+
+    def read(self, offset: int, limit: int) -> Optional[Tuple[bytes, int]]:
+        """Đọc record tại offset (không vượt quá limit); trả (payload, offset kế tiếp)."""
+        if offset + _HEADER.size > limit:
+            return None
+        length, _ = _HEADER.unpack_from(self.map, offset)
+        end = offset + _HEADER.size + length
+        if length == 0 or end > limit:
+            return None
+        return bytes(self.map[offset + _HEADER.size:end]), end
+
+    def close(self):
+        self.map.close()
+        os.close(self.fd)
+
+
+class DurableSpool:
+    """
+    Spool append-only trên đĩa (write-ahead log) cho message chưa gửi được:
+    - Segment preallocate `segment_bytes` và ghi qua mmap; đầy thì rotate sang segment mới.
+    - Group commit: các append() đến trong lúc một lần msync đang chạy được gom lại
+      và ghi + msync chung một lần, nên fsync không thành nút cổ chai khi tải cao.
+    - Đọc lại từ cursor (lưu trong file `cursor`, ghi tmp + fsync + rename), advance() tới đâu
+      thì xoá segment đã đọc hết tới đó. Crash giữa lúc gửi lại và advance -> replay lặp (at-least-once).
+    - fsync của append / advance / adopt chạy trong thread, không block event loop; các advance() đến trong lúc
+      đang ghi cursor được gộp vào một lần ghi.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024, commit_linger_ms: float = 2):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.commit_linger = commit_linger_ms / 1000
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()  # bảo vệ danh sách segment giữa thread commit và event loop
+        self._segments: List[_Segment] = []
+        self._write_offset = 0
+        self._committed: SpoolPosition = (0, 0)
+        self._cursor: SpoolPosition = (0, 0)
+
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self._appended: Optional[asyncio.Event] = None
+        self._cursor_lock: Optional[asyncio.Lock] = None
+        self._orphans: List[str] = []  # thư mục spool mồ côi chờ adopt_orphans()
+        self._refs = 1
+        self._recover()
+
+    # -------------------------------
+    # Recovery
+    # -------------------------------
+    def _recover(self):
+        seqs = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX)
+        )
+        for seq in seqs:
+            self._segments.append(_Segment(self._segment_path(seq), seq, 0))
+        if not self._segments:
+            self._segments.append(self._new_segment(0, self.segment_bytes))
+
+        active = self._segments[-1]
+        self._write_offset = active.scan_end()
+        self._committed = (active.seq, self._write_offset)
+
+        self._cursor = (self._segments[0].seq, 0)
+        cursor_path = os.path.join(self.directory, _CURSOR_FILE)
+        if os.path.exists(cursor_path):
+            with open(cursor_path) as f:
+                seq, offset = (int(part) for part in f.read().split())
+            if seq >= self._segments[0].seq:
+                self._cursor = (seq, offset)
+        self._persisted = self._cursor
+        logger.info(f"[Spool] Opened {self.directory}: {len(self._segments)} segment(s), cursor={self._cursor}")
+
+    async def adopt_orphans(self):
+        """Gộp các spool mồ côi được đăng ký lúc open_spool (SpoolReplayer gọi khi bắt đầu chạy)."""
+        while self._orphans:
+            path = self._orphans.pop(0)
+            try:
+                await self.adopt(path)
+            except Exception as e:
+                logger.warning("[Spool] Failed to adopt orphaned spool %s: %s", path, e)
+
+    async def adopt(self, directory: str, batch: int = 1000) -> int:
+        """
+        Chuyển record chưa replay của spool ở `directory` (vd của worker không còn tồn tại)
+        vào spool này rồi xoá spool đó. Record đi qua append() (group commit trong thread) nên
+        được ghi bền trước khi xoá: crash giữa chừng chỉ làm record bị replay lặp.
+        """
+        if os.path.abspath(directory) == os.path.abspath(self.directory) or not os.path.isdir(directory):
+            return 0
+        if not any(name.endswith(_SEGMENT_SUFFIX) for name in os.listdir(directory)):
+            return 0
+        other = await asyncio.to_thread(DurableSpool, directory, self.segment_bytes)
+        moved = 0
+        try:
+            position = None
+            while True:
+                records = await asyncio.to_thread(other.read, batch, position)
+                if not records:
+                    break
+                await asyncio.gather(*(self.append(payload) for _, payload in records))
+                position = records[-1][0]
+                moved += len(records)
+        finally:
+            with other._lock:
+                segments, other._segments = other._segments, []
+            for segment in segments:
+                segment.close()
+        await asyncio.to_thread(_remove_spool_dir, directory)
+        logger.warning(f"[Spool] Adopted {moved} record(s) from orphaned spool {directory} into {self.directory}")
+        return moved
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:020d}{_SEGMENT_SUFFIX}")
+
+    def _new_segment(self, seq: int, size: int) -> _Segment:
+        segment = _Segment(self._segment_path(seq), seq, size, create=True)
+        _fsync_dir(self.directory)  # entry của segment mới phải bền trước khi record trong nó được xác nhận
+        return segment
+
+    # -------------------------------
+    # Append (group commit)
+    # -------------------------------
+    async def append(self, payload: bytes):
+        """Ghi payload vào spool; trả về khi payload đã được msync xuống đĩa."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_loop())
+        await asyncio.shield(future)
+
+    async def _commit_loop(self):
+        while self._pending:
+            if self.commit_linger:
+                await asyncio.sleep(self.commit_linger)
+            group, self._pending = self._pending, []
+            try:
+                committed = await asyncio.to_thread(self._write_group, [payload for payload, _ in group])
+            except Exception as e:
+                logger.warning("[Spool] Commit of %d record(s) failed: %s", len(group), e)
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._committed = committed
+            self._notify()
+            for _, future in group:
+                if not future.done():
+                    future.set_result(None)
+
+    def _write_group(self, payloads: List[bytes]) -> SpoolPosition:
+        """
+        Chạy trong thread: ghi cả nhóm vào mmap rồi msync một lần cho mỗi segment đã chạm.
+        Lỗi (msync, hết chỗ khi rotate) -> huỷ cả nhóm: quay write offset về vị trí trước nhóm,
+        bỏ segment vừa rotate, xoá header đầu vùng đã ghi để recovery không nhận record lỗi.
+        """
+        first = segment = self._segments[-1]
+        start = dirty_from = self._write_offset
+        try:
+            for payload in payloads:
+                needed = _HEADER.size + len(payload)
+                if self._write_offset + needed > segment.size:
+                    self._flush(segment, dirty_from, self._write_offset)
+                    segment = self._rotate(needed)
+                    dirty_from = 0
+                _HEADER.pack_into(segment.map, self._write_offset, len(payload), zlib.crc32(payload))
+                segment.map[self._write_offset + _HEADER.size:self._write_offset + needed] = payload
+                self._write_offset += needed
+            self._flush(segment, dirty_from, self._write_offset)
+        except Exception:
+            self._rollback(first, start)
+            raise
+        return segment.seq, self._write_offset
+
+    def _rollback(self, segment: _Segment, offset: int):
+        with self._lock:
+            rotated = [s for s in self._segments if s.seq > segment.seq]
+            self._segments = [s for s in self._segments if s.seq <= segment.seq]
+        for stale in rotated:
+            stale.close()
+            os.remove(stale.path)
+        self._write_offset = offset
+        if offset + _HEADER.size <= segment.size:
+            _HEADER.pack_into(segment.map, offset, 0, 0)
+            try:
+                self._flush(segment, offset, offset + _HEADER.size)
+            except OSError:
+                pass  # đĩa vẫn lỗi: record nửa vời sẽ bị scan_end() loại nếu CRC hỏng
+
+    def _flush(self, segment: _Segment, start: int, end: int):
+        if end <= start:
+            return
+        aligned = start - start % mmap.ALLOCATIONGRANULARITY
+        segment.map.flush(aligned, end - aligned)
+
+    def _rotate(self, needed: int) -> _Segment:
+        seq = self._segments[-1].seq + 1
+        segment = self._new_segment(seq, max(self.segment_bytes, needed))
+        with self._lock:
+            self._segments.append(segment)
+        self._write_offset = 0
+        return segment
+
+    def _notify(self):
+        if self._appended is not None:
+            self._appended.set()
+
+    # -------------------------------
+    # Read / advance
+    # -------------------------------
+    def has_backlog(self) -> bool:
+        return self._cursor != self._committed
+
+    async def wait_for_backlog(self, timeout: float):
+        """Chờ tới khi có record mới (hoặc hết timeout)."""
+        if self._appended is None:
+            self._appended = asyncio.Event()
+        if self.has_backlog():
+            return
+        self._appended.clear()
+        try:
+            await asyncio.wait_for(self._appended.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def read(self, max_records: int, start: Optional[SpoolPosition] = None) -> List[Tuple[SpoolPosition, bytes]]:
+        """
+        Đọc tối đa `max_records` record đã commit từ `start` (mặc định là cursor).
+        Mỗi phần tử là (vị trí ngay sau record, payload) để truyền vào advance().
+        """
+        seq, offset = start or self._cursor
+        committed_seq, committed_offset = self._committed
+        with self._lock:
+            segments = {segment.seq: segment for segment in self._segments}
+
+        records: List[Tuple[SpoolPosition, bytes]] = []
+        while len(records) < max_records and seq in segments:
+            segment = segments[seq]
+            limit = committed_offset if seq == committed_seq else segment.size
+            record = segment.read(offset, limit)
+            if record is None:
+                if seq >= committed_seq:
+                    break
+                seq, offset = seq + 1, 0  # hết segment cũ -> sang segment kế tiếp
+                continue
+            payload, offset = record
+            records.append(((seq, offset), payload))
+        return records
+
+    async def advance(self, position: SpoolPosition):
+        """Đánh dấu mọi record trước `position` đã xử lý xong; xoá segment cũ đã đọc hết."""
+        if position <= self._cursor:
+            return  # cursor chỉ tiến (nhiều replayer cùng spool khi hot-reload)
+        self._cursor = position
+        if self._cursor_lock is None:
+            self._cursor_lock = asyncio.Lock()
+        async with self._cursor_lock:
+            if self._persisted >= position:
+                return  # lần ghi trước đã ghi cursor mới hơn
+            position = self._cursor
+            await asyncio.to_thread(self._persist_cursor, position)
+            self._persisted = position
+
+    def _persist_cursor(self, position: SpoolPosition):
+        """Chạy trong thread: ghi bền cursor rồi xoá segment đã đọc hết."""
+        cursor_path = os.path.join(self.directory, _CURSOR_FILE)
+        tmp_path = cursor_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{position[0]} {position[1]}")
+            f.flush()
+            os.fsync(f.fileno())  # không fsync -> crash sau rename có thể để lại file cursor rỗng
+        os.replace(tmp_path, cursor_path)
+        _fsync_dir(self.directory)
+
+        with self._lock:
+            consumed = [s for s in self._segments[:-1] if s.seq < position[0]]
+            self._segments = [s for s in self._segments if s not in consumed]
+        for segment in consumed:
+            segment.close()
+            os.remove(segment.path)
+
+    async def close(self):
+        self._refs -= 1
+        if self._refs > 0:
+            return
+        _open_spools.pop(os.path.abspath(self.directory), None)
+        if self._commit_task is not None:
+            await asyncio.gather(self._commit_task, return_exceptions=True)
+        with self._lock:
+            segments, self._segments = self._segments, []
+        for segment in segments:
+            segment.close()
+
+
+# Spool đang mở theo thư mục: instance target mới (hot-reload) dùng chung spool với instance cũ
+_open_spools: Dict[str, DurableSpool] = {}
+
+
+def _remove_spool_dir(directory: str):
+    for name in os.listdir(directory):
+        if name.endswith(_SEGMENT_SUFFIX) or name.startswith(_CURSOR_FILE):
+            os.remove(os.path.join(directory, name))
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass  # thư mục gốc vẫn chứa thư mục của các worker
+
+
+def open_spool(directory: str, adopt: Iterable[str] = (), **kwargs) -> DurableSpool:
+    """
+    Mở (hoặc dùng lại) spool của thư mục; mỗi lần mở cần một close() tương ứng.
+    `adopt`: thư mục spool mồ côi được gộp vào khi mở lần đầu trong process; việc gộp chạy
+    trên event loop qua adopt_orphans() (xem DurableSpool.adopt).
+    """
+    key = os.path.abspath(directory)
+    spool = _open_spools.get(key)
+    if spool is None:
+        spool = _open_spools[key] = DurableSpool(directory, **kwargs)
+        spool._orphans.extend(adopt)
+    else:
+        spool._refs += 1
+    return spool
+
+
+# Spool mở trong process cha không dùng chung với worker fork ra (mỗi worker có thư mục riêng)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_open_spools.clear)
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from observer.targets.spool import DurableSpool
+
+logger = logging.getLogger(__name__)
+
+
+class SpoolReplayer:
+    """
+    Chạy nền, đọc lại spool và gửi lại từng record bằng `send(payload) -> bool`:
+    - Mỗi vòng đọc tối đa `concurrency` record và gửi song song (bounded concurrency).
+    - Cursor chỉ advance qua prefix liên tục đã gửi thành công; record lỗi phía sau
+      prefix sẽ được gửi lại ở vòng sau (at-least-once).
+    - Còn lỗi -> target chưa hồi phục, backoff lũy thừa tới `max_backoff_ms`.
+    """
+
+    def __init__(
+        self,
+        spool: DurableSpool,
+        send: Callable[[bytes], Awaitable[bool]],
+        concurrency: int = 8,
+        interval_ms: float = 1000,
+        max_backoff_ms: float = 30000,
+    ):
+        self.spool = spool
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        self.interval = interval_ms / 1000
+        self.max_backoff = max_backoff_ms / 1000
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        await self.spool.adopt_orphans()
+        backoff = self.interval
+        while True:
+            await self.spool.wait_for_backlog(self.interval)
+            if not self.spool.has_backlog():
+                continue
+            try:
+                replayed, ok = await self.replay_once()
+            except Exception as e:
+                logger.warning("[SpoolReplayer] Replay failed: %s", e)
+                replayed, ok = 0, False
+
+            if ok and replayed:
+                backoff = self.interval
+                continue
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def replay_once(self) -> tuple[int, bool]:
+        """Gửi lại một cửa sổ record; trả về (số record đã advance, cả cửa sổ có thành công không)."""
+        records = self.spool.read(self.concurrency)
+        if not records:
+            return 0, True
+
+        results = await asyncio.gather(*(self.send(payload) for _, payload in records), return_exceptions=True)
+        replayed = 0
+        for (position, _), result in zip(records, results):
+            if result is not True:
+                break
+            replayed += 1
+            last = position
+        if replayed:
+            await self.spool.advance(last)
+            logger.info("[SpoolReplayer] Replayed %d/%d spooled message(s)", replayed, len(records))
+        return replayed, replayed == len(records)
@@ -3,6 +3,7 @@ from .strategies import (
     ApiKeyAuthStrategy,
     BasicAuthStrategy,
     NoAuthStrategy,
+    OAuth2ClientCredentialsStrategy,
 )
 
 def build_auth_strategy(config: dict | None):
@@ -24,5 +25,16 @@ def build_auth_strategy(config: dict | None):
                 username=config.get("username", ""),
                 password=config.get("password", ""),
             )
+        case "oauth2_client_credentials":
+            # Dùng chung instance (token cache) cho mọi target cùng credentials
+            return OAuth2ClientCredentialsStrategy.shared(
+                token_url=config.get("token_url", ""),
+                client_id=config.get("client_id", ""),
+                client_secret=config.get("client_secret", ""),
+                scope=config.get("scope"),
+                audience=config.get("audience"),
+                client_auth=config.get("client_auth", "basic"),
+                refresh_margin=config.get("refresh_margin", 60.0),
+            )
         case _:
             return NoAuthStrategy()
\ No newline at end of file
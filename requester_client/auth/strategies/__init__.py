@@ -1,6 +1,8 @@
+from .auth_strategy import AuthError
 from .api_key_auth import APIKeyAuth as ApiKeyAuthStrategy
 from .basic_auth import BasicAuth as BasicAuthStrategy
 from .bearer_auth import BearerAuth as BearerAuthStrategy
 from .no_auth import  NoAuth as NoAuthStrategy
+from .oauth2_client_credentials import OAuth2ClientCredentialsAuth as OAuth2ClientCredentialsStrategy
 
-__all__ = ["ApiKeyAuthStrategy", "BasicAuthStrategy", "BearerAuthStrategy", "NoAuthStrategy"]
\ No newline at end of file
+__all__ = ["AuthError", "ApiKeyAuthStrategy", "BasicAuthStrategy", "BearerAuthStrategy", "NoAuthStrategy", "OAuth2ClientCredentialsStrategy"]
\ No newline at end of file
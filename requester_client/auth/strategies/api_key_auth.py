@@ -1,4 +1,4 @@
-from requester_client.auth.auth_strategy import AuthStrategy
+from requester_client.auth.strategies.auth_strategy import AuthStrategy
 
 class APIKeyAuth(AuthStrategy):
     def __init__(self, key: str, header_name: str = "X-API-Key"):
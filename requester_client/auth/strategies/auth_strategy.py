@@ -1,10 +1,30 @@
 from abc import ABC, abstractmethod
+from typing import Dict
+
+
+class AuthError(Exception):
+    """Không lấy được credential (vd: token endpoint lỗi); không phải lỗi của target đích."""
 
 
 class AuthStrategy(ABC):
     """Base class cho mọi loại authentication."""
 
+    # True: credential thay đổi theo thời gian (token ngắn hạn) -> client lấy header mỗi request
+    # qua auth_headers() thay vì chỉ apply() một lần vào headers lúc khởi tạo
+    dynamic: bool = False
+
     @abstractmethod
     def apply(self, headers: dict) -> dict:
         """Cập nhật headers với thông tin auth."""
         pass
+
+    async def auth_headers(self) -> Dict[str, str]:
+        """Header auth cho một request (chỉ dùng khi dynamic); raise AuthError nếu không lấy được."""
+        return {}
+
+    def auth_headers_sync(self) -> Dict[str, str]:
+        return {}
+
+    def invalidate(self, headers: Dict[str, str]):
+        """Server từ chối (401) credential trong `headers` -> bỏ để lần sau lấy mới."""
+        return None
@@ -1,4 +1,4 @@
-from requester_client.auth.auth_strategy import AuthStrategy
+from requester_client.auth.strategies.auth_strategy import AuthStrategy
 
 class BearerAuth(AuthStrategy):
     def __init__(self, token: str):
@@ -1,5 +1,5 @@
 
-from requester_client.auth.auth_strategy import AuthStrategy
+from requester_client.auth.strategies.auth_strategy import AuthStrategy
 
 class NoAuth(AuthStrategy):
     def apply(self, headers: dict) -> dict:
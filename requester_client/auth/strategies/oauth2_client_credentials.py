@@ -0,0 +1,218 @@
+import asyncio
+import base64
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from requester_client.auth.strategies.auth_strategy import AuthError, AuthStrategy
+from requester_client.transport_registry import (
+    ConnectionOptions,
+    SharedAsyncTransport,
+    SharedSyncTransport,
+    transport_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Token:
+    header: str  # giá trị Authorization, vd "Bearer abc"
+    expires_at: float  # time.monotonic()
+    refresh_at: float  # từ thời điểm này làm mới nền, vẫn dùng token hiện tại
+
+
+class OAuth2ClientCredentialsAuth(AuthStrategy):
+    """
+    OAuth2 client-credentials (RFC 6749 §4.4) cho token ngắn hạn:
+    - token cache trong bộ nhớ, dùng chung cho mọi client cùng credentials (xem shared())
+    - làm mới chủ động trước khi hết hạn `refresh_margin` giây: request vẫn dùng token cũ,
+      một task nền lấy token mới
+    - single-flight: mọi request cùng cần token chỉ gây ra một lần gọi token endpoint
+    - invalidate() sau 401 chỉ bỏ đúng token đã bị từ chối
+    - lỗi lấy token -> AuthError; trong `failure_backoff` giây sau đó request fail ngay,
+      không gọi lại token endpoint cho từng request
+    """
+
+    dynamic = True
+
+    _shared: Dict[Tuple, "OAuth2ClientCredentialsAuth"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: Optional[str] = None,
+        audience: Optional[str] = None,
+        client_auth: str = "basic",
+        refresh_margin: float = 60.0,
+        default_expires_in: float = 3600.0,
+        timeout: float = 10.0,
+        failure_backoff: float = 1.0,
+    ):
+        self.token_url = token_url
+        self.refresh_margin = refresh_margin
+        self.default_expires_in = default_expires_in
+        self.timeout = timeout
+        self.failure_backoff = failure_backoff
+
+        # Form / header của token request dựng một lần
+        form = {"grant_type": "client_credentials"}
+        if scope:
+            form["scope"] = scope
+        if audience:
+            form["audience"] = audience
+        self._headers = {"Accept": "application/json"}
+        if client_auth == "body":
+            form.update(client_id=client_id, client_secret=client_secret)
+        else:
+            # client_secret_basic: id/secret được form-urlencode trước khi base64 (RFC 6749 §2.3.1)
+            raw = f"{quote(client_id, safe='')}:{quote(client_secret, safe='')}".encode()
+            self._headers["Authorization"] = f"Basic {base64.b64encode(raw).decode()}"
+        self._form = form
+
+        self._token: Optional[_Token] = None
+        self._failure: Optional[Tuple[float, AuthError]] = None  # (fail fast tới, lỗi gần nhất)
+        self._inflight: Optional[asyncio.Future] = None
+        self._sync_lock = threading.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+
+    @classmethod
+    def shared(cls, **kwargs) -> "OAuth2ClientCredentialsAuth":
+        """Một instance (một token cache) cho mỗi bộ credentials trong process."""
+        key = tuple(sorted(kwargs.items()))
+        with cls._shared_lock:
+            strategy = cls._shared.get(key)
+            if strategy is None:
+                strategy = cls._shared[key] = cls(**kwargs)
+        return strategy
+
+    def apply(self, headers: dict) -> dict:
+        # Token gắn theo từng request qua auth_headers(), không bake vào headers tĩnh
+        return headers
+
+    # -------------------------------
+    # Async
+    # -------------------------------
+    async def auth_headers(self) -> Dict[str, str]:
+        token = self._token
+        now = time.monotonic()
+        if token is None or now >= token.expires_at:
+            self._check_backoff(now)
+            token = await asyncio.shield(self._refresh())
+        elif now >= token.refresh_at and not self._backing_off(now):
+            self._refresh()  # làm mới nền, request này vẫn dùng token hiện tại
+        return {"Authorization": token.header}
+
+    def invalidate(self, headers: Dict[str, str]):
+        token = self._token
+        if token is not None and headers.get("Authorization") == token.header:
+            self._token = None
+
+    def _refresh(self) -> asyncio.Future:
+        """Future lấy token; các lời gọi đồng thời dùng chung một future (single-flight)."""
+        future = self._inflight
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = self._inflight = asyncio.ensure_future(self._fetch())
+            future.add_done_callback(self._settle)
+        return future
+
+    def _settle(self, future: asyncio.Future):
+        if self._inflight is future:
+            self._inflight = None
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("[Auth] %s", future.exception())
+
+    async def _fetch(self) -> _Token:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=SharedAsyncTransport(transport_registry, ConnectionOptions()),
+                timeout=self.timeout,
+            )
+        started = time.monotonic()
+        try:
+            response = await self._client.post(self.token_url, data=self._form, headers=self._headers)
+            return self._store(response, started)
+        except Exception as e:
+            raise self._failed(e) from e
+
+    # -------------------------------
+    # Sync
+    # -------------------------------
+    def auth_headers_sync(self) -> Dict[str, str]:
+        with self._sync_lock:
+            token = self._token
+            now = time.monotonic()
+            expired = token is None or now >= token.expires_at
+            if expired:
+                self._check_backoff(now)
+            if expired or (now >= token.refresh_at and not self._backing_off(now)):
+                if self._sync_client is None:
+                    self._sync_client = httpx.Client(
+                        transport=SharedSyncTransport(transport_registry, ConnectionOptions()),
+                        timeout=self.timeout,
+                    )
+                try:
+                    response = self._sync_client.post(self.token_url, data=self._form, headers=self._headers)
+                    token = self._store(response, now)
+                except Exception as e:
+                    error = self._failed(e)
+                    if token is None or time.monotonic() >= token.expires_at:
+                        raise error from e
+                    logger.warning("[Auth] %s", error)  # làm mới sớm lỗi -> vẫn dùng token còn hạn
+        return {"Authorization": token.header}
+
+    # -------------------------------
+    # Lỗi token endpoint
+    # -------------------------------
+    def _failed(self, error: Exception) -> AuthError:
+        auth_error = AuthError(f"Failed to fetch OAuth2 token from {self.token_url}: {error}")
+        self._failure = (time.monotonic() + self.failure_backoff, auth_error)
+        return auth_error
+
+    def _backing_off(self, now: float) -> bool:
+        return self._failure is not None and now < self._failure[0]
+
+    def _check_backoff(self, now: float):
+        if self._backing_off(now):
+            raise AuthError(*self._failure[1].args)  # exception mới: không dồn traceback qua nhiều request
+
+    # -------------------------------
+    # Token response
+    # -------------------------------
+    def _store(self, response: httpx.Response, started: float) -> _Token:
+        response.raise_for_status()
+        data: Dict[str, Any] = response.json()
+        access_token = data.get("access_token")
+        if not access_token:
+            raise ValueError(f"Token response from {self.token_url} has no access_token")
+        token_type = data.get("token_type") or "Bearer"
+        if token_type.lower() == "bearer":
+            token_type = "Bearer"
+        expires_in = float(data.get("expires_in") or self.default_expires_in)
+        # Tính hạn từ lúc gửi request (thận trọng); token quá ngắn -> làm mới ở nửa vòng đời
+        margin = min(self.refresh_margin, expires_in / 2)
+        token = _Token(f"{token_type} {access_token}", started + expires_in, started + expires_in - margin)
+        self._token = token
+        self._failure = None
+        logger.debug("[Auth] Fetched OAuth2 token from %s (expires in %.0fs)", self.token_url, expires_in)
+        return token
+
+
+def _reset_after_fork():
+    # Token / future / client của process cha không dùng trong worker
+    OAuth2ClientCredentialsAuth._shared.clear()
+    OAuth2ClientCredentialsAuth._shared_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
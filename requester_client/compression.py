@@ -0,0 +1,96 @@
+import asyncio
+import gzip
+import logging
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd là tuỳ chọn
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+ZSTD_AVAILABLE = zstandard is not None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Nén body theo Content-Encoding: gzip | deflate | zstd."""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, -1 if level is None else level)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required for zstd compression")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(body)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def accept_encoding() -> str:
+    """Giá trị Accept-Encoding theo các decoder hiện có (httpx tự giải nén response)."""
+    return "gzip, deflate, zstd" if ZSTD_AVAILABLE else "gzip, deflate"
+
+
+@dataclass(frozen=True)
+class CompressionOptions:
+    encoding: str = "gzip"
+    level: Optional[int] = None
+    min_size: int = 1024
+    offload_size: int = 256 * 1024
+    accept_encoding: bool = True
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> Optional["CompressionOptions"]:
+        if not config:
+            return None
+        cfg = {k: v for k, v in config.items() if v is not None}
+        if cfg.get("encoding") == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("[Compression] zstd requested but 'zstandard' is not installed, falling back to gzip")
+            cfg["encoding"] = "gzip"
+        return cls(**cfg)
+
+
+# -------------------------------
+# Thread pool cho body lớn
+# -------------------------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    """Pool riêng cho nén (zlib/zstd nhả GIL), không chiếm default executor của loop."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="compress"
+                )
+    return _executor
+
+
+def _reset_pool():
+    """Thread của pool không tồn tại trong process con sau fork -> tạo pool mới khi cần."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+
+async def compress_async(
+    body: bytes, encoding: str, level: Optional[int] = None, offload_size: int = 256 * 1024
+) -> bytes:
+    """Body nhỏ nén ngay trên event loop; từ `offload_size` trở lên thì nén trong thread pool."""
+    if len(body) < offload_size:
+        return compress(body, encoding, level)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool(), compress, body, encoding, level)
@@ -1,22 +1,46 @@
 import httpx
 import asyncio
+import logging
 import time
+from collections import deque
 from io import BytesIO
-from typing import Optional, Any, Dict, Union, Callable
+from typing import Optional, Any, Dict, Iterable, Union, Callable
 
-from requester_client.utils.json_helper import get_nested_key
-from requester_client.auth.auth_strategy import AuthStrategy
-from requester_client.auth.no_auth import NoAuth
+from requester_client.utils.json_helper import JsonPath, compile_path
+from requester_client.utils.json_stream import iter_items
+from requester_client.utils import codec as json_codec
+from requester_client.auth.strategies.auth_strategy import AuthError, AuthStrategy
+from requester_client.auth.strategies.no_auth import NoAuth
 from requester_client.rate_limiter.base_rate_limiter import BaseRateLimiter
 from requester_client.rate_limiter.header_rate_limiter import HeaderRateLimiter
+from requester_client.resilience import CircuitBreaker, RetryBudget, circuit_breakers, full_jitter_backoff
+from requester_client.compression import CompressionOptions, accept_encoding, compress_async
+from requester_client.transport_registry import (
+    ConnectionOptions,
+    SharedAsyncTransport,
+    SharedSyncTransport,
+    transport_registry,
+)
+from telemetry.instruments import (
+    REQUEST_BYTES,
+    REQUEST_RETRIES,
+    REQUEST_SECONDS,
+    REQUESTS_IN_FLIGHT,
+)
+from telemetry.tracing import span
+
+logger = logging.getLogger(__name__)
 
 class DynamicHttpClient:
     """
     HTTP client động hỗ trợ:
-    - Auth (Bearer, Basic, API Key)
-    - Retry + backoff
-    - Rate limit header-based
+    - Auth (Bearer, Basic, API Key, OAuth2 client-credentials có cache / tự làm mới token)
+    - Retry + exponential backoff (full jitter), retry budget, circuit breaker theo origin
+    - Rate limit header-based / response-based và token-bucket chủ động ("fixed")
     - Pagination (next_page_key dạng nested hoặc callable)
+    - Connection pool dùng chung theo origin (transport_registry), HTTP/2 tuỳ chọn
+    - Nén request body (gzip/deflate/zstd) theo ngưỡng kích thước, Accept-Encoding
+    - Metric (latency, retry, in-flight, bytes) theo origin và span OpenTelemetry tuỳ chọn
     """
 
     def __init__(
@@ -27,7 +51,13 @@ class DynamicHttpClient:
         rate_limiter: Optional[BaseRateLimiter] = None,
         retry_count: int = 3,
         retry_backoff_factor: float = 0.5,
-        status_forcelist: Optional[list[int]] = None,
+        status_forcelist: Optional[Iterable[int]] = None,
+        connection: Optional[Dict[str, Any]] = None,
+        max_backoff: float = 30.0,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[Dict[str, Any]] = None,
+        compression: Optional[Dict[str, Any]] = None,
+        on_attempt: Optional[Callable[[str, float, Optional[int]], None]] = None,
     ):
         self.base_url = base_url
         self.headers = headers or {}
@@ -35,10 +65,42 @@ class DynamicHttpClient:
         self.rate_limiter = rate_limiter or HeaderRateLimiter()
         self.retry_count = retry_count
         self.retry_backoff_factor = retry_backoff_factor
-        self.status_forcelist = status_forcelist or [429, 500, 502, 503, 504]
+        # frozenset: tra cứu O(1) mỗi response
+        self.status_forcelist = frozenset(status_forcelist or (429, 500, 502, 503, 504))
+        self.max_backoff = max_backoff
+        self.retry_budget = retry_budget or RetryBudget()
+        self.circuit_breaker_cfg = circuit_breaker
+        self._breakers: Dict[tuple, CircuitBreaker] = {}  # (scheme, netloc) -> breaker, tránh tra registry mỗi request
+        # on_attempt(url, giây, status | None nếu lỗi kết nối): latency của từng lần gửi thô,
+        # không gồm chờ rate limit / backoff giữa các lần retry
+        self.on_attempt = on_attempt
+        # Số request_async trả về None (hết retry, breaker open, lỗi credential): caller như pagination
+        # dừng im lặng khi gặp trang lỗi, so sánh bộ đếm để biết lần duyệt có trọn vẹn không;
+        # request bị huỷ (trang thừa của cửa sổ pagination, prefetch) không tính
+        self.failed_requests = 0
+
+        self.connection_options = ConnectionOptions.from_config(connection)
+        self.compression = CompressionOptions.from_config(compression)
+        if self.compression and self.compression.accept_encoding:
+            self.headers = {**self.headers, "Accept-Encoding": accept_encoding()}
 
-        self.sync_client = httpx.Client(base_url=base_url, headers=self._auth_headers())
-        self.async_client = httpx.AsyncClient(base_url=base_url, headers=self._auth_headers())
+        self._sync_client: Optional[httpx.Client] = None
+        self.async_client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=self._auth_headers(),
+            transport=SharedAsyncTransport(transport_registry, self.connection_options),
+        )
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        """Sync client chỉ được tạo khi thực sự dùng tới."""
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                base_url=self.base_url,
+                headers=self._auth_headers(),
+                transport=SharedSyncTransport(transport_registry, self.connection_options),
+            )
+        return self._sync_client
 
     # -------------------------------
     # Internal Helpers
@@ -47,12 +109,77 @@ class DynamicHttpClient:
         """Áp dụng auth vào headers hiện tại."""
         return self.auth_strategy.apply(self.headers.copy())
 
-    def _extract_next_token(self, data: dict, next_page_key: Union[str, Callable[[dict], Any]]) -> Any:
+    def _origin(self, url: Union[str, httpx.URL]) -> str:
+        """Host dùng làm label metric (URL tương đối -> host của base_url)."""
+        if not isinstance(url, httpx.URL):
+            url = httpx.URL(url)
+        return url.host or self.async_client.base_url.host
+
+    def _breaker(self, url: httpx.URL) -> CircuitBreaker:
+        key = (url.scheme, url.netloc)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = circuit_breakers.get(url, self.circuit_breaker_cfg)
+        return breaker
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, status_code: int):
+        # 429 là throttle, không phải origin hỏng hay đã hồi phục -> không đổi trạng thái breaker
+        if status_code == 429:
+            breaker.record_ignored()
+        elif status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    async def _compress_body(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Nén `content` (bytes) một lần trước vòng retry; bỏ qua body nhỏ hoặc đã có Content-Encoding."""
+        options = self.compression
+        content = kwargs.get("content")
+        if options is None or not isinstance(content, (bytes, bytearray)) or len(content) < options.min_size:
+            return kwargs
+        headers = kwargs.get("headers") or {}
+        if "Content-Encoding" in headers:
+            return kwargs
+        body = await compress_async(bytes(content), options.encoding, options.level, options.offload_size)
+        return {**kwargs, "content": body, "headers": {**headers, "Content-Encoding": options.encoding}}
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """
+        Gửi một lần. Auth động (token ngắn hạn): gắn token hiện tại vào request;
+        401 -> bỏ token vừa bị từ chối, lấy token mới và gửi lại đúng một lần.
+        """
+        auth = self.auth_strategy
+        if not auth.dynamic:
+            return await self.async_client.send(request, stream=True)
+        credential = await auth.auth_headers()
+        request.headers.update(credential)
+        response = await self.async_client.send(request, stream=True)
+        if response.status_code != 401:
+            return response
+        await response.aclose()
+        auth.invalidate(credential)
+        logger.debug("[Auth] HTTP 401 from %s, retrying once with a fresh token", request.url.host)
+        request.headers.update(await auth.auth_headers())
+        return await self.async_client.send(request, stream=True)
+
+    def _backoff(self, attempt: int) -> float:
+        return full_jitter_backoff(attempt, self.retry_backoff_factor, self.max_backoff)
+
+    def _compile_next_page_key(self, next_page_key: Union[str, Callable[[dict], Any]]):
+        """Compile path của next_page_key một lần cho cả vòng pagination."""
+        if isinstance(next_page_key, str):
+            return compile_path(next_page_key)
+        return next_page_key
+
+    def _extract_next_token(self, data: dict, next_page_key: Union[str, JsonPath, Callable[[dict], Any]]) -> Any:
         """Lấy token/trang tiếp theo từ data."""
-        if callable(next_page_key):
+        if isinstance(next_page_key, JsonPath):
+            return next_page_key.get(data)
+        elif callable(next_page_key):
             return next_page_key(data)
         elif isinstance(next_page_key, str):
-            return get_nested_key(data, next_page_key)
+            return compile_path(next_page_key).get(data)
         return None
 
     # -------------------------------
@@ -61,38 +188,132 @@ class DynamicHttpClient:
     def request_sync(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
         for attempt in range(1, self.retry_count + 1):
             try:
-                response = self.sync_client.request(method, url, **kwargs)
+                response = self._request_sync_once(method, url, kwargs)
                 if response.status_code in self.status_forcelist:
-                    print(f"[Retry] Attempt {attempt}: HTTP {response.status_code}")
+                    logger.debug("[Retry] Attempt %d: HTTP %d", attempt, response.status_code)
                     if response.status_code == 429:
-                        asyncio.run(self.rate_limiter.handle_rate_limit(response))
-                    time.sleep(self.retry_backoff_factor * attempt)
+                        self.rate_limiter.handle_rate_limit_sync(response)
+                    time.sleep(self._backoff(attempt))
                     continue
                 response.raise_for_status()
                 return response
             except httpx.RequestError as e:
-                print(f"[Error] Request failed: {e}")
-                time.sleep(self.retry_backoff_factor * attempt)
+                logger.warning("[Error] Request failed: %s", e)
+                time.sleep(self._backoff(attempt))
+            except AuthError as e:
+                logger.debug("[Auth] No credential, failing request to %s: %s", url, e)
+                return None
         return None
 
+    def _request_sync_once(self, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        auth = self.auth_strategy
+        if not auth.dynamic:
+            return self.sync_client.request(method, url, **kwargs)
+        credential = auth.auth_headers_sync()
+        headers = {**(kwargs.get("headers") or {}), **credential}
+        response = self.sync_client.request(method, url, **{**kwargs, "headers": headers})
+        if response.status_code != 401:
+            return response
+        response.close()
+        auth.invalidate(credential)
+        headers.update(auth.auth_headers_sync())
+        return self.sync_client.request(method, url, **{**kwargs, "headers": headers})
+
     # -------------------------------
     # Core Async Request
     # -------------------------------
-    async def request_async(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+    async def request_async(
+        self, method: str, url: str, *, stream: bool = False, **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Gửi request có retry. Body được đọc dạng stream:
+        - response retry (vd: 429) chỉ đọc phần body rate limiter cần rồi đóng
+        - stream=True: trả về response chưa đọc body, caller phải `await response.aclose()`
+        Circuit breaker của origin đang open hoặc hết retry budget -> trả về None ngay (fail fast).
+        """
+        origin = self._origin(url)
+        in_flight = REQUESTS_IN_FLIGHT.labels(origin)
+        in_flight.inc()
+        started = time.monotonic()
+        response = None
+        cancelled = False
+        try:
+            with span("http.request", {"http.request.method": method, "server.address": origin}) as trace_span:
+                response = await self._request_with_retry(method, url, origin, stream, kwargs)
+                if trace_span is not None and response is not None:
+                    trace_span.set_attribute("http.response.status_code", response.status_code)
+            return response
+        except asyncio.CancelledError:
+            # Trang thừa của cửa sổ pagination / prefetch bị huỷ khi duyệt xong: không phải lỗi
+            cancelled = True
+            raise
+        finally:
+            in_flight.dec()
+            # Hedge thua / trang pagination thừa bị huỷ là bình thường: tách riêng khỏi "failed"
+            outcome = "ok" if response is not None else "cancelled" if cancelled else "failed"
+            if outcome == "failed":
+                self.failed_requests += 1
+            REQUEST_SECONDS.labels(origin, outcome).observe(time.monotonic() - started)
+
+    async def _request_with_retry(
+        self, method: str, url: str, origin: str, stream: bool, kwargs: Dict[str, Any]
+    ) -> Optional[httpx.Response]:
+        self.retry_budget.record_request()
+        kwargs = await self._compress_body(kwargs)
+        content = kwargs.get("content")
+        body_size = len(content) if isinstance(content, (bytes, bytearray)) else 0
         for attempt in range(1, self.retry_count + 1):
+            if attempt > 1 and not self.retry_budget.try_acquire_retry():
+                logger.warning("[Retry] Retry budget exhausted, giving up on %s", url)
+                return None
+            request = self.async_client.build_request(method, url, **kwargs)
+            breaker = self._breaker(request.url)
+            if not breaker.allow_request():
+                logger.debug("[CircuitBreaker] %s is open, failing fast", breaker.name)
+                return None
+
+            sent = None
             try:
-                response = await self.async_client.request(method, url, **kwargs)
+                await self.rate_limiter.acquire()
+                if body_size:
+                    REQUEST_BYTES.labels(origin).inc(body_size)
+                sent = time.monotonic()
+                response = await self._send(request)
+                if self.on_attempt is not None:
+                    self.on_attempt(url, time.monotonic() - sent, response.status_code)
                 if response.status_code in self.status_forcelist:
-                    print(f"[Retry] Attempt {attempt}: HTTP {response.status_code}")
-                    if response.status_code == 429:
-                        await self.rate_limiter.handle_rate_limit(response)
-                    await asyncio.sleep(self.retry_backoff_factor * attempt)
+                    logger.debug("[Retry] Attempt %d: HTTP %d", attempt, response.status_code)
+                    REQUEST_RETRIES.labels(origin, str(response.status_code)).inc()
+                    self._record_outcome(breaker, response.status_code)
+                    try:
+                        if response.status_code == 429:
+                            await self.rate_limiter.handle_rate_limit(response)
+                    finally:
+                        await response.aclose()
+                    await asyncio.sleep(self._backoff(attempt))
                     continue
+
+                self._record_outcome(breaker, response.status_code)
+                if not stream or response.is_error:
+                    try:
+                        await response.aread()
+                    finally:
+                        await response.aclose()
                 response.raise_for_status()
                 return response
+            except AuthError as e:
+                # Lỗi lấy credential không phải lỗi của target: không tính vào breaker, không retry
+                # (strategy đã log lỗi một lần cho cả nhóm request chờ chung)
+                breaker.record_ignored()
+                logger.debug("[Auth] No credential, failing request to %s: %s", url, e)
+                return None
             except httpx.RequestError as e:
-                print(f"[Error] Request failed: {e}")
-                await asyncio.sleep(self.retry_backoff_factor * attempt)
+                logger.warning("[Error] Request failed: %s", e)
+                REQUEST_RETRIES.labels(origin, "error").inc()
+                breaker.record_failure()
+                if self.on_attempt is not None and sent is not None:
+                    self.on_attempt(url, time.monotonic() - sent, None)
+                await asyncio.sleep(self._backoff(attempt))
         return None
 
     # -------------------------------
@@ -106,8 +327,11 @@ class DynamicHttpClient:
         next_page_key: Union[str, Callable[[dict], Any]] = "next",
         extract_items: Optional[Callable[[dict], list]] = None,
         page_token_param: str = "page_token",
+        items_path: str = "results",
     ):
+        """Duyệt các trang theo next token, yield list item của từng trang."""
         params = params or {}
+        next_page_key = self._compile_next_page_key(next_page_key)
         next_token = None
         while True:
             if next_token:
@@ -115,13 +339,194 @@ class DynamicHttpClient:
             resp = await self.request_async(method, endpoint, params=params)
             if not resp:
                 break
-            data = resp.json()
-            items = extract_items(data) if extract_items else data.get("results", [])
+            data = json_codec.loads(resp.content)
+            items = self._page_items(data, extract_items, items_path)
             yield items
             next_token = self._extract_next_token(data, next_page_key)
             if not next_token:
                 break
 
+    async def iter_items_async(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        next_page_key: str = "next",
+        page_token_param: str = "page_token",
+        items_path: str = "results",
+    ):
+        """
+        Như paginate_async nhưng yield từng item (không phải list theo trang): body được parse
+        dạng stream, item được yield ngay khi parse xong nên bộ nhớ không tăng theo kích thước trang.
+        next_page_key phải là key path (không nhận callable vì không có cả trang trong bộ nhớ).
+        """
+        next_path = self._compile_next_page_key(next_page_key)
+        if not isinstance(next_path, JsonPath):
+            raise ValueError("iter_items_async requires next_page_key to be a key path")
+
+        params = params or {}
+        next_token = None
+        while True:
+            if next_token:
+                params[page_token_param] = next_token
+            resp = await self.request_async(method, endpoint, params=params, stream=True)
+            if not resp:
+                break
+            captured: dict = {}
+            try:
+                async for item in iter_items(resp.aiter_bytes(), items_path, [next_path], captured):
+                    yield item
+            finally:
+                await resp.aclose()
+            next_token = next_path.get(captured)
+            if not next_token:
+                break
+
+    async def paginate_prefetch_async(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        next_page_key: Union[str, Callable[[dict], Any]] = "next",
+        extract_items: Optional[Callable[[dict], list]] = None,
+        page_token_param: str = "page_token",
+        items_path: str = "results",
+    ):
+        """
+        Pagination theo cursor có prefetch: ngay khi biết next token thì gửi request
+        trang kế tiếp, trong lúc caller còn đang xử lý trang hiện tại.
+        """
+        params = params or {}
+        next_page_key = self._compile_next_page_key(next_page_key)
+
+        def fetch(token: Any) -> asyncio.Task:
+            page_params = {**params, page_token_param: token} if token else dict(params)
+            return asyncio.create_task(self._fetch_page(method, endpoint, page_params))
+
+        task: Optional[asyncio.Task] = fetch(None)
+        try:
+            while task is not None:
+                data = await task
+                task = None
+                if data is None:
+                    break
+                next_token = self._extract_next_token(data, next_page_key)
+                if next_token:
+                    task = fetch(next_token)
+                yield self._page_items(data, extract_items, items_path)
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def paginate_pages_async(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        page_param: str = "page",
+        page_size_param: str = "page_size",
+        page_size: int = 100,
+        start: int = 1,
+        step: int = 1,
+        concurrency: int = 4,
+        max_pages: Optional[int] = None,
+        extract_items: Optional[Callable[[dict], list]] = None,
+        items_path: str = "results",
+        total_path: Optional[str] = None,
+        has_more_path: Optional[str] = None,
+    ):
+        """
+        Pagination theo page number / offset: fetch tối đa `concurrency` trang song song
+        (cửa sổ trượt), yield theo đúng thứ tự trang. Dừng khi gặp trang lỗi, trang rỗng,
+        hoặc theo chỉ báo của API nếu có: `total_path` (tổng số item) / `has_more_path` (còn trang sau).
+        Trang ngắn hơn page_size không dùng làm điểm dừng (nhiều API trả thiếu hoặc cap page_size).
+        Offset mode: page_param="offset", start=0, step=page_size.
+        """
+        params = params or {}
+        total_getter = compile_path(total_path) if total_path else None
+        has_more_getter = compile_path(has_more_path) if has_more_path else None
+        pending: deque[asyncio.Task] = deque()
+        scheduled = 0
+        limit = max_pages  # số trang tối đa; thu hẹp khi biết tổng số item
+
+        def schedule():
+            nonlocal scheduled
+            while len(pending) < concurrency and (limit is None or scheduled < limit):
+                page_params = {**params, page_param: start + scheduled * step, page_size_param: page_size}
+                pending.append(asyncio.create_task(self._fetch_page(method, endpoint, page_params)))
+                scheduled += 1
+
+        try:
+            schedule()
+            fetched = 0
+            while pending:
+                data = await pending.popleft()
+                fetched += 1
+                if data is None:
+                    break
+                items = self._page_items(data, extract_items, items_path)
+                if not items:
+                    break
+                yield items
+                if has_more_getter is not None and not has_more_getter.get(data):
+                    break
+                total = total_getter.get(data) if total_getter is not None else None
+                if isinstance(total, int):
+                    pages = -(-total // page_size)
+                    limit = pages if limit is None else min(limit, pages)
+                    if fetched >= limit:
+                        break
+                schedule()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def paginate_from_config(self, endpoint: str, pagination: dict | None, params: Optional[Dict[str, Any]] = None):
+        """Chọn chiến lược pagination theo config (DataSourceItem.pagination)."""
+        cfg = pagination or {}
+        mode = cfg.get("mode", "cursor")
+        items_path = cfg.get("items_path", "results")
+
+        if mode == "cursor":
+            paginate = self.paginate_prefetch_async if cfg.get("prefetch", True) else self.paginate_async
+            return paginate(
+                endpoint,
+                method=cfg.get("method", "GET"),
+                params=params,
+                next_page_key=cfg.get("next_page_key", "next"),
+                page_token_param=cfg.get("page_token_param", "page_token"),
+                items_path=items_path,
+            )
+        elif mode in ("page", "offset"):
+            by_page = mode == "page"
+            page_size = cfg.get("page_size", 100)
+            start = cfg.get("start")
+            return self.paginate_pages_async(
+                endpoint,
+                method=cfg.get("method", "GET"),
+                params=params,
+                page_param=cfg.get("page_param") or ("page" if by_page else "offset"),
+                page_size_param=cfg.get("page_size_param") or ("page_size" if by_page else "limit"),
+                page_size=page_size,
+                start=start if start is not None else (1 if by_page else 0),
+                step=1 if by_page else page_size,
+                concurrency=cfg.get("concurrency", 4),
+                max_pages=cfg.get("max_pages"),
+                items_path=items_path,
+                total_path=cfg.get("total_path"),
+                has_more_path=cfg.get("has_more_path"),
+            )
+        raise ValueError(f"Unknown pagination mode: {mode}")
+
+    async def _fetch_page(self, method: str, endpoint: str, params: Dict[str, Any]) -> Optional[dict]:
+        resp = await self.request_async(method, endpoint, params=params)
+        return json_codec.loads(resp.content) if resp else None
+
+    def _page_items(self, data: dict, extract_items: Optional[Callable[[dict], list]], items_path: str) -> list:
+        if extract_items:
+            return extract_items(data)
+        return compile_path(items_path).get(data) or []
+
     def paginate_sync(
         self,
         endpoint: str,
@@ -132,6 +537,7 @@ class DynamicHttpClient:
         page_token_param: str = "page_token",
     ):
         params = params or {}
+        next_page_key = self._compile_next_page_key(next_page_key)
         next_token = None
         while True:
             if next_token:
@@ -139,7 +545,7 @@ class DynamicHttpClient:
             resp = self.request_sync(method, endpoint, params=params)
             if not resp:
                 break
-            data = resp.json()
+            data = json_codec.loads(resp.content)
             items = extract_items(data) if extract_items else data.get("results", [])
             yield items
             next_token = self._extract_next_token(data, next_page_key)
@@ -165,7 +571,8 @@ class DynamicHttpClient:
     # Context Manager
     # -------------------------------
     def close(self):
-        self.sync_client.close()
+        if self._sync_client is not None:
+            self._sync_client.close()
 
     async def aclose(self):
         await self.async_client.aclose()
@@ -1,10 +1,66 @@
+import asyncio
+import time
 import httpx
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Optional
+
+from requester_client.rate_limiter.state_backend import RateLimitStateBackend
+
+# True khi handle_rate_limit chạy trên event loop tạm của client sync (asyncio.run)
+_sync_bridge: ContextVar[bool] = ContextVar("rate_limit_sync_bridge", default=False)
 
 
 class BaseRateLimiter(ABC):
-    """Base class cho rate limiter."""
+    """
+    Base class cho rate limiter.
+    Nếu gắn `state` (attach_state), thời gian throttle học được từ 429 được chia sẻ
+    với mọi limiter khác cùng key (client khác, worker khác, node khác).
+    """
+
+    state: Optional[RateLimitStateBackend] = None
+    state_key: str = "default"
+
+    def attach_state(self, state: RateLimitStateBackend, key: str):
+        self.state = state
+        self.state_key = key
+
+    async def acquire(self):
+        """Chờ tới lượt trước khi gửi request (mặc định: chỉ chờ throttle dùng chung)."""
+        await self._wait_shared()
 
     @abstractmethod
     async def handle_rate_limit(self, response: httpx.Response):
-        pass
\ No newline at end of file
+        pass
+
+    def handle_rate_limit_sync(self, response: httpx.Response):
+        """
+        Cho client sync: chạy handle_rate_limit trên một event loop tạm.
+        State backend gắn với event loop của app (Redis) không được dùng từ loop tạm này.
+        """
+        token = _sync_bridge.set(True)
+        try:
+            asyncio.run(self.handle_rate_limit(response))
+        finally:
+            _sync_bridge.reset(token)
+
+    def _shared_state(self) -> Optional[RateLimitStateBackend]:
+        state = self.state
+        if state is not None and state.loop_bound and _sync_bridge.get():
+            return None
+        return state
+
+    async def _wait_shared(self):
+        """Chờ nếu một limiter khác cùng key đang bị throttle."""
+        state = self._shared_state()
+        if state is None:
+            return
+        delay = await state.blocked_until(self.state_key) - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _publish(self, wait_time: float):
+        """Chia sẻ thời gian throttle vừa học được."""
+        state = self._shared_state()
+        if state is not None and wait_time > 0:
+            await state.block_until(self.state_key, time.time() + wait_time)
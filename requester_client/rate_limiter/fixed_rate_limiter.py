@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+import httpx
+from requester_client.rate_limiter.base_rate_limiter import BaseRateLimiter
+from requester_client.rate_limiter.header_rate_limiter import HeaderRateLimiter
+from requester_client.rate_limiter.response_rate_limiter import ResponseRateLimiter
+from telemetry.instruments import RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class FixedRateLimiter(BaseRateLimiter):
+    """
+    RateLimiter chủ động theo GCRA (tương đương token bucket):
+    - Giới hạn `rate` request/giây, cho phép dồn tối đa `burst` request liền nhau.
+    - Mỗi acquire() đặt trước một slot ngay khi được gọi, nên các coroutine
+      chạy đồng thời (asyncio.gather) được phục vụ công bằng theo thứ tự FIFO.
+    - Sau 429 vẫn học từ Retry-After / reset (header hoặc JSON) và đẩy lùi cả bucket.
+    """
+
+    def __init__(self, config: dict | None = None):
+        super().__init__()
+        cfg = config or {}
+
+        if not cfg.get("rate"):
+            logger.warning("[RateLimit] 'rate' not set for fixed policy, defaulting to 10 req/s")
+        self.rate = float(cfg.get("rate") or 10.0)
+        self.burst = max(1, int(cfg.get("burst") or 1))
+        self.default_wait = cfg.get("default_wait", 0.5)
+        self.max_wait = cfg.get("max_wait", 60)
+
+        self._interval = 1.0 / self.rate
+        self._tolerance = self._interval * (self.burst - 1)
+        self._tat = 0.0  # theoretical arrival time (time.monotonic)
+
+        # Tái sử dụng logic đọc hint của 2 strategy còn lại
+        self._header_hints = HeaderRateLimiter(cfg)
+        self._response_hints = ResponseRateLimiter(cfg)
+
+    async def acquire(self):
+        """Chờ throttle dùng chung (nếu có) rồi tới slot đã đặt trước cho request này."""
+        await self._wait_shared()
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def _reserve(self) -> float:
+        """Đặt slot kế tiếp (không có await nên atomic trong event loop)."""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self._interval
+        return max(0.0, tat - self._tolerance - now)
+
+    async def handle_rate_limit(self, response: httpx.Response):
+        """Đẩy lùi bucket theo hint của server; acquire() kế tiếp sẽ tự chờ."""
+        data = await self._response_hints._load_hints(response)
+        wait_time = self._determine_wait_time(response, data)
+        blocked_until = time.monotonic() + wait_time
+        self._tat = max(self._tat, blocked_until + self._tolerance)
+        await self._publish(wait_time)
+        RATE_LIMIT_WAIT.labels("fixed").inc(wait_time)
+        logger.debug("[RateLimit] Throttled, pausing bucket for %.2fs (fixed policy)...", wait_time)
+
+    def _determine_wait_time(self, response: httpx.Response, data: dict) -> float:
+        now = time.time()
+        headers = response.headers
+
+        wait_time = (
+            self._header_hints._extract_retry_after(headers)
+            or self._header_hints._extract_reset_timestamp(headers, now)
+            or self._response_hints._extract_retry_after(data)
+            or self._response_hints._extract_reset_timestamp(data, now)
+            or self.default_wait
+        )
+
+        return min(wait_time, self.max_wait)
@@ -1,7 +1,11 @@
 import asyncio
+import logging
 import time
 import httpx
 from requester_client.rate_limiter.base_rate_limiter import BaseRateLimiter
+from telemetry.instruments import RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
 
 
 class HeaderRateLimiter(BaseRateLimiter):
@@ -26,6 +30,7 @@ class HeaderRateLimiter(BaseRateLimiter):
     async def handle_rate_limit(self, response: httpx.Response):
         """Main entry: handle rate-limit based on configured headers."""
         wait_time = self._determine_wait_time(response.headers)
+        await self._publish(wait_time)
         await self._sleep(wait_time)
 
     def _determine_wait_time(self, headers: dict) -> float:
@@ -75,6 +80,7 @@ class HeaderRateLimiter(BaseRateLimiter):
         return None
 
     async def _sleep(self, wait_time: float):
-        """Sleep và log ra console."""
-        print(f"[RateLimit] Waiting {wait_time:.2f}s (dynamic header policy)...")
+        """Sleep, ghi metric thời gian chờ và log."""
+        RATE_LIMIT_WAIT.labels("header").inc(wait_time)
+        logger.debug("[RateLimit] Waiting %.2fs (dynamic header policy)...", wait_time)
         await asyncio.sleep(wait_time)
@@ -0,0 +1,44 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+
+class InMemoryRedis:
+    """
+    Redis giả lập trong process (dùng cho test / benchmark), chỉ đủ cho RedisStateBackend:
+    get / set(px=...) / delete, value trả về dạng bytes như redis-py, key tự hết hạn.
+    `latency` mô phỏng round-trip mạng cho mỗi lệnh.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.data: Dict[str, Tuple[bytes, Optional[float]]] = {}  # key -> (value, hạn monotonic)
+        self.commands = 0
+
+    async def _round_trip(self):
+        self.commands += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def get(self, name: str) -> Optional[bytes]:
+        await self._round_trip()
+        entry = self.data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[name]
+            return None
+        return value
+
+    async def set(self, name: str, value, px: Optional[int] = None) -> bool:
+        await self._round_trip()
+        if not isinstance(value, bytes):
+            value = str(value).encode()
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.data[name] = (value, expires_at)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        await self._round_trip()
+        return sum(self.data.pop(name, None) is not None for name in names)
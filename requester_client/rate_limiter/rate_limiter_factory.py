@@ -1,17 +1,35 @@
+import logging
+
 from requester_client.rate_limiter.header_rate_limiter import HeaderRateLimiter
 from requester_client.rate_limiter.response_rate_limiter import ResponseRateLimiter
+from requester_client.rate_limiter.fixed_rate_limiter import FixedRateLimiter
 from requester_client.rate_limiter.base_rate_limiter import BaseRateLimiter
+from requester_client.rate_limiter.state_backend import get_state_backend
+
+logger = logging.getLogger(__name__)
+
 
-def create_rate_limiter(config: dict | None) -> BaseRateLimiter | None:
+def create_rate_limiter(config: dict | None, key: str | None = None) -> BaseRateLimiter | None:
+    """`key`: key trạng thái throttle dùng chung khi cấu hình `state` (mặc định tên target)."""
     if not config:
         return None
 
+    limiter = _build(config)
+    state_cfg = config.get("state")
+    if limiter is not None and state_cfg:
+        limiter.attach_state(get_state_backend(state_cfg), state_cfg.get("key") or key or "default")
+    return limiter
+
+
+def _build(config: dict) -> BaseRateLimiter | None:
     strategy = config.get("strategy", "header").lower()
 
     if strategy == "header":
         return HeaderRateLimiter(config)
     elif strategy == "response":
         return ResponseRateLimiter(config)
+    elif strategy == "fixed":
+        return FixedRateLimiter(config)
     else:
-        print(f"[WARN] Unknown rate-limit strategy: {strategy}")
-        return None
\ No newline at end of file
+        logger.warning(f"[RateLimit] Unknown rate-limit strategy: {strategy}")
+        return None
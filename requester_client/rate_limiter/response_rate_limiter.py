@@ -1,8 +1,14 @@
 import asyncio
+import logging
 import time
 import httpx
 from requester_client.rate_limiter.base_rate_limiter import BaseRateLimiter
-from requester_client.utils.json_helper import get_nested_key
+from requester_client.utils.json_helper import compile_path
+from requester_client.utils.json_stream import extract_paths
+from requester_client.utils import codec as json_codec
+from telemetry.instruments import RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
 
 
 class ResponseRateLimiter(BaseRateLimiter):
@@ -19,16 +25,20 @@ class ResponseRateLimiter(BaseRateLimiter):
         fields = cfg.get("json_fields", {})
         self.retry_keys = fields.get("retry_after", ["retry_after"])
         self.reset_keys = fields.get("reset", ["rate_limit_reset"])
+        # compile path một lần, dùng lại cho mọi response 429
+        self.retry_paths = [compile_path(p) for p in self.retry_keys]
+        self.reset_paths = [compile_path(p) for p in self.reset_keys]
 
         self.default_wait = cfg.get("default_wait", 0.5)
         self.max_wait = cfg.get("max_wait", 60)
 
     async def handle_rate_limit(self, response: httpx.Response):
-        wait_time = self._determine_wait_time(response)
+        data = await self._load_hints(response)
+        wait_time = self._determine_wait_time(data)
+        await self._publish(wait_time)
         await self._sleep(wait_time)
 
-    def _determine_wait_time(self, response: httpx.Response) -> float:
-        data = self._parse_json(response)
+    def _determine_wait_time(self, data: dict) -> float:
         now = time.time()
 
         wait_time = (
@@ -39,15 +49,27 @@ class ResponseRateLimiter(BaseRateLimiter):
 
         return min(wait_time, self.max_wait)
 
+    async def _load_hints(self, response: httpx.Response) -> dict:
+        """
+        Lấy các field rate-limit từ body.
+        Response chưa đọc (stream) -> chỉ parse tới khi thấy đủ các path cấu hình rồi dừng.
+        """
+        if response.is_stream_consumed:
+            return self._parse_json(response)
+        try:
+            return await extract_paths(response.aiter_bytes(), self.retry_paths + self.reset_paths)
+        except Exception:
+            return {}
+
     def _parse_json(self, response: httpx.Response) -> dict:
         try:
-            return response.json()
+            return json_codec.loads(response.content)
         except Exception:
             return {}
 
     def _extract_retry_after(self, data: dict) -> float | None:
-        for path in self.retry_keys:
-            val = get_nested_key(data, path)
+        for path in self.retry_paths:
+            val = path.get(data)
             if val is not None:
                 try:
                     return float(val)
@@ -56,8 +78,8 @@ class ResponseRateLimiter(BaseRateLimiter):
         return None
 
     def _extract_reset_timestamp(self, data: dict, now: float) -> float | None:
-        for path in self.reset_keys:
-            val = get_nested_key(data, path)
+        for path in self.reset_paths:
+            val = path.get(data)
             if val is not None:
                 try:
                     reset_ts = float(val)
@@ -67,5 +89,6 @@ class ResponseRateLimiter(BaseRateLimiter):
         return None
 
     async def _sleep(self, wait_time: float):
-        print(f"[RateLimit] Waiting {wait_time:.2f}s (response JSON policy)...")
+        RATE_LIMIT_WAIT.labels("response").inc(wait_time)
+        logger.debug("[RateLimit] Waiting %.2fs (response JSON policy)...", wait_time)
         await asyncio.sleep(wait_time)
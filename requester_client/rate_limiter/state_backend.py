@@ -0,0 +1,281 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Redis là tuỳ chọn, chỉ cần cho backend "redis"
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitStateBackend(ABC):
+    """
+    Trạng thái throttle dùng chung giữa các rate limiter (nhiều client / process / node):
+    key -> thời điểm (epoch, time.time()) được gửi lại. Chỉ tăng, không giảm.
+    `loop_bound`: client gắn với event loop dùng lần đầu (redis.asyncio) -> không gọi từ loop tạm.
+    """
+
+    loop_bound = False
+
+    @abstractmethod
+    async def blocked_until(self, key: str) -> float:
+        """Epoch tới đó key đang bị throttle (0 nếu không)."""
+
+    @abstractmethod
+    async def block_until(self, key: str, until: float):
+        """Báo key bị throttle tới `until`; giữ giá trị lớn hơn nếu đã có."""
+
+    def close(self):
+        return None
+
+
+# -------------------------------
+# Local (trong process)
+# -------------------------------
+class LocalStateBackend(RateLimitStateBackend):
+    """Dùng chung giữa các client trong cùng process."""
+
+    def __init__(self):
+        self._until: Dict[str, float] = {}
+
+    async def blocked_until(self, key: str) -> float:
+        return self._until.get(key, 0.0)
+
+    async def block_until(self, key: str, until: float):
+        if until > self._until.get(key, 0.0):
+            self._until[key] = until
+
+
+# -------------------------------
+# Shared memory (các process trên cùng host)
+# -------------------------------
+# Slot: [hash key u64][blocked_until f64]; hash 0 = slot trống, _TOMBSTONE = slot đang được ghi lại
+_SLOT = struct.Struct("<Qd")
+_HASH = struct.Struct("<Q")
+_UNTIL = struct.Struct("<d")
+_TOMBSTONE = 0xFFFFFFFFFFFFFFFF
+
+
+def _default_shm_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "requester-ratelimit-state")
+
+
+def _key_hash(key: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    return min(max(value, 1), _TOMBSTONE - 1)  # 0 và _TOMBSTONE là giá trị đặc biệt
+
+
+class SharedMemoryStateBackend(RateLimitStateBackend):
+    """
+    Bảng hash cố định trong file mmap (mặc định trên /dev/shm), mọi process map cùng file.
+    Đọc không lock: đọc hash, until rồi đọc lại hash, hash đổi giữa chừng -> đọc lại slot.
+    Ghi (chỉ xảy ra khi gặp 429) giữ flock trên file, lấy lock không chặn event loop.
+    Slot đã hết hạn được dùng lại cho key khác: hash -> _TOMBSTONE, ghi until, rồi mới ghi hash mới,
+    nên reader không bao giờ ghép hash của key này với until của key khác.
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: int = 1024):
+        self.path = path or _default_shm_path()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with _FileLock(self._fd):  # lúc khởi tạo chưa có event loop cần giữ
+            # Chỉ process đầu tiên quyết định kích thước; process sau dùng đúng bảng đã có
+            # (đổi số slot sẽ làm lệch vị trí hash giữa các process)
+            if os.fstat(self._fd).st_size < _SLOT.size:
+                os.ftruncate(self._fd, slots * _SLOT.size)
+        self.slots = os.fstat(self._fd).st_size // _SLOT.size
+        self._map = mmap.mmap(self._fd, self.slots * _SLOT.size)
+
+    def _locked(self):
+        return _FileLock(self._fd)
+
+    def _probe(self, key_hash: int):
+        """Duyệt chuỗi slot của key (linear probing) tới slot trống đầu tiên."""
+        start = key_hash % self.slots
+        for i in range(self.slots):
+            index = (start + i) % self.slots
+            offset = index * _SLOT.size
+            while True:
+                slot_hash, until = _SLOT.unpack_from(self._map, offset)
+                if _HASH.unpack_from(self._map, offset)[0] == slot_hash:
+                    break  # slot không bị ghi lại giữa hai lần đọc
+            yield index, slot_hash, until
+            if slot_hash == 0:
+                return
+
+    async def blocked_until(self, key: str) -> float:
+        key_hash = _key_hash(key)
+        for _, slot_hash, until in self._probe(key_hash):
+            if slot_hash == key_hash:
+                return until
+        return 0.0
+
+    async def block_until(self, key: str, until: float):
+        key_hash = _key_hash(key)
+        now = time.time()
+        async with self._locked():
+            free = None
+            for index, slot_hash, current in self._probe(key_hash):
+                if slot_hash == key_hash:
+                    if until > current:
+                        _UNTIL.pack_into(self._map, index * _SLOT.size + 8, until)
+                    return
+                if free is None and (slot_hash in (0, _TOMBSTONE) or current < now):
+                    free = index
+            if free is None:
+                logger.warning("[RateLimit] Shared state table %s is full, dropping '%s'", self.path, key)
+                return
+            offset = free * _SLOT.size
+            _HASH.pack_into(self._map, offset, _TOMBSTONE)  # reader của key cũ thôi khớp slot này
+            _UNTIL.pack_into(self._map, offset + 8, until)
+            _HASH.pack_into(self._map, offset, key_hash)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+class _FileLock:
+    """flock độc quyền; dạng async thử LOCK_NB và chờ lại bằng asyncio.sleep thay vì chặn event loop."""
+
+    RETRY_INTERVAL = 0.001
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def __enter__(self):
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    async def __aenter__(self):
+        while True:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                await asyncio.sleep(self.RETRY_INTERVAL)
+
+    async def __aexit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+# -------------------------------
+# Redis (nhiều node)
+# -------------------------------
+class RedisStateBackend(RateLimitStateBackend):
+    """
+    Lưu `until` trong Redis (hoặc client cùng API: async get / set(px=...)), key tự hết hạn.
+    Đọc được cache `refresh_interval` giây để acquire() không gọi mạng mỗi request;
+    lỗi kết nối chỉ log, không chặn request.
+    """
+
+    loop_bound = True
+
+    def __init__(self, client, prefix: str = "ratelimit:", refresh_interval: float = 0.1):
+        self.client = client
+        self.prefix = prefix
+        self.refresh_interval = refresh_interval
+        self._cache: Dict[str, Tuple[float, float]] = {}  # key -> (until, thời điểm đọc monotonic)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisStateBackend":
+        if redis_asyncio is None:
+            raise RuntimeError("Redis rate-limit state requires 'redis' (pip install redis)")
+        return cls(redis_asyncio.from_url(url), **kwargs)
+
+    async def blocked_until(self, key: str) -> float:
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[1] < self.refresh_interval:
+            return cached[0]
+        # Single-flight: các coroutine cùng hụt cache chờ chung một lần GET
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._fetch(key))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch(self, key: str) -> float:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("[RateLimit] Failed to read shared state for '%s': %s", key, e)
+            raw = None
+        until = float(raw) if raw else 0.0
+        cached = self._cache.get(key)
+        if cached and cached[0] > until:
+            until = cached[0]  # giá trị chính process này vừa ghi mà Redis chưa kịp thấy
+        self._cache[key] = (until, time.monotonic())
+        return until
+
+    async def block_until(self, key: str, until: float):
+        self._cache[key] = (max(until, self._cache.get(key, (0.0, 0.0))[0]), time.monotonic())
+        ttl_ms = int((until - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        try:
+            raw = await self.client.get(self.prefix + key)
+            if raw and float(raw) >= until:
+                return
+            # Đọc rồi ghi không atomic: worker khác ghi xen giữa chỉ làm mất phần chênh lệch nhỏ
+            await self.client.set(self.prefix + key, repr(until), px=ttl_ms)
+        except Exception as e:
+            logger.warning("[RateLimit] Failed to publish shared state for '%s': %s", key, e)
+
+
+# -------------------------------
+# Factory
+# -------------------------------
+_backends: Dict[Tuple, RateLimitStateBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_state_backend(config: dict) -> RateLimitStateBackend:
+    """Backend theo config (RateLimitStateConfig), dùng chung trong process theo (backend, path/url)."""
+    backend = config.get("backend", "local")
+    location = config.get("path") if backend == "shared_memory" else config.get("url")
+    key = (backend, location, config.get("prefix"))
+    state = _backends.get(key)
+    if state is not None:
+        return state
+    with _backends_lock:
+        state = _backends.get(key)
+        if state is None:
+            if backend == "local":
+                state = LocalStateBackend()
+            elif backend == "shared_memory":
+                state = SharedMemoryStateBackend(location, slots=config.get("slots") or 1024)
+            elif backend == "redis":
+                state = RedisStateBackend.from_url(
+                    location or "redis://localhost:6379/0",
+                    prefix=config.get("prefix") or "ratelimit:",
+                    refresh_interval=(config.get("refresh_interval_ms") or 100) / 1000,
+                )
+            else:
+                raise ValueError(f"Unknown rate-limit state backend: {backend}")
+            _backends[key] = state
+    return state
+
+
+def _reset_after_fork():
+    # Client Redis / state local của process cha không dùng trong worker; file shared memory map lại
+    global _backends_lock
+    _backends.clear()
+    _backends_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,10 @@
+from requester_client.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, circuit_breakers
+from requester_client.resilience.retry_budget import RetryBudget, full_jitter_backoff
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "circuit_breakers",
+    "RetryBudget",
+    "full_jitter_backoff",
+]
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker theo origin:
+    - closed: cho qua mọi request, đếm lỗi liên tiếp
+    - open: fail fast trong `recovery_timeout` giây sau `failure_threshold` lỗi liên tiếp
+    - half-open: cho tối đa `half_open_max_calls` request thử; thành công -> closed, lỗi -> open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    def allow_request(self) -> bool:
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._opened_at = now
+            self._half_open_calls = 0
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                # Request thử bị huỷ giữa chừng không báo kết quả -> mở lượt thử mới sau timeout
+                if now - self._opened_at < self.recovery_timeout:
+                    return False
+                self._opened_at = now
+                self._half_open_calls = 0
+            self._half_open_calls += 1
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("[CircuitBreaker] %s recovered, closing circuit", self.name)
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def record_ignored(self):
+        """Kết quả không nói gì về sức khoẻ origin (vd: 429): giữ nguyên trạng thái, trả lại lượt thử half-open."""
+        if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self.state == self.CLOSED and self._failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        logger.warning("[CircuitBreaker] %s opened for %.1fs", self.name, self.recovery_timeout)
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+
+
+class CircuitBreakerRegistry:
+    """Breaker dùng chung trong process, key theo (origin, cấu hình)."""
+
+    def __init__(self):
+        self._breakers: Dict[Tuple, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: httpx.URL, config: dict | None = None) -> CircuitBreaker:
+        cfg = config or {}
+        origin = f"{url.scheme}://{url.netloc.decode()}"
+        params = (
+            cfg.get("failure_threshold", 5),
+            cfg.get("recovery_timeout", 30.0),
+            cfg.get("half_open_max_calls", 1),
+        )
+        key = (origin, params)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(origin, *params)
+        return breaker
+
+    def reset(self):
+        """Xoá mọi breaker (worker mới fork bắt đầu với trạng thái sạch)."""
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+
+circuit_breakers = CircuitBreakerRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=circuit_breakers.reset)
@@ -0,0 +1,39 @@
+import random
+import time
+
+
+class RetryBudget:
+    """
+    Retry budget dạng token bucket:
+    - mỗi request gốc nạp `ratio` token, mỗi lần retry tiêu 1 token
+      -> số retry tối đa ~ ratio * lưu lượng request
+    - nạp thêm `min_per_sec` token/giây để lưu lượng thấp vẫn được retry
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_sec: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+
+        self._tokens = min(max_tokens, max(1.0, min_per_sec))
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_sec)
+        self._updated = now
+
+    def record_request(self):
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire_retry(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+def full_jitter_backoff(attempt: int, backoff_factor: float, max_backoff: float) -> float:
+    """Exponential backoff + full jitter: uniform(0, min(max, factor * 2^(attempt-1)))."""
+    return random.uniform(0, min(max_backoff, backoff_factor * (2 ** (attempt - 1))))
@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx cần h2 cho HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class ConnectionOptions:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> "ConnectionOptions":
+        cfg = {k: v for k, v in (config or {}).items() if v is not None}
+        return cls(**cfg)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class TransportRegistry:
+    """
+    Registry transport dùng chung trong process, key theo (origin, ConnectionOptions):
+    các client cùng gọi tới một host dùng chung connection pool / TLS session.
+    """
+
+    def __init__(self):
+        self._async: Dict[Tuple, httpx.AsyncHTTPTransport] = {}
+        self._sync: Dict[Tuple, httpx.HTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: httpx.URL, options: ConnectionOptions) -> Tuple:
+        port = url.port or _DEFAULT_PORTS.get(url.scheme)
+        return (url.scheme, url.host, port, options)
+
+    @staticmethod
+    def _http2(options: ConnectionOptions) -> bool:
+        if options.http2 and not HTTP2_AVAILABLE:
+            logger.warning("[Transport] HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+            return False
+        return options.http2
+
+    def get_async(self, url: httpx.URL, options: ConnectionOptions) -> httpx.AsyncHTTPTransport:
+        key = self._key(url, options)
+        transport = self._async.get(key)
+        if transport is None:
+            with self._lock:
+                transport = self._async.get(key)
+                if transport is None:
+                    transport = httpx.AsyncHTTPTransport(limits=options.limits(), http2=self._http2(options))
+                    self._async[key] = transport
+        return transport
+
+    def get_sync(self, url: httpx.URL, options: ConnectionOptions) -> httpx.HTTPTransport:
+        key = self._key(url, options)
+        with self._lock:
+            transport = self._sync.get(key)
+            if transport is None:
+                transport = httpx.HTTPTransport(limits=options.limits(), http2=self._http2(options))
+                self._sync[key] = transport
+        return transport
+
+    async def aclose(self):
+        """Đóng toàn bộ pool (gọi khi shutdown)."""
+        transports, self._async = list(self._async.values()), {}
+        for transport in transports:
+            await transport.aclose()
+        self.close()
+
+    def close(self):
+        transports, self._sync = list(self._sync.values()), {}
+        for transport in transports:
+            transport.close()
+
+    def reset(self):
+        """Bỏ toàn bộ pool mà không đóng (dùng sau fork: socket kế thừa thuộc process cha)."""
+        self._async = {}
+        self._sync = {}
+        self._lock = threading.Lock()
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Transport gắn vào từng AsyncClient: route request tới pool dùng chung theo origin."""
+
+    def __init__(self, registry: TransportRegistry, options: ConnectionOptions):
+        self.registry = registry
+        self.options = options
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self.registry.get_async(request.url, self.options)
+        return await transport.handle_async_request(request)
+
+    async def aclose(self):
+        # Pool thuộc registry, đóng client không đóng pool của client khác
+        return None
+
+
+class SharedSyncTransport(httpx.BaseTransport):
+    """Bản sync của SharedAsyncTransport."""
+
+    def __init__(self, registry: TransportRegistry, options: ConnectionOptions):
+        self.registry = registry
+        self.options = options
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.registry.get_sync(request.url, self.options).handle_request(request)
+
+    def close(self):
+        return None
+
+
+# Registry mặc định của process
+transport_registry = TransportRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=transport_registry.reset)
+
+
+async def close_transports():
+    await transport_registry.aclose()
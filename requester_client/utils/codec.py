@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # codec nhanh là tuỳ chọn, không có thì dùng stdlib json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+# Mọi codec đều raise ValueError (hoặc subclass, vd json.JSONDecodeError) khi body không hợp lệ
+DecodeError = ValueError
+
+
+class JsonCodec:
+    """Encode/decode JSON: dumps() trả về bytes UTF-8 dạng compact, loads() nhận bytes hoặc str."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+# Số nguyên từ 19 chữ số có thể vượt 64-bit; translate + find chạy ở tốc độ memchr, rẻ hơn regex nhiều
+_DIGITS_ONLY = bytes(0x30 if 0x30 <= b <= 0x39 else 0x20 for b in range(256))
+_WIDE_INT_RUN = b"0" * 19
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    orjson giới hạn số nguyên trong 64-bit: dumps raise TypeError, loads âm thầm đọc thành float.
+    Hai trường hợp đó (và key không phải str/int/float/bool/None) chuyển sang stdlib để kết quả
+    giống hệt JsonCodec.
+    """
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        raw = data.encode() if isinstance(data, str) else data
+        if raw.translate(_DIGITS_ONLY).find(_WIDE_INT_RUN) >= 0:
+            return super().loads(data)  # có thể có số nguyên vượt 64-bit (hoặc chỉ là chuỗi số dài)
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise DecodeError(str(e)) from e
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Chọn codec theo tên (hoặc ENV JSON_CODEC): orjson | msgspec | stdlib | auto.
+    auto: orjson > msgspec > stdlib tuỳ package nào đã cài.
+    """
+    name = (name or os.getenv("JSON_CODEC", "auto")).lower()
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonCodec()
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return MsgspecCodec()
+    if name not in ("auto", "stdlib"):
+        logger.warning(f"[Codec] JSON codec '{name}' is not installed, falling back to stdlib json")
+    return JsonCodec()
+
+
+# Codec mặc định của process
+codec = get_codec()
+
+
+def dumps(obj: Any) -> bytes:
+    return codec.dumps(obj)
+
+
+def loads(data: bytes | str) -> Any:
+    return codec.loads(data)
@@ -1,18 +1,62 @@
 import re
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 
-def get_nested_key(data: dict, path: str, default=None):
-    """Truy cập an toàn dict lồng nhau, hỗ trợ cả list index như 'a.b[0].c'."""
-    keys = re.split(r'\.(?![^\[]*\])', path)  # tách theo dấu . nhưng không tách trong [ ]
-    for k in keys:
-        if isinstance(data, dict):
-            data = data.get(k, default)
-        elif isinstance(data, list):
-            match = re.match(r'\[(\d+)\]', k)
-            if match:
-                idx = int(match.group(1))
+_SPLIT_RE = re.compile(r'\.(?![^\[]*\])')  # tách theo dấu . nhưng không tách trong [ ]
+_INDEX_RE = re.compile(r'\[(\d+)\]')
+
+
+class JsonPath:
+    """
+    Path đã compile sẵn (vd: 'data.rate_limit.retry_after'), dùng lại được nhiều lần.
+    Mỗi segment lưu (key, index): gặp dict thì tra key, gặp list thì dùng index.
+    """
+
+    __slots__ = ("path", "segments", "prefix")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.segments: Tuple[Tuple[str, Optional[int]], ...] = tuple(
+            (k, self._parse_index(k)) for k in _SPLIT_RE.split(path)
+        )
+        # Prefix kiểu ijson để đọc streaming; None nếu path có list index
+        has_index = any(idx is not None for _, idx in self.segments)
+        self.prefix: Optional[str] = None if has_index else ".".join(k for k, _ in self.segments)
+
+    @staticmethod
+    def _parse_index(segment: str) -> Optional[int]:
+        match = _INDEX_RE.match(segment)
+        return int(match.group(1)) if match else None
+
+    def get(self, data: Any, default=None) -> Any:
+        for key, idx in self.segments:
+            if isinstance(data, dict):
+                data = data.get(key, default)
+            elif isinstance(data, list):
+                if idx is None:
+                    return default
                 data = data[idx] if idx < len(data) else default
             else:
                 return default
-        else:
-            return default
-    return data
+        return data
+
+    def assign(self, target: dict, value: Any):
+        """Ghi value vào dict theo path (tạo dict trung gian), dùng cho path không có index."""
+        *parents, (last, _) = self.segments
+        for key, _ in parents:
+            target = target.setdefault(key, {})
+        target[last] = value
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.path!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> JsonPath:
+    """Compile path một lần, cache LRU theo chuỗi path."""
+    return JsonPath(path)
+
+
+def get_nested_key(data: dict, path: str, default=None):
+    """Truy cập an toàn dict lồng nhau, hỗ trợ cả list index như 'a.b[0].c'."""
+    return compile_path(path).get(data, default)
@@ -0,0 +1,146 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from requester_client.utils import codec as json_codec
+from requester_client.utils.json_helper import JsonPath, compile_path
+
+try:
+    import ijson
+except ImportError:  # ijson là dependency tuỳ chọn; không có thì đọc cả body rồi parse một lần
+    ijson = None
+
+_START_EVENTS = ("start_map", "start_array")
+_END_EVENTS = ("end_map", "end_array")
+
+
+class _ValueBuilder:
+    """Dựng lại giá trị (scalar / object / array) từ chuỗi event ijson bắt đầu tại một prefix."""
+
+    __slots__ = ("builder", "depth")
+
+    def __init__(self, event: str, value: Any):
+        self.builder = ijson.ObjectBuilder()
+        self.builder.event(event, value)
+        self.depth = 1
+
+    def feed(self, event: str, value: Any) -> bool:
+        """Trả về True khi giá trị đã dựng xong."""
+        self.builder.event(event, value)
+        if event in _START_EVENTS:
+            self.depth += 1
+        elif event in _END_EVENTS:
+            self.depth -= 1
+        return self.depth == 0
+
+    @property
+    def value(self) -> Any:
+        return self.builder.value
+
+
+class _PathCollector:
+    """Gom giá trị tại các path cấu hình từ luồng event, ghi vào dict thưa (sparse)."""
+
+    def __init__(self, paths: List[JsonPath], out: dict):
+        self.pending: Dict[str, JsonPath] = {p.prefix: p for p in paths}
+        self.out = out
+        self._building: Optional[tuple[JsonPath, _ValueBuilder]] = None
+
+    @property
+    def done(self) -> bool:
+        return not self.pending and self._building is None
+
+    def feed(self, prefix: str, event: str, value: Any):
+        if self._building is not None:
+            path, builder = self._building
+            if builder.feed(event, value):
+                path.assign(self.out, builder.value)
+                self._building = None
+            return
+
+        path = self.pending.get(prefix)
+        if path is None or event == "map_key" or event in _END_EVENTS:
+            return
+        del self.pending[prefix]
+        if event in _START_EVENTS:
+            self._building = (path, _ValueBuilder(event, value))
+        else:
+            path.assign(self.out, value)
+
+
+def _streamable(paths: List[JsonPath]) -> bool:
+    return ijson is not None and all(p.prefix is not None for p in paths)
+
+
+async def _load_all(chunks: AsyncIterator[bytes]) -> Any:
+    body = b"".join([chunk async for chunk in chunks])
+    return json_codec.loads(body) if body else {}
+
+
+def _collect_from(data: Any, paths: List[JsonPath], out: dict):
+    for path in paths:
+        value = path.get(data)
+        if value is not None:
+            path.assign(out, value)
+
+
+async def extract_paths(chunks: AsyncIterator[bytes], paths: List[JsonPath]) -> dict:
+    """
+    Đọc body JSON dạng stream, chỉ lấy các path cấu hình và dừng ngay khi đã đủ.
+    Trả về dict thưa chỉ chứa các path tìm thấy (dùng lại được với JsonPath.get).
+    """
+    out: dict = {}
+    if not _streamable(paths):
+        _collect_from(await _load_all(chunks), paths, out)
+        return out
+
+    collector = _PathCollector(paths, out)
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    async for chunk in chunks:
+        parser.send(chunk)
+        for prefix, event, value in events:
+            collector.feed(prefix, event, value)
+            if collector.done:
+                return out
+        del events[:]
+    return out
+
+
+async def iter_items(
+    chunks: AsyncIterator[bytes],
+    items_path: str,
+    capture: List[JsonPath],
+    captured: dict,
+) -> AsyncIterator[Any]:
+    """
+    Yield từng phần tử của array tại `items_path` ngay khi parse xong,
+    đồng thời ghi các path trong `capture` (vd: next token) vào `captured`.
+    """
+    items = compile_path(items_path)
+    if not _streamable([items, *capture]):
+        data = await _load_all(chunks)
+        _collect_from(data, capture, captured)
+        for item in items.get(data) or []:
+            yield item
+        return
+
+    item_prefix = f"{items.prefix}.item"
+    collector = _PathCollector(capture, captured)
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builder: Optional[_ValueBuilder] = None
+
+    async for chunk in chunks:
+        parser.send(chunk)
+        for prefix, event, value in events:
+            collector.feed(prefix, event, value)
+            if builder is not None:
+                if builder.feed(event, value):
+                    yield builder.value
+                    builder = None
+            elif prefix == item_prefix and event != "map_key" and event not in _END_EVENTS:
+                if event in _START_EVENTS:
+                    builder = _ValueBuilder(event, value)
+                else:
+                    yield value
+        del events[:]
+    parser.close()
@@ -0,0 +1,13 @@
+from runtime.supervisor import Supervisor
+from runtime.event_loop import run_event_loop, use_uvloop
+from runtime.worker import stray_worker_paths, worker_count, worker_id, worker_path
+
+__all__ = [
+    "Supervisor",
+    "run_event_loop",
+    "use_uvloop",
+    "stray_worker_paths",
+    "worker_count",
+    "worker_id",
+    "worker_path",
+]
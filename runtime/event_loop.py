@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+try:
+    import uvloop
+except ImportError:  # uvloop là tuỳ chọn
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+
+def use_uvloop(enabled: Optional[bool] = None) -> bool:
+    """
+    Dùng uvloop làm event loop (ENV UVLOOP=1). Không cài uvloop thì báo lỗi
+    thay vì âm thầm chạy loop mặc định.
+    """
+    if enabled is None:
+        enabled = os.getenv("UVLOOP", "0").lower() in ("1", "true", "yes")
+    if not enabled:
+        return False
+    if uvloop is None:
+        raise RuntimeError("UVLOOP=1 requires 'uvloop' (pip install uvloop)")
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def run_event_loop(main: Callable[[], Awaitable[None]], uvloop_enabled: Optional[bool] = None):
+    """Chạy coroutine chính trên loop mới (uvloop nếu bật)."""
+    if use_uvloop(uvloop_enabled):
+        logger.info("[Runtime] Using uvloop event loop")
+    asyncio.run(main())
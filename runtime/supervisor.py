@@ -0,0 +1,150 @@
+import logging
+import os
+import signal
+import time
+from typing import Callable, Dict, Optional
+
+from runtime.worker import WORKER_COUNT_ENV, WORKER_ID_ENV
+from telemetry.log import shutdown_logging
+
+logger = logging.getLogger(__name__)
+
+
+class Supervisor:
+    """
+    Fork `workers` process, mỗi process chạy `target()` (thường là cả app: consumer
+    + ObserverManager riêng). Các worker là competing consumers trên cùng queue
+    (RabbitMQ) / cùng consumer group (Kafka), broker tự chia message.
+
+    - Fork trước khi có event loop / kết nối: mỗi worker tự tạo pool riêng (shared-nothing);
+      state toàn cục kế thừa từ process cha được reset qua os.register_at_fork trong từng module.
+    - SIGTERM / SIGINT: chuyển SIGTERM cho mọi worker (worker tự drain rồi thoát),
+      quá `shutdown_timeout` thì SIGKILL.
+    - Worker chết bất thường được fork lại với cùng WORKER_ID (backoff nếu crash liên tục).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        target: Callable[[], Optional[int]],
+        shutdown_timeout: float = 30.0,
+        restart_backoff: float = 1.0,
+        max_restart_backoff: float = 30.0,
+    ):
+        self.workers = workers
+        self.target = target
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+
+        self._children: Dict[int, int] = {}  # pid -> worker id
+        self._started_at: Dict[int, float] = {}  # worker id -> thời điểm fork gần nhất
+        self._backoff: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}  # worker id -> thời điểm fork lại
+        self._stopping = False
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    def run(self) -> int:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._on_signal)
+        logger.info(f"[Supervisor] Starting {self.workers} worker(s)")
+        for wid in range(self.workers):
+            self._spawn(wid)
+
+        while (self._children or self._restart_at) and not self._stopping:
+            if not self._reap():
+                time.sleep(0.2)
+            self._restart_due()
+        return self._shutdown()
+
+    # -------------------------------
+    # Internal
+    # -------------------------------
+    def _spawn(self, wid: int):
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(wid)
+        self._children[pid] = wid
+        self._started_at[wid] = time.monotonic()
+        logger.info(f"[Supervisor] Worker {wid} started (pid={pid})")
+
+    def _run_child(self, wid: int):
+        # Worker tự cài signal handler graceful shutdown trong event loop của nó
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.environ[WORKER_ID_ENV] = str(wid)
+        os.environ[WORKER_COUNT_ENV] = str(self.workers)
+        code = 1
+        try:
+            code = self.target() or 0
+        except KeyboardInterrupt:
+            code = 0
+        except Exception:
+            logger.exception(f"[Supervisor] Worker {wid} crashed")
+        finally:
+            # os._exit bỏ qua atexit -> tự flush log còn trong queue
+            shutdown_logging()
+            logging.shutdown()
+            os._exit(code)
+
+    def _on_signal(self, signum, frame):
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.warning(f"[Supervisor] Received {signal.Signals(signum).name}, stopping workers...")
+        self._signal_children(signal.SIGTERM)
+
+    def _signal_children(self, sig: signal.Signals):
+        for pid in list(self._children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self, block: bool = False) -> bool:
+        """Thu hồi một worker đã thoát (và lên lịch fork lại). Trả về False nếu chưa có worker nào thoát."""
+        try:
+            pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            self._children.clear()
+            return False
+        if pid == 0:
+            return False
+        wid = self._children.pop(pid, None)
+        if wid is None:
+            return True
+        code = os.waitstatus_to_exitcode(status)
+        if self._stopping:
+            logger.info(f"[Supervisor] Worker {wid} exited ({code})")
+            return True
+
+        # Crash ngay sau khi start -> tăng backoff để không fork liên tục
+        uptime = time.monotonic() - self._started_at.get(wid, 0)
+        delay = self._backoff.get(wid, 0.0)
+        delay = min(self.max_restart_backoff, max(self.restart_backoff, delay * 2)) if uptime < 10 else 0.0
+        self._backoff[wid] = delay
+        logger.warning(f"[Supervisor] Worker {wid} exited unexpectedly ({code}), restarting in {delay:.1f}s")
+        self._restart_at[wid] = time.monotonic() + delay
+        return True
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for wid, at in list(self._restart_at.items()):
+            if at <= now and not self._stopping:
+                del self._restart_at[wid]
+                self._spawn(wid)
+
+    def _shutdown(self) -> int:
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._children and time.monotonic() < deadline:
+            if not self._reap():
+                time.sleep(0.1)
+        if self._children:
+            logger.warning(f"[Supervisor] {len(self._children)} worker(s) did not stop in time, killing")
+            self._signal_children(signal.SIGKILL)
+            while self._children:
+                self._reap(block=True)
+        logger.info("[Supervisor] All workers stopped")
+        return 0
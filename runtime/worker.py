@@ -0,0 +1,43 @@
+import os
+import re
+from typing import List, Optional
+
+# Supervisor đặt các biến này cho từng worker process (0..N-1); không có = chạy một process
+WORKER_ID_ENV = "WORKER_ID"
+WORKER_COUNT_ENV = "WORKER_COUNT"
+
+_WORKER_DIR = re.compile(r"worker-(\d+)")
+
+
+def worker_id() -> Optional[int]:
+    value = os.getenv(WORKER_ID_ENV)
+    return int(value) if value else None
+
+
+def worker_count() -> Optional[int]:
+    value = os.getenv(WORKER_COUNT_ENV)
+    return int(value) if value else None
+
+
+def worker_path(path: str) -> str:
+    """Thư mục riêng cho từng worker (vd spool), tránh hai process ghi chung một file."""
+    wid = worker_id()
+    return path if wid is None else os.path.join(path, f"worker-{wid}")
+
+
+def stray_worker_paths(path: str) -> List[str]:
+    """
+    Thư mục worker_path() dưới `path` không thuộc worker nào đang chạy: WORKERS giảm (worker-K với
+    K >= số worker), hoặc đổi giữa chạy một process và nhiều worker (worker-* / chính `path`).
+    Chỉ worker 0 hoặc process duy nhất nhận về, để không có hai process cùng nhận một thư mục;
+    không biết số worker (WORKER_ID đặt từ bên ngoài) -> không nhận gì.
+    """
+    wid, count = worker_id(), worker_count()
+    if wid not in (None, 0) or (wid is not None and count is None) or not os.path.isdir(path):
+        return []
+    stray = [] if wid is None else [path]
+    for name in sorted(os.listdir(path)):
+        match = _WORKER_DIR.fullmatch(name)
+        if match and (wid is None or int(match.group(1)) >= count):
+            stray.append(os.path.join(path, name))
+    return stray
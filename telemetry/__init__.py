@@ -0,0 +1,17 @@
+from telemetry.metrics import MetricsRegistry, Counter, Gauge, Histogram, registry
+from telemetry.exporter import MetricsServer
+from telemetry.tracing import configure_tracing, span
+from telemetry.log import setup_logging, shutdown_logging
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "registry",
+    "MetricsServer",
+    "configure_tracing",
+    "span",
+    "setup_logging",
+    "shutdown_logging",
+]
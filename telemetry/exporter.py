@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from typing import Optional
+
+from telemetry.metrics import MetricsRegistry, registry as default_registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """HTTP endpoint tối giản (GET /metrics) trả metric dạng Prometheus text, chạy trên event loop."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, registry: Optional[MetricsRegistry] = None):
+        self.host = host
+        self.port = port
+        self.registry = registry or default_registry
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # port=0 -> port thật được cấp
+        logger.info(f"[Metrics] Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # bỏ qua headers
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning("[Metrics] Failed to serve scrape: %s", e)
+        finally:
+            writer.close()
@@ -0,0 +1,90 @@
+from telemetry.metrics import registry
+
+# Metric của pipeline, khai báo một chỗ để dễ tra tên.
+# Label "origin" = host của URL; "target" = tên target trong config.
+
+# -------------------------------
+# Requester (DynamicHttpClient)
+# -------------------------------
+REQUEST_SECONDS = registry.histogram(
+    "requester_request_duration_seconds",
+    "Thời gian request_async, tính cả retry và chờ rate limit (outcome: ok / failed / cancelled)",
+    ("origin", "outcome"),
+)
+REQUEST_RETRIES = registry.counter(
+    "requester_retries_total",
+    "Số lần retry theo lý do (HTTP status hoặc error)",
+    ("origin", "reason"),
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "requester_in_flight_requests",
+    "Số request đang chạy",
+    ("origin",),
+)
+REQUEST_BYTES = registry.counter(
+    "requester_request_bytes_total",
+    "Số bytes body đã gửi (sau nén)",
+    ("origin",),
+)
+RATE_LIMIT_WAIT = registry.counter(
+    "requester_rate_limit_wait_seconds_total",
+    "Tổng thời gian chờ do 429 / rate limit",
+    ("policy",),
+)
+
+# -------------------------------
+# Observer
+# -------------------------------
+TARGET_SEND_SECONDS = registry.histogram(
+    "observer_target_send_duration_seconds",
+    "Thời gian gửi một message tới một URL của target",
+    ("target", "url"),
+)
+TARGET_SENDS = registry.counter(
+    "observer_target_sends_total",
+    "Số lần gửi theo kết quả (ok / failed)",
+    ("target", "url", "outcome"),
+)
+TARGET_SPOOLED = registry.counter(
+    "observer_target_spooled_total",
+    "Số lần gửi lỗi được ghi vào spool",
+    ("target",),
+)
+TARGET_IN_FLIGHT = registry.gauge(
+    "observer_target_in_flight",
+    "Số update() đang chạy theo target",
+    ("target",),
+)
+DISPATCH_IN_FLIGHT = registry.gauge(
+    "observer_dispatch_in_flight_messages",
+    "Số message đang được fan-out",
+)
+
+# -------------------------------
+# Consumer
+# -------------------------------
+QUEUE_LAG_SECONDS = registry.histogram(
+    "consumer_queue_lag_seconds",
+    "Thời gian delivery chờ trong hàng đợi worker trước khi được xử lý",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# -------------------------------
+# Ingestion
+# -------------------------------
+INGEST_ITEMS = registry.counter(
+    "ingestion_items_total",
+    "Số item lấy từ data source theo kết quả xử lý (ok / failed)",
+    ("source", "outcome"),
+)
+INGEST_POLL_SECONDS = registry.histogram(
+    "ingestion_poll_duration_seconds",
+    "Thời gian một lần poll data source (mọi endpoint, mọi trang)",
+    ("source",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+INGEST_BUFFERED = registry.gauge(
+    "ingestion_buffered_items",
+    "Số item đã fetch đang chờ xử lý",
+    ("source",),
+)
@@ -0,0 +1,64 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+
+# Logger thư viện log mỗi request ở INFO -> chỉ giữ WARNING trở lên
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_config: Optional[tuple] = None  # (level, fmt) của lần setup gần nhất
+
+
+def setup_logging(level: Optional[str] = None, fmt: str = LOG_FORMAT):
+    """
+    Logging không block: handler của root chỉ đẩy record vào queue,
+    một thread riêng (QueueListener) format và ghi ra stderr.
+    Level lấy từ ENV LOG_LEVEL (mặc định INFO).
+    """
+    global _listener, _config
+    if _listener is not None:
+        return
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    _config = (level, fmt)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def _restart_after_fork():
+    """Thread listener không được fork sang process con -> dựng lại queue + listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    setup_logging(*_config)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging():
+    """Ghi nốt record còn trong queue rồi dừng thread listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
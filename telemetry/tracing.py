@@ -0,0 +1,37 @@
+import contextlib
+import os
+from typing import Any, Dict, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # tracing là tuỳ chọn
+    otel_trace = None
+
+_NOOP = contextlib.nullcontext()
+_tracer = None
+
+
+def configure_tracing(enabled: Optional[bool] = None, name: str = "requester"):
+    """
+    Bật span OpenTelemetry (ENV TRACING_ENABLED=1). Exporter/provider do app cấu hình
+    qua SDK của OpenTelemetry; ở đây chỉ lấy tracer.
+    """
+    global _tracer
+    if enabled is None:
+        enabled = os.getenv("TRACING_ENABLED", "0").lower() in ("1", "true", "yes")
+    if not enabled:
+        _tracer = None
+        return
+    if otel_trace is None:
+        raise RuntimeError("Tracing requires 'opentelemetry-api' (pip install opentelemetry-api)")
+    _tracer = otel_trace.get_tracer(name)
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Context manager tạo span; tracing tắt thì trả về context rỗng dùng chung (gần như không tốn gì).
+    Giá trị `as` là None khi tracing tắt.
+    """
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=attributes)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Chạy pytest từ bất kỳ thư mục nào: import module của repo theo đường dẫn gốc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
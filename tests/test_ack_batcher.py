@@ -0,0 +1,104 @@
+import asyncio
+
+from message_queue.ack_batcher import AckBatcher
+
+
+def make_batcher(**kwargs):
+    commits = []
+
+    async def commit(lane, upto):
+        commits.append((lane, upto))
+
+    return AckBatcher(commit, **kwargs), commits
+
+
+def test_commits_only_contiguous_prefix():
+    async def main():
+        batcher, commits = make_batcher(batch_size=100)
+        for seq in range(1, 6):
+            batcher.track("ch", seq)
+
+        await batcher.done("ch", 3)
+        await batcher.flush()
+        assert commits == []  # 1, 2 chưa xong -> chưa commit được gì
+
+        await batcher.done("ch", 1)
+        await batcher.flush()
+        assert commits == [("ch", 1)]
+
+        await batcher.done("ch", 2)
+        await batcher.flush()
+        assert commits == [("ch", 1), ("ch", 3)]
+        return batcher, commits
+
+    asyncio.run(main())
+
+
+def test_nacked_message_is_skipped_not_committed():
+    async def main():
+        batcher, commits = make_batcher(batch_size=100)
+        for seq in range(1, 4):
+            batcher.track("ch", seq)
+        await batcher.done("ch", 1)
+        await batcher.done("ch", 3)
+        await batcher.done("ch", 2, ack=False)
+        await batcher.flush()
+        # Tag đã nack riêng không bao giờ là đích của ack multiple
+        assert commits == [("ch", 3)]
+
+        batcher.track("ch", 4)
+        await batcher.done("ch", 4, ack=False)
+        await batcher.flush()
+        assert commits == [("ch", 3)]
+
+    asyncio.run(main())
+
+
+def test_flushes_when_batch_full():
+    async def main():
+        batcher, commits = make_batcher(batch_size=3, interval_ms=10_000)
+        for seq in range(6):
+            batcher.track("p0", seq)
+        for seq in range(6):
+            await batcher.done("p0", seq)
+        return commits
+
+    assert asyncio.run(main()) == [("p0", 2), ("p0", 5)]
+
+
+def test_lanes_are_independent_and_reset_drops_state():
+    async def main():
+        batcher, commits = make_batcher(batch_size=100)
+        batcher.track("p0", 10)
+        batcher.track("p0", 11)
+        batcher.track("p1", 7)
+        await batcher.done("p1", 7)
+        await batcher.done("p0", 11)
+        batcher.reset("p0")
+        await batcher.flush()
+        assert commits == [("p1", 7)]
+
+        # Sau reset lane bắt đầu lại từ đầu
+        batcher.track("p0", 11)
+        await batcher.done("p0", 11)
+        await batcher.flush()
+        assert commits == [("p1", 7), ("p0", 11)]
+
+    asyncio.run(main())
+
+
+def test_periodic_flush_and_close():
+    async def main():
+        batcher, commits = make_batcher(batch_size=100, interval_ms=10)
+        batcher.start()
+        batcher.track("ch", 1)
+        await batcher.done("ch", 1)
+        await asyncio.sleep(0.05)
+        assert commits == [("ch", 1)]
+
+        batcher.track("ch", 2)
+        await batcher.done("ch", 2)
+        await batcher.close()
+        assert commits == [("ch", 1), ("ch", 2)]
+
+    asyncio.run(main())
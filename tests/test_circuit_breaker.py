@@ -0,0 +1,25 @@
+import time
+
+from requester_client.resilience.circuit_breaker import CircuitBreaker
+
+
+def test_ignored_outcome_keeps_failure_count():
+    breaker = CircuitBreaker("origin", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_ignored()  # 429 không reset chuỗi lỗi
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_ignored_outcome_returns_half_open_probe():
+    breaker = CircuitBreaker("origin", failure_threshold=1, recovery_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_ignored()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()  # lượt thử được trả lại, không phải chờ recovery_timeout
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,34 @@
+import pytest
+
+from requester_client.utils import codec as json_codec
+
+orjson = pytest.importorskip("orjson")
+
+
+@pytest.fixture
+def codec():
+    return json_codec.OrjsonCodec()
+
+
+def test_dumps_matches_stdlib_for_non_str_keys_and_wide_ints(codec):
+    stdlib = json_codec.JsonCodec()
+    for obj in ({1: "a", "b": None}, {"id": 2**64}, [-(2**63) - 1], {"nested": {"n": 10**30}}):
+        assert json_codec.loads(codec.dumps(obj)) == stdlib.loads(stdlib.dumps(obj))
+    assert codec.dumps({1: 2}) == b'{"1":2}'
+
+
+def test_dumps_still_rejects_unserializable(codec):
+    with pytest.raises(TypeError):
+        codec.dumps({"x": object()})
+
+
+def test_loads_keeps_wide_ints_exact(codec):
+    assert codec.loads(b'{"a":[1,99999999999999999999]}') == {"a": [1, 99999999999999999999]}
+    assert codec.loads("-9223372036854775809") == -9223372036854775809
+    assert isinstance(codec.loads(b"18446744073709551616"), int)
+
+
+def test_loads_regular_payload(codec):
+    assert codec.loads(b'{"ts":1700000000123,"v":3.5,"s":"x"}') == {"ts": 1700000000123, "v": 3.5, "s": "x"}
+    with pytest.raises(json_codec.DecodeError):
+        codec.loads(b"{not json")
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import httpx
+
+from config.models import HttpTargetConfig
+from observer.targets.http_target import HttpTarget
+
+URL = "https://hooks.example.com/notify"
+
+
+class Downstream:
+    """Endpoint nhận JSON array; từ chối cả request nếu có item `bad` hoặc đang `down`."""
+
+    def __init__(self):
+        self.down = False
+        self.batches = []
+        self.accepted = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        items = json.loads(request.content)
+        assert isinstance(items, list)
+        self.batches.append(items)
+        if self.down:
+            return httpx.Response(503)
+        if any(item.get("bad") for item in items):
+            return httpx.Response(400)
+        self.accepted.extend(items)
+        return httpx.Response(200)
+
+
+def make_target(downstream, batch=None, **overrides):
+    config = HttpTargetConfig.parse_obj(
+        {
+            "name": "notify",
+            "type": "http",
+            "urls": [URL],
+            "body": "json",
+            "retry": {"max_attempts": 1},
+            "batch": {"max_items": 8, "max_linger_ms": 1000, **(batch or {})},
+            **overrides,
+        }
+    )
+    target = HttpTarget(config)
+    target.client.async_client._transport = httpx.MockTransport(downstream)
+    return target
+
+
+def test_failed_batch_is_split_to_isolate_bad_item():
+    downstream = Downstream()
+
+    async def main():
+        target = make_target(downstream)
+        items = [{"id": i, "bad": i == 5} for i in range(8)]
+        results = await asyncio.gather(*(target.update(item) for item in items))
+        await target.close()
+        return results
+
+    assert asyncio.run(main()) == [True] * 5 + [False] + [True] * 2
+    # Mỗi item tốt được nhận đúng một lần; chỉ chia đôi nhánh chứa item hỏng
+    assert sorted(item["id"] for item in downstream.accepted) == [0, 1, 2, 3, 4, 6, 7]
+    assert len(downstream.batches) == 7
+
+
+def test_split_disabled_fails_whole_batch():
+    downstream = Downstream()
+
+    async def main():
+        target = make_target(downstream, batch={"split_depth": 0})
+        results = await asyncio.gather(*(target.update({"id": i, "bad": i == 0}) for i in range(4)))
+        await target.close()
+        return results
+
+    assert asyncio.run(main()) == [False] * 4
+    assert len(downstream.batches) == 1
+
+
+def test_replayed_batch_item_is_sent_as_json_array(tmp_path):
+    downstream = Downstream()
+    downstream.down = True
+
+    async def main():
+        spool = {"directory": str(tmp_path), "commit_linger_ms": 0}
+        target = make_target(downstream, batch={"split_depth": 0}, spool=spool)
+        await target.replayer.stop()  # replay do test điều khiển
+        assert await target.update({"id": 1}) is True  # downstream lỗi -> đã spool
+
+        downstream.down = False
+        downstream.batches.clear()
+        assert await target.replayer.replay_once() == (1, True)
+        await target.close()
+
+    asyncio.run(main())
+    assert downstream.batches == [[{"id": 1}]]
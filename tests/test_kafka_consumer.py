@@ -0,0 +1,131 @@
+import asyncio
+
+from message_queue.in_memory_kafka import InMemoryKafkaBroker, InMemoryKafkaConsumer
+
+TOPIC = "events"
+TP = (TOPIC, 0)
+
+
+def make_consumer(count: int, **kwargs):
+    broker = InMemoryKafkaBroker(partitions=1)
+    for i in range(count):
+        broker.produce(TOPIC, str(i).encode())
+    options = {"commit_batch_size": 1000, "commit_interval_ms": 10_000, "redelivery_delay": 0.01, **kwargs}
+    return broker, InMemoryKafkaConsumer(broker, [TOPIC], group_id="g", **options)
+
+
+async def take(stream, n: int):
+    return [await stream.__anext__() for _ in range(n)]
+
+
+def test_commits_next_offset_after_contiguous_acks():
+    async def main():
+        broker, consumer = make_consumer(5)
+        await consumer.start()
+        stream = consumer.deliveries()
+        d = await take(stream, 5)
+        for delivery in (d[0], d[1], d[3]):
+            await delivery.ack()
+        await consumer._acks.flush()
+        # offset 2 chưa xong -> chỉ commit tới 2 (offset kế tiếp cần đọc)
+        assert broker.committed[("g", TP)] == 2
+
+        await d[2].ack()
+        await d[4].ack()
+        await stream.aclose()
+        await consumer.close()
+        assert broker.committed[("g", TP)] == 5
+
+    asyncio.run(main())
+
+
+def test_nack_rewinds_and_later_deliveries_become_stale():
+    async def main():
+        broker, consumer = make_consumer(5)
+        await consumer.start()
+        stream = consumer.deliveries()
+        d = await take(stream, 5)
+        await d[0].ack()
+        await d[1].ack()
+        await d[2].nack(requeue=True)
+
+        assert broker.committed[("g", TP)] == 2  # flush trước khi seek
+        assert d[3].stale and d[4].stale
+        await d[3].ack()  # stale -> bỏ qua, không commit vượt offset lỗi
+        await consumer._acks.flush()
+        assert broker.committed[("g", TP)] == 2
+
+        # Partition được resume sau redelivery_delay, fetch lại từ offset lỗi
+        redelivered = await asyncio.wait_for(take(stream, 3), 1)
+        assert [r.offset for r in redelivered] == [2, 3, 4]
+        assert [r.body for r in redelivered] == [b"2", b"3", b"4"]
+        for delivery in redelivered:
+            await delivery.ack()
+        await stream.aclose()
+        await consumer.close()
+        assert broker.committed[("g", TP)] == 5
+
+    asyncio.run(main())
+
+
+def test_nack_without_requeue_skips_message():
+    async def main():
+        broker, consumer = make_consumer(2)
+        await consumer.start()
+        stream = consumer.deliveries()
+        d = await take(stream, 2)
+        await d[0].nack(requeue=False)
+        await d[1].ack()
+        await stream.aclose()
+        await consumer.close()
+        assert broker.committed[("g", TP)] == 2
+
+    asyncio.run(main())
+
+
+def test_revoke_commits_done_prefix_and_releases_prefetch():
+    async def main():
+        broker, consumer = make_consumer(6, prefetch_count=4)
+        await consumer.start()
+        stream = consumer.deliveries()
+        d = await take(stream, 4)
+        assert consumer._prefetch.locked() and consumer._held == 4  # prefetch đầy
+
+        await d[0].ack()
+        await d[2].ack()
+        await consumer._revoke([TP])
+
+        assert broker.committed[("g", TP)] == 1
+        assert all(delivery.stale for delivery in d)
+        assert consumer._inflight.get(TP, 0) == 0
+        assert not consumer._prefetch.locked() and consumer._held == 0
+
+        # Delivery cũ ack sau revoke không được commit / không trả slot lần nữa
+        await d[1].ack()
+        await consumer._acks.flush()
+        assert broker.committed[("g", TP)] == 1
+        await stream.aclose()
+        await consumer.close()
+
+    asyncio.run(main())
+
+
+def test_new_member_resumes_from_committed_offset():
+    async def main():
+        broker, first = make_consumer(4)
+        await first.start()
+        stream = first.deliveries()
+        for delivery in await take(stream, 2):
+            await delivery.ack()
+        await stream.aclose()
+        await first.close()
+
+        second = InMemoryKafkaConsumer(broker, [TOPIC], group_id="g")
+        await second.start()
+        stream = second.deliveries()
+        rest = await take(stream, 2)
+        await stream.aclose()
+        await second.close()
+        return [r.offset for r in rest]
+
+    assert asyncio.run(main()) == [2, 3]
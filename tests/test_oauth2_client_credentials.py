@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from requester_client.auth.strategies import AuthError, OAuth2ClientCredentialsStrategy
+from requester_client.dynamic_http_client import DynamicHttpClient
+
+TOKEN_URL = "https://auth.example.com/token"
+
+
+class Endpoints:
+    """Token endpoint + API giả; `token_status` / `token_body` đổi được giữa các request."""
+
+    def __init__(self):
+        self.token_calls = 0
+        self.api_calls = 0
+        self.token_status = 200
+        self.token_body = {"access_token": "abc", "expires_in": 3600}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if str(request.url) == TOKEN_URL:
+            self.token_calls += 1
+            return httpx.Response(self.token_status, content=json.dumps(self.token_body).encode())
+        self.api_calls += 1
+        assert request.headers["Authorization"] == "Bearer abc"
+        return httpx.Response(200, json={"ok": True})
+
+
+def make_client(endpoints: Endpoints, **auth_kwargs):
+    auth = OAuth2ClientCredentialsStrategy(TOKEN_URL, "id", "secret", **auth_kwargs)
+    transport = httpx.MockTransport(endpoints)
+    auth._client = httpx.AsyncClient(transport=transport)
+    auth._sync_client = httpx.Client(transport=transport)
+    client = DynamicHttpClient(
+        base_url="https://api.example.com", auth_strategy=auth, retry_count=3, retry_backoff_factor=0.001
+    )
+    client.async_client._transport = transport
+    client.sync_client._transport = transport
+    return client
+
+
+@pytest.mark.parametrize("status, body", [(500, {"error": "down"}), (200, {"token_type": "bearer"})])
+def test_token_failure_fails_request_without_touching_target(status, body):
+    endpoints = Endpoints()
+    endpoints.token_status, endpoints.token_body = status, body
+    client = make_client(endpoints)
+
+    async def main():
+        response = await client.request_async("GET", "/items")
+        await client.aclose()
+        return response
+
+    assert asyncio.run(main()) is None
+    assert endpoints.token_calls == 1  # retry của target không gọi lại token endpoint
+    assert endpoints.api_calls == 0
+    breaker = next(iter(client._breakers.values()))
+    assert breaker.state == breaker.CLOSED and breaker._failures == 0
+
+
+def test_token_failure_backoff_then_recovery():
+    endpoints = Endpoints()
+    endpoints.token_status = 503
+    client = make_client(endpoints, failure_backoff=0.05)
+
+    async def main():
+        assert await client.request_async("GET", "/items") is None
+        assert await client.request_async("GET", "/items") is None  # trong backoff -> fail ngay
+        assert endpoints.token_calls == 1
+
+        endpoints.token_status = 200
+        await asyncio.sleep(0.06)
+        response = await client.request_async("GET", "/items")
+        await client.aclose()
+        return response
+
+    response = asyncio.run(main())
+    assert response is not None and response.status_code == 200
+    assert endpoints.token_calls == 2 and endpoints.api_calls == 1
+
+
+def test_sync_token_failure_returns_none():
+    endpoints = Endpoints()
+    endpoints.token_status = 500
+    client = make_client(endpoints)
+    assert client.request_sync("GET", "/items") is None
+    assert endpoints.api_calls == 0
+    with pytest.raises(AuthError):
+        client.auth_strategy.auth_headers_sync()
+
+
+def test_concurrent_requests_share_one_token_fetch():
+    endpoints = Endpoints()
+    client = make_client(endpoints)
+
+    async def main():
+        responses = await asyncio.gather(*(client.request_async("GET", "/items") for _ in range(100)))
+        await client.aclose()
+        return responses
+
+    assert all(r is not None for r in asyncio.run(main()))
+    assert endpoints.token_calls == 1 and endpoints.api_calls == 100
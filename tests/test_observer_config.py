@@ -0,0 +1,34 @@
+import pytest
+from pydantic import ValidationError
+
+from config.config_diff import flatten_targets
+from config.models import ObserverConfig
+
+
+def target(name: str, url: str = "https://example.com/hook") -> dict:
+    return {"name": name, "type": "http", "urls": [url]}
+
+
+def test_duplicate_target_names_rejected():
+    with pytest.raises(ValidationError, match="duplicate target name 'hook'"):
+        ObserverConfig.parse_obj({"orders": {"targets": [target("hook"), target("hook", "https://other.com/")]}})
+
+
+def test_empty_target_name_rejected():
+    with pytest.raises(ValidationError, match="must not be empty"):
+        ObserverConfig.parse_obj({"orders": {"targets": [target("")]}})
+
+
+def test_same_name_allowed_across_sources():
+    config = ObserverConfig.parse_obj({"orders": {"targets": [target("hook")]}, "users": {"targets": [target("hook")]}})
+    assert list(flatten_targets(config)) == [("orders", "hook"), ("users", "hook")]
+
+
+def test_batch_with_form_body_rejected():
+    with pytest.raises(ValidationError, match="batch requires body 'json'"):
+        ObserverConfig.parse_obj({"orders": {"targets": [{**target("hook"), "batch": {}}]}})
+
+
+def test_batch_with_json_body_accepted():
+    config = ObserverConfig.parse_obj({"orders": {"targets": [{**target("hook"), "body": "json", "batch": {}}]}})
+    assert config.get_targets("orders")[0].batch.max_items == 100
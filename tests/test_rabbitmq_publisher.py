@@ -0,0 +1,198 @@
+import asyncio
+import types
+
+import pytest
+
+from config.models.message_queue import MessageQueueConfig
+from message_queue import rabbitmq_connection, rabbitmq_publisher
+from message_queue.in_memory_broker import InMemoryBroker, InMemoryPublisher
+
+
+class RecordingBroker(InMemoryBroker):
+    def __init__(self, confirm_latency: float = 0.0, fail: bool = False):
+        super().__init__(confirm_latency)
+        self.batches = []
+        self.fail = fail
+
+    async def publish_batch(self, exchange, batch):
+        self.batches.append(len(batch))
+        if self.fail:
+            raise ConnectionError("channel closed")
+        await super().publish_batch(exchange, batch)
+
+
+def make_publisher(broker, **kwargs) -> InMemoryPublisher:
+    broker.bind("q", "ex", "key")
+    return InMemoryPublisher(broker, exchange="ex", **kwargs)
+
+
+# -------------------------------
+# Publisher confirms (BasePublisher qua InMemoryPublisher)
+# -------------------------------
+def test_concurrent_publishes_share_confirm_batches():
+    async def main():
+        broker = RecordingBroker()
+        publisher = make_publisher(broker, confirm_batch_size=100, confirm_linger_ms=20)
+        await asyncio.gather(*(publisher.publish("key", b"{}") for _ in range(250)))
+        await publisher.close()
+        return broker
+
+    broker = asyncio.run(main())
+    assert broker.published == 250
+    assert broker.queues["q"].qsize() == 250
+    assert broker.batches == [100, 100, 50]
+
+
+def test_publish_returns_only_after_confirm():
+    async def main():
+        broker = RecordingBroker(confirm_latency=0.05)
+        publisher = make_publisher(broker, confirm_linger_ms=0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await publisher.publish("key", b"{}")
+        elapsed = loop.time() - started
+        await publisher.close()
+        return elapsed
+
+    assert asyncio.run(main()) >= 0.05
+
+
+def test_unconfirmed_batch_fails_every_publish():
+    async def main():
+        broker = RecordingBroker(fail=True)
+        publisher = make_publisher(broker, confirm_linger_ms=10)
+        results = await asyncio.gather(
+            *(publisher.publish("key", b"{}") for _ in range(5)), return_exceptions=True
+        )
+        await publisher.close()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 5
+    assert all(isinstance(r, ConnectionError) for r in results)
+
+
+def test_publish_after_close_is_rejected():
+    async def main():
+        publisher = make_publisher(RecordingBroker())
+        await publisher.publish("key", b"{}")
+        await publisher.close()
+        with pytest.raises(RuntimeError):
+            await publisher.publish("key", b"{}")
+
+    asyncio.run(main())
+
+
+# -------------------------------
+# Channel / connection pool của RabbitMQPublisher
+# -------------------------------
+class FakePool:
+    """Tối giản như aio_pika.pool.Pool: tạo item lười tới max_size, trả item về pool sau acquire."""
+
+    def __init__(self, constructor, *args, max_size: int):
+        self.constructor = constructor
+        self.args = args
+        self.max_size = max_size
+        self.created = []
+        self.free = asyncio.Queue()
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                if pool.free.empty() and len(pool.created) < pool.max_size:
+                    item = await pool.constructor(*pool.args)
+                    pool.created.append(item)
+                    self.item = item
+                else:
+                    self.item = await pool.free.get()
+                return self.item
+
+            async def __aexit__(self, *exc):
+                pool.free.put_nowait(self.item)
+
+        return _Acquire()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeExchange:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        await asyncio.sleep(0)
+        self.published.append((routing_key, message["body"]))
+
+
+class FakeChannel:
+    def __init__(self, publisher_confirms: bool):
+        self.publisher_confirms = publisher_confirms
+        self.exchange = FakeExchange()
+
+    async def declare_exchange(self, name, **kwargs):
+        return self.exchange
+
+    async def get_exchange(self, name, ensure=False):
+        return self.exchange
+
+
+class FakeConnection:
+    def __init__(self):
+        self.channels = []
+
+    async def channel(self, publisher_confirms: bool = False):
+        channel = FakeChannel(publisher_confirms)
+        self.channels.append(channel)
+        return channel
+
+
+@pytest.fixture
+def fake_aio_pika(monkeypatch):
+    fake = types.SimpleNamespace(DeliveryMode=lambda mode: mode, Message=lambda **kwargs: kwargs)
+    monkeypatch.setattr(rabbitmq_publisher, "aio_pika", fake)
+    monkeypatch.setattr(rabbitmq_connection, "aio_pika", fake)
+    monkeypatch.setattr(rabbitmq_publisher, "Pool", FakePool)
+    monkeypatch.setattr(rabbitmq_connection, "Pool", FakePool)
+    monkeypatch.setattr(rabbitmq_connection, "_connection_pools", {})
+    return fake
+
+
+def mq_config(**overrides) -> MessageQueueConfig:
+    return MessageQueueConfig(
+        **{"host": "localhost", "username": "guest", "password": "guest", "exchange": "events", **overrides}
+    )
+
+
+def test_connection_pool_shared_per_broker(fake_aio_pika):
+    first = rabbitmq_connection.get_connection_pool(mq_config())
+    assert rabbitmq_connection.get_connection_pool(mq_config(exchange="other")) is first
+    assert rabbitmq_connection.get_connection_pool(mq_config(virtual_host="/other")) is not first
+
+
+def test_publisher_reuses_confirm_channels(fake_aio_pika, monkeypatch):
+    connection = FakeConnection()
+
+    async def connect(config):
+        return connection
+
+    monkeypatch.setattr(rabbitmq_connection, "connect", connect)
+
+    async def main():
+        publisher = rabbitmq_publisher.RabbitMQPublisher(
+            mq_config(), channel_pool_size=2, confirm_batch_size=10, confirm_linger_ms=1
+        )
+        for _ in range(5):
+            await asyncio.gather(*(publisher.publish("key", b"{}") for _ in range(30)))
+        await publisher.close()
+        return publisher
+
+    publisher = asyncio.run(main())
+    # 150 message, nhiều batch nhưng chỉ tối đa channel_pool_size channel, đều bật confirm
+    assert 1 <= len(connection.channels) <= 2
+    assert all(channel.publisher_confirms for channel in connection.channels)
+    assert sum(len(channel.exchange.published) for channel in connection.channels) == 150
+    assert publisher._channel_pool.closed
@@ -0,0 +1,156 @@
+import asyncio
+import fcntl
+import os
+import time
+
+import httpx
+
+from requester_client.rate_limiter.header_rate_limiter import HeaderRateLimiter
+from requester_client.rate_limiter.in_memory_redis import InMemoryRedis
+from requester_client.rate_limiter.state_backend import (
+    _SLOT,
+    _TOMBSTONE,
+    RedisStateBackend,
+    SharedMemoryStateBackend,
+    _key_hash,
+)
+
+
+# -------------------------------
+# InMemoryRedis
+# -------------------------------
+def test_in_memory_redis_get_set_delete():
+    async def main():
+        redis = InMemoryRedis()
+        assert await redis.get("k") is None
+        assert await redis.set("k", 1.5) is True
+        assert await redis.get("k") == b"1.5"
+        await redis.set("raw", b"\x00bytes")
+        assert await redis.get("raw") == b"\x00bytes"
+        assert await redis.delete("k", "raw", "missing") == 2
+        assert await redis.get("k") is None
+        assert redis.commands == 7
+
+    asyncio.run(main())
+
+
+def test_in_memory_redis_px_expiry_and_latency():
+    async def main():
+        redis = InMemoryRedis(latency=0.01)
+        started = time.monotonic()
+        await redis.set("k", "v", px=30)
+        assert time.monotonic() - started >= 0.01
+        assert await redis.get("k") == b"v"
+        await asyncio.sleep(0.04)
+        assert await redis.get("k") is None
+        assert "k" not in redis.data
+
+    asyncio.run(main())
+
+
+# -------------------------------
+# RedisStateBackend
+# -------------------------------
+def test_redis_backend_single_flight_and_cache():
+    async def main():
+        redis = InMemoryRedis(latency=0.01)
+        backend = RedisStateBackend(redis, prefix="rl:", refresh_interval=10)
+        until = time.time() + 5
+        await redis.set("rl:api", repr(until), px=5000)
+        redis.commands = 0
+
+        results = await asyncio.gather(*(backend.blocked_until("api") for _ in range(50)))
+        assert results == [until] * 50
+        assert redis.commands == 1
+        await backend.blocked_until("api")  # trong refresh_interval -> đọc cache
+        assert redis.commands == 1
+
+    asyncio.run(main())
+
+
+def test_redis_backend_publish_keeps_latest_deadline():
+    async def main():
+        redis = InMemoryRedis()
+        writer = RedisStateBackend(redis)
+        reader = RedisStateBackend(redis, refresh_interval=0)
+        later = time.time() + 10
+        await writer.block_until("api", later)
+        await writer.block_until("api", time.time() + 1)  # sớm hơn -> không ghi đè
+        assert await reader.blocked_until("api") == later
+        assert 0 < redis.data["ratelimit:api"][1] - time.monotonic() <= 10
+
+    asyncio.run(main())
+
+
+def test_sync_bridge_skips_loop_bound_state():
+    redis = InMemoryRedis()
+    limiter = HeaderRateLimiter({"default_wait": 0.01})
+    limiter.attach_state(RedisStateBackend(redis), "api")
+    response = httpx.Response(429, headers={"Retry-After": "0.01"})
+
+    limiter.handle_rate_limit_sync(response)
+    assert redis.commands == 0  # client Redis gắn với loop của app, không dùng từ asyncio.run tạm
+
+    asyncio.run(limiter.handle_rate_limit(response))
+    assert redis.commands > 0
+
+
+# -------------------------------
+# SharedMemoryStateBackend
+# -------------------------------
+def test_shared_memory_reuses_expired_slot_without_mixing_keys(tmp_path):
+    async def main():
+        backend = SharedMemoryStateBackend(str(tmp_path / "state"), slots=1)
+        await backend.block_until("old", time.time() - 1)
+        until = time.time() + 5
+        await backend.block_until("new", until)  # slot duy nhất đã hết hạn -> dùng lại
+        assert await backend.blocked_until("new") == until
+        assert await backend.blocked_until("old") == 0.0
+        backend.close()
+
+    asyncio.run(main())
+
+
+def test_shared_memory_reader_skips_slot_being_rewritten(tmp_path):
+    async def main():
+        backend = SharedMemoryStateBackend(str(tmp_path / "state"), slots=4)
+        until = time.time() + 5
+        await backend.block_until("api", until)
+        # Giả lập writer khác đang ghi lại slot (đã đặt tombstone, chưa ghi hash mới)
+        index = next(i for i, h, _ in backend._probe(_key_hash("api")) if h == _key_hash("api"))
+        _SLOT.pack_into(backend._map, index * _SLOT.size, _TOMBSTONE, until)
+        assert await backend.blocked_until("api") == 0.0
+        await backend.block_until("other", until)  # slot tombstone được dùng lại
+        backend.close()
+
+    asyncio.run(main())
+
+
+def test_shared_memory_lock_does_not_block_event_loop(tmp_path):
+    path = str(tmp_path / "state")
+
+    async def main():
+        backend = SharedMemoryStateBackend(path, slots=8)
+        holder = os.open(path, os.O_RDWR)  # open file description khác = như process khác
+        fcntl.flock(holder, fcntl.LOCK_EX)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        tick_task = asyncio.create_task(ticker())
+        publish = asyncio.create_task(backend.block_until("api", time.time() + 5))
+        await asyncio.sleep(0.05)
+        assert not publish.done() and ticks > 10  # chờ lock nhưng loop vẫn chạy
+
+        fcntl.flock(holder, fcntl.LOCK_UN)
+        await asyncio.wait_for(publish, 1)
+        tick_task.cancel()
+        os.close(holder)
+        assert await backend.blocked_until("api") > time.time()
+        backend.close()
+
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import importlib
+import json
+import sys
+
+import pytest
+
+MESSAGE_QUEUE = {"type": "memory", "host": "localhost", "username": "u", "password": "p", "exchange": "events"}
+
+
+@pytest.fixture
+def settings_module(monkeypatch):
+    monkeypatch.setenv("CONFIG_PROVIDER", "env")
+    monkeypatch.setenv("APP_ENV", "test")
+    monkeypatch.setenv("TEST_MESSAGE_QUEUE_CONFIG", json.dumps(MESSAGE_QUEUE))
+    monkeypatch.delenv("CONFIG_CACHE_DIR", raising=False)
+    for name in ("config.settings", "config.config_provider_factory"):
+        sys.modules.pop(name, None)
+    yield importlib.import_module("config.settings")
+    sys.modules.pop("config.settings", None)
+
+
+def test_settings_load(settings_module):
+    settings = settings_module.settings
+    assert settings.environment == "test"
+    assert settings.message_queue.exchange == "events"
+
+
+def test_snapshot_key_tracks_field_env_overrides(settings_module, monkeypatch):
+    AppSettings = settings_module.AppSettings
+    assert AppSettings._snapshot_key("") == ""
+
+    key = AppSettings._snapshot_key("abc")
+    assert AppSettings._snapshot_key("abc") == key
+    assert AppSettings._snapshot_key("def") != key
+
+    monkeypatch.setenv("UNRELATED_VAR", "1")
+    assert AppSettings._snapshot_key("abc") == key
+    monkeypatch.setenv("DISPATCH", "{}")
+    assert AppSettings._snapshot_key("abc") != key
@@ -0,0 +1,101 @@
+import asyncio
+import os
+
+from observer.targets.spool import DurableSpool, open_spool
+from runtime.worker import WORKER_COUNT_ENV, WORKER_ID_ENV, stray_worker_paths, worker_path
+
+
+def fill(directory: str, payloads, replayed: int = 0):
+    async def main():
+        spool = DurableSpool(directory, segment_bytes=4096, commit_linger_ms=0)
+        for payload in payloads:
+            await spool.append(payload)
+        if replayed:
+            await spool.advance(spool.read(replayed)[-1][0])
+        await spool.close()
+
+    asyncio.run(main())
+
+
+def test_stray_paths_when_workers_shrink(tmp_path, monkeypatch):
+    for wid in range(4):
+        (tmp_path / f"worker-{wid}").mkdir()
+    monkeypatch.setenv(WORKER_COUNT_ENV, "2")
+
+    monkeypatch.setenv(WORKER_ID_ENV, "1")
+    assert stray_worker_paths(str(tmp_path)) == []  # chỉ worker 0 nhận
+
+    monkeypatch.setenv(WORKER_ID_ENV, "0")
+    assert stray_worker_paths(str(tmp_path)) == [
+        str(tmp_path),
+        str(tmp_path / "worker-2"),
+        str(tmp_path / "worker-3"),
+    ]
+
+
+def test_stray_paths_single_process(tmp_path, monkeypatch):
+    (tmp_path / "worker-0").mkdir()
+    (tmp_path / "other").mkdir()
+    monkeypatch.delenv(WORKER_ID_ENV, raising=False)
+    assert stray_worker_paths(str(tmp_path)) == [str(tmp_path / "worker-0")]
+
+
+def test_stray_paths_unknown_worker_count(tmp_path, monkeypatch):
+    (tmp_path / "worker-5").mkdir()
+    monkeypatch.setenv(WORKER_ID_ENV, "0")
+    monkeypatch.delenv(WORKER_COUNT_ENV, raising=False)
+    assert stray_worker_paths(str(tmp_path)) == []
+
+
+def test_worker_zero_adopts_orphaned_spools(tmp_path, monkeypatch):
+    root = str(tmp_path / "target")
+    # Trước: chạy một process (spool ở thư mục gốc), rồi 3 worker; giờ còn 2 worker
+    fill(root, [b"root-0", b"root-1", b"root-2"], replayed=1)
+    fill(os.path.join(root, "worker-2"), [b"w2-%d" % i for i in range(200)])
+    fill(os.path.join(root, "worker-1"), [b"w1-live"])
+    monkeypatch.setenv(WORKER_ID_ENV, "0")
+    monkeypatch.setenv(WORKER_COUNT_ENV, "2")
+
+    async def main():
+        spool = open_spool(worker_path(root), adopt=stray_worker_paths(root), segment_bytes=4096)
+        await spool.adopt_orphans()
+        payloads = [payload for _, payload in spool.read(1000)]
+        await spool.close()
+        return payloads
+
+    payloads = asyncio.run(main())
+    # Record đã replay (root-0) không bị gửi lại; spool của worker 1 còn sống không bị động tới
+    assert payloads == [b"root-1", b"root-2"] + [b"w2-%d" % i for i in range(200)]
+    assert sorted(os.listdir(root)) == ["worker-0", "worker-1"]
+
+    # Mở lại: record đã chuyển vẫn còn (đã ghi bền), không nhận lại lần nữa
+    async def reopen():
+        spool = open_spool(worker_path(root), adopt=stray_worker_paths(root))
+        await spool.adopt_orphans()
+        count = len(spool.read(1000))
+        await spool.close()
+        return count
+
+    assert asyncio.run(reopen()) == 202
+
+
+def test_concurrent_advances_persist_latest_cursor(tmp_path):
+    directory = str(tmp_path / "spool")
+    fill(directory, [b"m-%d" % i for i in range(10)])
+
+    async def main():
+        spool = DurableSpool(directory)
+        records = spool.read(10)
+        # Ghi cursor chạy trong thread; các advance đến trong lúc đó được gộp
+        await asyncio.gather(*(spool.advance(position) for position, _ in records[:6]))
+        await spool.close()
+
+    asyncio.run(main())
+
+    async def reopen():
+        spool = DurableSpool(directory)
+        payloads = [payload for _, payload in spool.read(10)]
+        await spool.close()
+        return payloads
+
+    assert asyncio.run(reopen()) == [b"m-6", b"m-7", b"m-8", b"m-9"]